@@ -29,6 +29,20 @@ PY
 echo "[entrypoint] Running migrations..."
 python manage.py migrate --noinput
 
+echo "[entrypoint] Creating the shared cache table..."
+python manage.py createcachetable
+
+# Dashboards read daily rollups; signals keep them current, so start-up only fills the
+# days that have none (fresh installs). ROLLUP_ON_START=full rebuilds the whole history,
+# ROLLUP_ON_START=0 skips it.
+if [ "${ROLLUP_ON_START:-1}" = "full" ]; then
+  echo "[entrypoint] Rebuilding all dashboard rollups..."
+  python manage.py rollup || echo "[entrypoint] Rollup rebuild failed; run 'manage.py rollup' manually."
+elif [ "${ROLLUP_ON_START:-1}" = "1" ]; then
+  echo "[entrypoint] Filling missing dashboard rollups..."
+  python manage.py rollup --missing || echo "[entrypoint] Rollup backfill failed; run 'manage.py rollup' manually."
+fi
+
 echo "[entrypoint] Env flags: DISABLE_COLLECTSTATIC='${DISABLE_COLLECTSTATIC}' DJANGO_COLLECTSTATIC='${DJANGO_COLLECTSTATIC}'"
 
 # Collectstatic policy:
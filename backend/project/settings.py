@@ -70,6 +70,7 @@ MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "school.db_router.ReplicaRoutingMiddleware",
     # CSRF middleware can be disabled for API-only dev via DISABLE_CSRF flag below
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -103,12 +104,17 @@ WSGI_APPLICATION = "project.wsgi.application"
 # Railway provides DATABASE_URL; use dj-database-url to parse it
 import dj_database_url
 
+# Served by uvicorn workers instead of WSGI (start.sh). Django ties connections to the
+# async context under ASGI, so persistent connections are only kept under WSGI.
+ASGI = os.getenv("ASGI", "0") == "1"
+DB_CONN_MAX_AGE = 0 if ASGI else 600
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL:
     DATABASES = {
         "default": dj_database_url.config(
             default=DATABASE_URL,
-            conn_max_age=600,
+            conn_max_age=DB_CONN_MAX_AGE,
             conn_health_checks=True,
         )
     }
@@ -125,6 +131,22 @@ else:
         }
     }
 
+# Optional read replica: safe-method requests (lists, exports, dashboards) read from it,
+# see school/db_router.py. Clients that just wrote stay on the primary for
+# READ_REPLICA_PIN_SECONDS.
+READ_REPLICA_ALIAS = "replica"
+READ_REPLICA_PIN_SECONDS = int(os.getenv("READ_REPLICA_PIN_SECONDS", "10"))
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL")
+if REPLICA_DATABASE_URL:
+    DATABASES[READ_REPLICA_ALIAS] = dj_database_url.config(
+        default=REPLICA_DATABASE_URL,
+        conn_max_age=DB_CONN_MAX_AGE,
+        conn_health_checks=True,
+    )
+    # Never migrated (see ReplicaRouter.allow_migrate): tests read the primary's test database
+    DATABASES[READ_REPLICA_ALIAS]["TEST"] = {"MIRROR": "default"}
+DATABASE_ROUTERS = ["school.db_router.ReplicaRouter"]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -201,8 +223,77 @@ REST_FRAMEWORK = {
     ],
     "EXCEPTION_HANDLER": "school.exceptions.exception_handler",
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # orjson-backed JSON (same output as DRF's JSONRenderer, faster on large payloads)
+    "DEFAULT_RENDERER_CLASSES": [
+        "school.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "school.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
+# List totals at or above this many rows use the PostgreSQL planner estimate instead of
+# an exact COUNT(*) (flagged as count_approximate in responses). 0 disables estimates.
+PAGINATION_APPROX_COUNT_THRESHOLD = int(os.getenv("PAGINATION_APPROX_COUNT_THRESHOLD", "10000"))
+
+# Cached payloads (dashboard aggregates, previews, config) live in each worker's memory.
+# The version numbers that invalidate calendar feeds and the school config must be seen
+# by every gunicorn/uvicorn worker, so they live in a database table shared by all of
+# them (`manage.py createcachetable`, run at start-up).
+SHARED_CACHE_ALIAS = "shared"
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    SHARED_CACHE_ALIAS: {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "school_shared_cache",
+    },
+}
+
+# Dashboard aggregates (/utils/summary/, /utils/lesson-stats/) are cached this many seconds.
+DASHBOARD_STATS_CACHE_SECONDS = int(os.getenv("DASHBOARD_STATS_CACHE_SECONDS", "30"))
+
+# Serialized /school/config/ payload lifetime in the shared cache; changes invalidate it.
+SCHOOL_CONFIG_CACHE_SECONDS = int(os.getenv("SCHOOL_CONFIG_CACHE_SECONDS", "3600"))
+
+# Pattern previews (/scheduled-class-patterns/preview/) are cached this many seconds per
+# parameter set; bookings made meanwhile show up once the entry expires.
+PATTERN_PREVIEW_CACHE_SECONDS = int(os.getenv("PATTERN_PREVIEW_CACHE_SECONDS", "30"))
+
+# Open-ended scheduled class patterns keep classes materialized this many weeks ahead;
+# `manage.py extend_patterns` (run daily) moves the horizon forward.
+PATTERN_HORIZON_WEEKS = int(os.getenv("PATTERN_HORIZON_WEEKS", "8"))
+
+# iCalendar feeds (/calendar/<token>.ics) list bookings from this many days ago on.
+# Changing CALENDAR_FEED_SALT invalidates every issued feed URL.
+CALENDAR_FEED_PAST_DAYS = int(os.getenv("CALENDAR_FEED_PAST_DAYS", "90"))
+CALENDAR_FEED_SALT = os.getenv("CALENDAR_FEED_SALT", "school.calendar-feed")
+
+# Incremental sync (?since=<cursor> on list endpoints): changes from the last SYNC_LAG_SECONDS
+# wait for the next request, so rows saved by transactions still in flight are not skipped.
+# Tombstones of deleted rows are kept SYNC_TOMBSTONE_DAYS (`manage.py prune_tombstones`, run
+# daily); older cursors get 410 and must resync.
+SYNC_LAG_SECONDS = int(os.getenv("SYNC_LAG_SECONDS", "5"))
+SYNC_TOMBSTONE_DAYS = int(os.getenv("SYNC_TOMBSTONE_DAYS", "30"))
+
+# Student portal requests resolve their token to a cached principal for this many seconds
+# (per process; saving a student invalidates it locally). 0 disables the cache.
+STUDENT_PRINCIPAL_CACHE_SECONDS = int(os.getenv("STUDENT_PRINCIPAL_CACHE_SECONDS", "60"))
+
+# Serve the student portal endpoints with the async views in school/async_views.py
+# (dashboard sections load concurrently). On by default when running under ASGI.
+ASYNC_PORTAL = os.getenv("ASYNC_PORTAL", "1" if ASGI else "0") == "1"
+# Database connections (worker threads) one async dashboard request spreads its sections
+# over; 1 runs them one after another.
+PORTAL_DASHBOARD_CONNECTIONS = int(os.getenv("PORTAL_DASHBOARD_CONNECTIONS", "3"))
+
+# Threads used to hash passwords during bulk student imports (0 = one per CPU core).
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "0"))
+
 # Structured logging (console) for clearer debugging during development.
 LOGGING = {
     "version": 1,
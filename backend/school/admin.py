@@ -2,6 +2,7 @@ from django.contrib import admin
 from solo.admin import SingletonModelAdmin
 
 from . import models
+from .images import schedule_variants
 
 
 @admin.register(models.Student)
@@ -67,8 +68,8 @@ class PaymentAdmin(admin.ModelAdmin):
 
 @admin.register(models.ScheduledClassPattern)
 class ScheduledClassPatternAdmin(admin.ModelAdmin):
-    list_display = ("name", "course", "instructor", "start_date", "num_lessons", "default_duration_minutes", "default_max_students")
-    list_filter = ("course__category", "instructor")
+    list_display = ("name", "course", "instructor", "start_date", "num_lessons", "open_ended", "materialized_until", "default_duration_minutes", "default_max_students")
+    list_filter = ("course__category", "instructor", "open_ended")
     search_fields = ("name", "course__name", "instructor__first_name", "instructor__last_name")
     date_hierarchy = "start_date"
 
@@ -117,3 +118,9 @@ class SchoolConfigAdmin(SingletonModelAdmin):
         if obj:
             return []
         return []
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        for field in ("school_logo", "landing_image"):
+            if field in form.changed_data:
+                schedule_variants(obj, field)
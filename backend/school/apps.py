@@ -5,3 +5,12 @@ class SchoolConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "school"
     verbose_name = "Driving School Management"
+
+    def ready(self):
+        from . import config_cache, ical, rollups, student_auth, sync
+
+        config_cache.connect_signals()
+        ical.connect_signals()
+        rollups.connect_signals()
+        student_auth.connect_signals()
+        sync.connect_signals()
@@ -0,0 +1,90 @@
+"""Async variants of the student portal endpoints, for ASGI deployments.
+
+DRF views are synchronous, so these are plain Django async views. They accept the
+same requests and return the same JSON as ``student_login`` / ``student_me`` /
+``student_dashboard`` in ``legacy_views``:
+
+- Tokens are checked with ``StudentJWTAuthentication.aauthenticate`` and principals
+  are read through the async ORM
+- Errors go through the configured DRF ``EXCEPTION_HANDLER``
+- The dashboard loads its sections concurrently (``portal.astudent_dashboard``)
+
+``urls.py`` routes the portal paths here when ``ASYNC_PORTAL`` is enabled.
+"""
+
+from __future__ import annotations
+
+import io
+
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated
+from rest_framework.settings import api_settings
+
+from . import portal
+from .renderers import ORJSONParser, ORJSONRenderer
+from .views.base import StudentJWTAuthentication
+
+
+def _json(data, status: int = 200) -> HttpResponse:
+    return HttpResponse(
+        ORJSONRenderer().render(data), status=status, content_type="application/json"
+    )
+
+
+def _error(request, exc: APIException) -> HttpResponse:
+    handled = api_settings.EXCEPTION_HANDLER(exc, {"request": request, "view": None})
+    response = _json(handled.data, handled.status_code)
+    for header in ("WWW-Authenticate", "Retry-After"):
+        if header in handled:
+            response[header] = handled[header]
+    return response
+
+
+async def _authenticate(request):
+    """``(principal, None)`` for a valid student token, else ``(None, error response)``."""
+    authenticator = StudentJWTAuthentication()
+    try:
+        result = await authenticator.aauthenticate(request)
+        if result is None:
+            raise NotAuthenticated()
+    except (NotAuthenticated, AuthenticationFailed) as exc:
+        # Same 401 + WWW-Authenticate challenge as APIView.permission_denied
+        exc.auth_header = authenticator.authenticate_header(request)
+        exc.status_code = 401
+        return None, _error(request, exc)
+    return result[0], None
+
+
+def _request_data(request):
+    if request.content_type == "application/json":
+        return ORJSONParser().parse(io.BytesIO(request.body)) or {}
+    return request.POST
+
+
+@csrf_exempt
+@require_POST
+async def student_login(request):
+    try:
+        data = _request_data(request)
+    except APIException as exc:
+        return _error(request, exc)
+    payload, status_code = await portal.alogin(data)
+    return _json(payload, status_code)
+
+
+@require_GET
+async def student_me(request):
+    student, error = await _authenticate(request)
+    if error is not None:
+        return error
+    return _json(student.as_dict())
+
+
+@require_GET
+async def student_dashboard(request):
+    student, error = await _authenticate(request)
+    if error is not None:
+        return error
+    return _json(await portal.astudent_dashboard(student))
@@ -0,0 +1,112 @@
+"""Cached public school configuration for ``/api/school/config/``.
+
+The serialized ``SchoolConfig`` (with its addresses) is cached under a version number
+kept in the cache shared by all workers (``utils.shared_cache``), and each process
+keeps its last payload for ``LOCAL_RECHECK_SECONDS`` before comparing versions again.
+
+- Saving or deleting the config or an address, and changing the config's address
+  set, bumps the version (connected in ``SchoolConfig.ready``)
+- Payloads are cached per origin because image fields serialize to absolute URLs;
+  the origin comes from the ``Host`` header, so each process keeps at most
+  ``LOCAL_MAX_ORIGINS`` of them (shared entries expire with their timeout)
+- Each payload carries an ETag, so clients revalidate with ``If-None-Match``
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Any, Callable
+
+import orjson
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .models import Address, SchoolConfig
+from .renderers import ORJSONRenderer
+from .utils import cache_get_or_compute, shared_cache
+
+VERSION_KEY = "school:config:version"
+
+# How long a process serves its own copy before checking the shared version again
+LOCAL_RECHECK_SECONDS = 5
+
+# Origins a process keeps payloads for; the oldest is dropped past this
+LOCAL_MAX_ORIGINS = 16
+
+# origin -> (recheck at, version, etag, data)
+_local: dict[str, tuple[float, int, str, dict]] = {}
+
+
+def _version() -> int:
+    cache = shared_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Start from the clock so an evicted counter never reuses an old payload key
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _etagged(data: Any) -> tuple[str, dict]:
+    rendered = ORJSONRenderer().render(data)
+    return f'"{hashlib.md5(rendered, usedforsecurity=False).hexdigest()}"', orjson.loads(rendered)
+
+
+def cached_config(origin: str, serialize: Callable[[], Any]) -> tuple[str, dict]:
+    """``(etag, data)`` of the config as served at ``origin``; ``serialize`` runs on a miss."""
+    now = time.monotonic()
+    entry = _local.get(origin)
+    if entry is not None and entry[0] > now:
+        return entry[2], entry[3]
+
+    version = _version()
+    if entry is not None and entry[1] == version:
+        etag, data = entry[2], entry[3]
+    else:
+        etag, data = cache_get_or_compute(
+            f"school:config:{version}:{origin}",
+            lambda: _etagged(serialize()),
+            getattr(settings, "SCHOOL_CONFIG_CACHE_SECONDS", 3600),
+        )
+    _local.pop(origin, None)
+    while len(_local) >= LOCAL_MAX_ORIGINS:
+        del _local[next(iter(_local))]
+    _local[origin] = (now + LOCAL_RECHECK_SECONDS, version, etag, data)
+    return etag, data
+
+
+def invalidate_config() -> None:
+    _local.clear()
+    cache = shared_cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, time.time_ns(), None)
+
+
+# --- signal receivers (connected in SchoolConfig.ready) ---
+def _config_changed(sender, **kwargs):
+    if kwargs.get("raw"):
+        return
+    invalidate_config()
+    # Readers may cache the uncommitted change's previous state until the write commits
+    transaction.on_commit(invalidate_config)
+
+
+def _addresses_changed(sender, action, **kwargs):
+    if action.startswith("post_"):
+        _config_changed(sender)
+
+
+def connect_signals() -> None:
+    for model in (SchoolConfig, Address):
+        uid = f"school.config_cache.{model.__name__}"
+        post_save.connect(_config_changed, sender=model, dispatch_uid=f"{uid}.saved")
+        post_delete.connect(_config_changed, sender=model, dispatch_uid=f"{uid}.deleted")
+    m2m_changed.connect(
+        _addresses_changed,
+        sender=SchoolConfig.addresses.through,
+        dispatch_uid="school.config_cache.addresses",
+    )
@@ -0,0 +1,117 @@
+"""Read-replica routing for safe-method requests.
+
+``ReplicaRoutingMiddleware`` marks GET / HEAD / OPTIONS requests (lists, CSV exports,
+dashboard and report actions) as replica reads; ``ReplicaRouter`` then sends their
+queries to ``READ_REPLICA_ALIAS``. Writes, and every request of other methods, use
+``default``.
+
+- After a successful write request the client gets a cookie pinning its reads to the
+  primary for ``READ_REPLICA_PIN_SECONDS``, so it sees its own changes despite lag
+- A write inside a replica-routed request moves the rest of that request to the primary
+- Without a ``READ_REPLICA_ALIAS`` entry in ``DATABASES`` nothing is rerouted
+- Code outside requests (commands, signals fired by them) always uses the primary
+- Database cache entries (``utils.shared_cache``) always use the primary: they hold
+  invalidation versions, and writing them is not a data change that should pin
+- The middleware is async-capable, so it keeps async views (``async_views``) on the loop
+"""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+PIN_COOKIE = "db_primary_pin"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_READ_REPLICA, _READ_PRIMARY = "replica", "primary"
+_route: ContextVar[str | None] = ContextVar("school_db_route", default=None)
+
+
+def replica_alias() -> str | None:
+    alias = getattr(settings, "READ_REPLICA_ALIAS", "replica")
+    return alias if alias and alias in settings.DATABASES else None
+
+
+CACHE_APP_LABEL = "django_cache"
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return "default"
+        if _route.get() == _READ_REPLICA:
+            return replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return "default"
+        if _route.get() == _READ_REPLICA:
+            _route.set(_READ_PRIMARY)
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every alias holds the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives its schema through replication
+        if db == replica_alias():
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        if replica_alias() is None:
+            return self.get_response(request)
+
+        safe, use_replica, token = self._enter(request)
+        try:
+            response = self.get_response(request)
+            wrote = not safe or (use_replica and _route.get() == _READ_PRIMARY)
+        finally:
+            _route.reset(token)
+        return self._pin(response, wrote)
+
+    async def _acall(self, request):
+        if replica_alias() is None:
+            return await self.get_response(request)
+
+        safe, use_replica, token = self._enter(request)
+        try:
+            response = await self.get_response(request)
+            wrote = not safe or (use_replica and _route.get() == _READ_PRIMARY)
+        finally:
+            _route.reset(token)
+        return self._pin(response, wrote)
+
+    @staticmethod
+    def _enter(request):
+        safe = request.method in SAFE_METHODS
+        use_replica = safe and not request.COOKIES.get(PIN_COOKIE)
+        return safe, use_replica, _route.set(_READ_REPLICA if use_replica else _READ_PRIMARY)
+
+    @staticmethod
+    def _pin(response, wrote: bool):
+        if wrote and response.status_code < 400:
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=getattr(settings, "READ_REPLICA_PIN_SECONDS", 10),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -89,6 +89,32 @@ class VehicleCategory(_ChoiceStrEnum):
     DE = "DE"
 
 
+# Bit per category for ``Instructor.license_mask``. Persisted: append new categories
+# to VehicleCategory, never reorder or remove members.
+LICENSE_CATEGORY_BITS = {member.value: 1 << index for index, member in enumerate(VehicleCategory)}
+
+# Categories whose bit has its own expression index on ``Instructor.license_mask``
+INDEXED_LICENSE_CATEGORIES = ("A", "B", "BE", "C", "CE", "D")
+
+
+def license_category_mask(categories) -> int:
+    """Bitmask of ``categories`` (values or comma separated string); unknown ones are ignored."""
+    if isinstance(categories, str):
+        categories = categories.split(",")
+    mask = 0
+    for category in categories:
+        mask |= LICENSE_CATEGORY_BITS.get(str(category).strip().upper(), 0)
+    return mask
+
+
+class RollupKind(_ChoiceStrEnum):
+    """Source of a DailyRollup row."""
+
+    LESSON = "LESSON"
+    CLASS = "CLASS"
+    PAYMENT = "PAYMENT"
+
+
 class DayOfWeek(_ChoiceStrEnum):
     MONDAY = "MONDAY"
     TUESDAY = "TUESDAY"
@@ -0,0 +1,249 @@
+"""Read-only fast path for list endpoints: serializer-shaped dicts from ``.values()`` rows.
+
+``ValuesSerializer`` compiles a DRF ``ModelSerializer`` class once into a flat plan of
+``(output key, values() path, converter)`` entries, so list pages skip model
+instantiation and DRF's per-field ``get_attribute`` / ``to_representation`` calls.
+
+- Nested single relations become joined ``values()`` paths (``enrollment__student__email``)
+- Many-to-many relations are loaded with one through-table query per relation
+  (plus one row query when nested), ordered by related primary key
+- ``SerializerMethodField`` values are rebuilt from ``METHOD_FIELDS``; serializers with
+  other method fields are rejected when the plan is compiled
+- Output is identical to the wrapped serializer (see ``tests/test_fast_serializers.py``)
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+
+from .models import Resource
+from .serializers import EnrollmentSerializer, ResourceSerializer, ScheduledClassSerializer
+
+# Field types whose representation of a database value is the value itself
+_IDENTITY_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.JSONField,
+    PrimaryKeyRelatedField,
+)
+
+# Plans a ValuesSerializer keeps; pruned shapes come from ?fields= / ?expand=, so the
+# least recently used is dropped past this
+MAX_PLANS = 32
+
+_RESOURCE_TYPE_LABELS = dict(Resource._meta.get_field("type").flatchoices)
+
+# (serializer class, field name) -> (paths relative to the serializer, function of their values).
+# A path naming a many-to-many field yields the list of related ids.
+METHOD_FIELDS = {
+    (EnrollmentSerializer, "label"): (
+        ("student__first_name", "student__last_name", "type", "course__type", "course__category"),
+        lambda first, last, type_, course_type, category: (
+            f"{first} {last} - {type_ or course_type} - {category}"
+        ),
+    ),
+    (ResourceSerializer, "resource_type"): (
+        ("type",),
+        lambda type_: _RESOURCE_TYPE_LABELS.get(type_, type_),
+    ),
+    (ScheduledClassSerializer, "current_enrollment"): (("students",), len),
+    (ScheduledClassSerializer, "available_spots"): (
+        ("max_students", "students"),
+        lambda max_students, students: max(0, max_students - len(students)),
+    ),
+}
+
+
+def _shape(serializer):
+    """Hashable outline of the (possibly pruned) field tree of ``serializer``."""
+    shape = []
+    for name, field in serializer.fields.items():
+        if isinstance(field, serializers.ListSerializer):
+            field = field.child
+        shape.append((name, _shape(field) if isinstance(field, serializers.Serializer) else None))
+    return tuple(shape)
+
+
+class _Relation:
+    """A many-to-many relation whose ids (and optionally rows) are loaded per page."""
+
+    def __init__(self, field, owner_path):
+        self.field = field
+        self.owner_path = owner_path
+        self.ops = None
+        self.paths = None
+
+    def load(self, rows):
+        owner_ids = {row[self.owner_path] for row in rows} - {None}
+        ids_by_owner = defaultdict(list)
+        if not owner_ids:
+            return ids_by_owner, {}
+        owner_col, related_col = self.field.m2m_field_name(), self.field.m2m_reverse_field_name()
+        links = (
+            self.field.remote_field.through.objects.filter(**{f"{owner_col}__in": owner_ids})
+            .order_by(owner_col, related_col)
+            .values_list(owner_col, related_col)
+        )
+        for owner_id, related_id in links:
+            ids_by_owner[owner_id].append(related_id)
+        related_rows = {}
+        if self.ops is not None:
+            related_ids = {pk for ids in ids_by_owner.values() for pk in ids}
+            model = self.field.related_model
+            pk_name = model._meta.pk.name
+            related_rows = {
+                row[pk_name]: row
+                for row in model._default_manager.filter(pk__in=related_ids)
+                .order_by()
+                .values(*self.paths)
+            }
+        return ids_by_owner, related_rows
+
+
+class ValuesSerializer:
+    """Serialize querysets like ``serializer_class(many=True).data`` from ``.values()`` rows."""
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self._plans = {}
+
+    def _plan(self, serializer=None):
+        """Compiled plan for ``serializer`` (default: a fresh ``serializer_class``).
+
+        Pruned instances (sparse fieldsets) get their own plan, cached by field shape
+        (at most ``MAX_PLANS``, least recently used first out).
+        """
+        serializer = serializer if serializer is not None else self.serializer_class()
+        serializer = getattr(serializer, "child", serializer)
+        key = _shape(serializer)
+        plan = self._plans.pop(key, None)
+        if plan is None:
+            paths, relations = [], {}
+            ops = self._compile(serializer, "", paths, relations)
+            plan = (ops, paths, relations)
+            while len(self._plans) >= MAX_PLANS:
+                self._plans.pop(next(iter(self._plans)), None)
+        self._plans[key] = plan
+        return plan
+
+    def values(self, queryset, serializer=None, extra=()):
+        """``queryset`` restricted to the columns the plan reads (keeps filters and ordering).
+
+        ``extra`` adds columns needed outside the response, e.g. keyset cursor fields.
+        """
+        paths = self._plan(serializer)[1]
+        return queryset.values(*paths, *(name for name in extra if name not in paths))
+
+    def serialize(self, rows, serializer=None):
+        rows = list(rows)
+        ops, _paths, relations = self._plan(serializer)
+        loaded = {key: relation.load(rows) for key, relation in relations.items()}
+        return [self._build(ops, row, loaded) for row in rows]
+
+    # --- compilation ---
+    def _compile(self, serializer, prefix, paths, relations, nested_ok=True):
+        model = serializer.Meta.model
+        pk_path = prefix + model._meta.pk.name
+        if pk_path not in paths:
+            paths.append(pk_path)
+        ops = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            source = field.source
+            path = prefix + source
+            if not isinstance(field, serializers.SerializerMethodField) and (
+                source == "*" or "." in source
+            ):
+                raise ImproperlyConfigured(
+                    f"{type(serializer).__name__}.{name}: unsupported source"
+                )
+
+            if isinstance(field, (serializers.ListSerializer, ManyRelatedField)):
+                if not nested_ok:
+                    raise ImproperlyConfigured(
+                        f"{type(serializer).__name__}.{name}: nested many-to-many"
+                    )
+                relation = relations.get(path)
+                if relation is None:
+                    relation = relations[path] = _Relation(model._meta.get_field(source), pk_path)
+                if isinstance(field, serializers.ListSerializer):
+                    if relation.ops is None:
+                        relation.paths = []
+                        relation.ops = self._compile(
+                            field.child, "", relation.paths, relations, nested_ok=False
+                        )
+                    ops.append((name, "many", (path, pk_path), relation.ops))
+                else:
+                    ops.append((name, "ids", (path, pk_path), None))
+            elif isinstance(field, serializers.ModelSerializer):
+                nested_prefix = path + "__"
+                nested_pk = nested_prefix + field.Meta.model._meta.pk.name
+                ops.append(
+                    (
+                        name,
+                        "nested",
+                        nested_pk,
+                        self._compile(field, nested_prefix, paths, relations, nested_ok),
+                    )
+                )
+            elif isinstance(field, serializers.SerializerMethodField):
+                try:
+                    method_paths, func = METHOD_FIELDS[(type(serializer), name)]
+                except KeyError:
+                    raise ImproperlyConfigured(
+                        f"{type(serializer).__name__}.{name}: no METHOD_FIELDS entry"
+                    ) from None
+                args = []
+                for method_path in method_paths:
+                    full_path = prefix + method_path
+                    if "__" not in method_path and model._meta.get_field(method_path).many_to_many:
+                        relations.setdefault(
+                            full_path, _Relation(model._meta.get_field(method_path), pk_path)
+                        )
+                        args.append((full_path, pk_path))
+                    else:
+                        if full_path not in paths:
+                            paths.append(full_path)
+                        args.append((full_path, None))
+                ops.append((name, "method", args, func))
+            else:
+                if path not in paths:
+                    paths.append(path)
+                convert = None if isinstance(field, _IDENTITY_FIELDS) else field.to_representation
+                ops.append((name, "value", path, convert))
+        return ops
+
+    # --- execution ---
+    def _build(self, ops, row, loaded):
+        data = {}
+        for name, kind, path, extra in ops:
+            if kind == "value":
+                value = row[path]
+                data[name] = value if extra is None or value is None else extra(value)
+            elif kind == "nested":
+                data[name] = None if row[path] is None else self._build(extra, row, loaded)
+            elif kind == "ids":
+                key, owner_path = path
+                data[name] = list(loaded[key][0].get(row[owner_path], ()))
+            elif kind == "many":
+                key, owner_path = path
+                ids_by_owner, related_rows = loaded[key]
+                data[name] = [
+                    self._build(extra, related_rows[pk], loaded)
+                    for pk in ids_by_owner.get(row[owner_path], ())
+                ]
+            else:  # method: each argument is a column or, with an owner path, related ids
+                data[name] = extra(
+                    *(
+                        row[arg] if owner_path is None else loaded[arg][0].get(row[owner_path], [])
+                        for arg, owner_path in path
+                    )
+                )
+        return data
@@ -0,0 +1,146 @@
+"""Rolling-horizon materialization of open-ended scheduled class patterns.
+
+An open-ended pattern (``ScheduledClassPattern.open_ended``) repeats until its
+``end_date`` or indefinitely, but only has ``ScheduledClass`` rows up to
+``materialized_until`` (about ``PATTERN_HORIZON_WEEKS`` ahead), which keeps the class
+table and the booking conflict queries small:
+
+- ``extend_pattern`` / ``extend_patterns`` (``manage.py extend_patterns``, run daily)
+  create the occurrences between ``materialized_until`` and the new horizon and enroll
+  the pattern's students. Occurrences that would overlap a booking made meanwhile are
+  skipped and logged.
+- ``virtual_classes`` expands the occurrences past the horizon for calendar views
+  without writing them
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .enums import LessonStatus, RollupKind
+from .ical import booking_participants, bookings_changed
+from .models import ScheduledClass, ScheduledClassPattern, booking_end_time
+from .regeneration import enroll_pattern_students
+from .rollups import schedule_rebuild
+from .series import booking_intervals, overlaps_any
+
+logger = logging.getLogger(__name__)
+
+# Fields of ``virtual_classes`` entries (and of the calendar action's materialized rows)
+CALENDAR_FIELDS = (
+    "id",
+    "pattern_id",
+    "name",
+    "course_id",
+    "instructor_id",
+    "resource_id",
+    "scheduled_time",
+    "end_time",
+    "duration_minutes",
+    "max_students",
+    "status",
+)
+
+
+def _business_date(moment: datetime) -> date:
+    # Pattern dates are business-local days (see series._business_midnight)
+    return moment.astimezone(ZoneInfo(getattr(settings, "BUSINESS_TZ", "Europe/Chisinau"))).date()
+
+
+def _first_unmaterialized_date(pattern) -> date:
+    if pattern.materialized_until:
+        return pattern.materialized_until + timedelta(days=1)
+    # Made open-ended after classes were generated: continue after the last one
+    last = (
+        pattern.scheduled_classes.order_by("-scheduled_time")
+        .values_list("scheduled_time", flat=True)
+        .first()
+    )
+    return _business_date(last) + timedelta(days=1) if last else pattern.start_date
+
+
+def extend_pattern(pattern, today: date | None = None) -> list:
+    """Materialize ``pattern``'s occurrences up to its horizon; returns the created classes."""
+    with transaction.atomic():
+        pattern = ScheduledClassPattern.objects.select_for_update().get(pk=pattern.pk)
+        until = pattern.materialization_end(today)
+        if until is None:
+            return []
+        start = _first_unmaterialized_date(pattern)
+        candidates = (
+            pattern.generate_scheduled_classes(start=start, until=until) if start <= until else []
+        )
+
+        created = []
+        if candidates:
+            by_instructor, by_resource = booking_intervals(
+                [pattern.instructor_id],
+                [pattern.resource_id],
+                min(cls.scheduled_time for cls in candidates),
+                max(cls.end_time for cls in candidates),
+            )
+            fitting = []
+            for cls in candidates:
+                end = booking_end_time(cls.scheduled_time, cls.duration_minutes)
+                if overlaps_any(
+                    by_instructor[pattern.instructor_id], cls.scheduled_time, end
+                ) or overlaps_any(by_resource[pattern.resource_id], cls.scheduled_time, end):
+                    logger.warning(
+                        "Skipping %s of pattern '%s' (ID: %s): overlaps an existing booking",
+                        cls.scheduled_time,
+                        pattern.name,
+                        pattern.pk,
+                    )
+                    continue
+                fitting.append(cls)
+            created = ScheduledClass.objects.bulk_create(fitting)
+            enroll_pattern_students(pattern, created)
+            schedule_rebuild(RollupKind.CLASS, [cls.scheduled_time for cls in created])
+            bookings_changed(booking_participants(ScheduledClass, [cls.pk for cls in created]))
+        ScheduledClassPattern.objects.filter(pk=pattern.pk).update(
+            materialized_until=until, updated_at=timezone.now()
+        )
+    return created
+
+
+def extend_patterns(today: date | None = None) -> dict[int, int]:
+    """Extend every open-ended pattern whose horizon moved; ``{pattern id: classes created}``."""
+    today = today or date.today()
+    results = {}
+    for pattern in ScheduledClassPattern.objects.filter(open_ended=True).order_by("pk"):
+        if (
+            pattern.materialized_until is not None
+            and pattern.materialized_until >= pattern.horizon_date(today)
+        ):
+            continue
+        results[pattern.pk] = len(extend_pattern(pattern, today))
+    return results
+
+
+def virtual_classes(patterns, start: datetime, end: datetime) -> list[dict]:
+    """Not yet materialized occurrences of open-ended ``patterns`` in ``[start, end)``.
+
+    Entries have the ``CALENDAR_FIELDS`` with ``id`` None, plus ``virtual: True``.
+    """
+    first_day, last_day = _business_date(start), _business_date(end)
+    patterns = patterns.filter(open_ended=True, start_date__lte=last_day).exclude(
+        end_date__lt=first_day
+    )
+    entries = []
+    for pattern in patterns:
+        from_day = max(first_day, _first_unmaterialized_date(pattern))
+        until = min(last_day, pattern.end_date) if pattern.end_date else last_day
+        if from_day > until:
+            continue
+        for cls in pattern.generate_scheduled_classes(start=from_day, until=until):
+            if start <= cls.scheduled_time < end:
+                entry = {field: getattr(cls, field) for field in CALENDAR_FIELDS}
+                entry.update(id=None, status=LessonStatus.SCHEDULED.value, virtual=True)
+                entries.append(entry)
+    return entries
@@ -0,0 +1,410 @@
+"""iCalendar (``.ics``) feeds of instructors', students' and resources' schedules.
+
+Feeds live at tokenized URLs (``/calendar/<token>.ics``): the token is the signed
+``<kind>-<id>``, so it needs no table; changing ``CALENDAR_FEED_SALT`` revokes them all.
+
+- Lessons and scheduled classes from ``CALENDAR_FEED_PAST_DAYS`` ago on come from one
+  ``UNION ALL`` query (``scheduled_time`` indexes) streamed in chunks
+- A pattern's classes that follow a weekly rhythm become one ``RRULE`` event, with
+  ``EXDATE`` for the occurrences that no longer exist; the rest are single ``VEVENT``s
+- A booking change bumps the feed versions of its instructor, resource and students
+  (``bookings_changed``; connected in ``SchoolConfig.ready``, and called after bulk
+  writes); course, resource and pattern edits, which show in many feeds, bump one
+  shared version. A feed's ``ETag`` and ``Last-Modified`` derive from the later of the
+  two, so polling clients mostly get a 304
+- The bumps of one transaction are collected and written once it commits; bulk writes
+  that call ``bookings_changed`` themselves run under ``per_row_receivers_paused``
+- Versions live in the cache shared by all workers (``utils.shared_cache``), so a
+  change made through one worker is seen by the others
+"""
+
+from __future__ import annotations
+
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.core import signing
+from django.db import models
+from django.db.models import F, Value
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.urls import reverse
+from django.utils import timezone
+
+from .enums import LessonStatus
+from .models import (
+    Course,
+    Instructor,
+    Lesson,
+    Resource,
+    ScheduledClass,
+    ScheduledClassPattern,
+    Student,
+)
+from .transitions import statuses_changed
+from .utils import on_commit_batch, shared_cache
+
+VERSION_KEY = "school:calendar-feeds:version"
+
+FEED_MODELS = {"instructor": Instructor, "student": Student, "resource": Resource}
+
+ACTIVE_STATUSES = [LessonStatus.SCHEDULED.value, LessonStatus.COMPLETED.value]
+
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+# Set while a bulk write reports its own participants (see per_row_receivers_paused)
+_receivers_paused: ContextVar[bool] = ContextVar("school_ical_receivers_paused", default=False)
+
+# Columns of the feed query, in order
+COLUMNS = (
+    "ev_kind",
+    "ev_id",
+    "ev_pattern",
+    "ev_title",
+    "ev_series",
+    "ev_start",
+    "ev_minutes",
+    "ev_location",
+)
+
+
+# --- tokens ---
+def _signer() -> signing.Signer:
+    return signing.Signer(
+        salt=getattr(settings, "CALENDAR_FEED_SALT", "school.calendar-feed"), sep="."
+    )
+
+
+def feed_token(kind: str, pk: int) -> str:
+    return _signer().sign(f"{kind}-{pk}")
+
+
+def resolve_feed_token(token: str) -> tuple[str, int] | None:
+    """``(kind, id)`` of a valid token, else None."""
+    try:
+        kind, _, pk = _signer().unsign(token).partition("-")
+    except signing.BadSignature:
+        return None
+    if kind not in FEED_MODELS or not pk.isdigit():
+        return None
+    return kind, int(pk)
+
+
+def feed_url(request, kind: str, pk: int) -> str:
+    return request.build_absolute_uri(reverse("calendar-feed", args=[feed_token(kind, pk)]))
+
+
+# --- version ---
+def _participant_key(kind: str, pk: int) -> str:
+    return f"{VERSION_KEY}:{kind}-{pk}"
+
+
+def feed_version(kind: str, pk: int) -> int:
+    """Time (ns) of the last change to the feed of ``kind`` ``pk``; its ETag / Last-Modified."""
+    key = _participant_key(kind, pk)
+    cache = shared_cache()
+    versions = cache.get_many([VERSION_KEY, key])
+    shared = versions.get(VERSION_KEY)
+    if shared is None:
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        shared = cache.get(VERSION_KEY)
+    return max(shared, versions.get(key, 0))
+
+
+def invalidate_feeds(participants: frozenset | None = None) -> None:
+    """Bump the versions of ``participants`` (``(kind, id)`` pairs), or the shared one."""
+    now = time.time_ns()
+    cache = shared_cache()
+    if participants is None:
+        cache.set(VERSION_KEY, now, None)
+    else:
+        cache.set_many({_participant_key(kind, pk): now for kind, pk in participants}, None)
+
+
+def booking_participants(model, ids: Iterable[int]) -> set[tuple[str, int]]:
+    """``(kind, id)`` of the feeds showing the ``Lesson`` / ``ScheduledClass`` rows ``ids``."""
+    ids = list(ids)
+    if not ids:
+        return set()
+    columns = {"instructor": "instructor_id", "resource": "resource_id"}
+    if model is Lesson:
+        columns["student"] = "enrollment__student_id"
+    participants = set()
+    for row in model._default_manager.filter(pk__in=ids).values_list(*columns.values()):
+        participants.update((kind, pk) for kind, pk in zip(columns, row) if pk is not None)
+    if model is ScheduledClass:
+        roster = ScheduledClass.students.through.objects.filter(scheduledclass_id__in=ids)
+        participants.update(("student", pk) for pk in roster.values_list("student_id", flat=True))
+    return participants
+
+
+def _invalidate_pending(pending: set) -> None:
+    # None stands for every feed: the shared version outranks the participant ones
+    if None in pending:
+        invalidate_feeds()
+    else:
+        invalidate_feeds(frozenset(pending))
+
+
+def bookings_changed(participants: Iterable[tuple[str, int]] | None = None) -> None:
+    """Invalidate the feeds of ``participants`` (see ``booking_participants``), or all feeds.
+
+    Versions are bumped once the current transaction commits: a feed read before then
+    would pair the new version with the old rows. Call after bulk booking writes, which
+    send no signals.
+    """
+    on_commit_batch(
+        "school.ical", [None] if participants is None else participants, _invalidate_pending
+    )
+
+
+@contextmanager
+def per_row_receivers_paused():
+    """Skip the booking save / delete receivers; for bulk writes that call ``bookings_changed``."""
+    token = _receivers_paused.set(True)
+    try:
+        yield
+    finally:
+        _receivers_paused.reset(token)
+
+
+# --- query ---
+def _events_query(kind: str, pk: int):
+    since = timezone.now() - timedelta(days=getattr(settings, "CALENDAR_FEED_PAST_DAYS", 90))
+    lessons = Lesson.objects.filter(status__in=ACTIVE_STATUSES, scheduled_time__gte=since)
+    classes = ScheduledClass.objects.filter(status__in=ACTIVE_STATUSES, scheduled_time__gte=since)
+    if kind == "student":
+        lessons = lessons.filter(enrollment__student_id=pk)
+        classes = classes.filter(students=pk)
+    else:
+        lessons = lessons.filter(**{f"{kind}_id": pk})
+        classes = classes.filter(**{f"{kind}_id": pk})
+
+    lessons = (
+        lessons.annotate(
+            ev_kind=Value("lesson"),
+            ev_id=F("id"),
+            ev_pattern=Value(None, output_field=models.BigIntegerField()),
+            ev_title=F("enrollment__course__name"),
+            ev_series=Value(None, output_field=models.CharField()),
+            ev_start=F("scheduled_time"),
+            ev_minutes=F("duration_minutes"),
+            ev_location=F("resource__name"),
+        )
+        .order_by()
+        .values_list(*COLUMNS)
+    )
+    classes = (
+        classes.annotate(
+            ev_kind=Value("class"),
+            ev_id=F("id"),
+            ev_pattern=F("pattern_id"),
+            ev_title=F("name"),
+            ev_series=F("pattern__name"),
+            ev_start=F("scheduled_time"),
+            ev_minutes=F("duration_minutes"),
+            ev_location=F("resource__name"),
+        )
+        .order_by()
+        .values_list(*COLUMNS)
+    )
+    # Grouped by pattern for the RRULE detection
+    return lessons.union(classes, all=True).order_by("ev_pattern", "ev_start")
+
+
+# --- rendering ---
+def _escape(text) -> str:
+    return (
+        str(text or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    # Content lines are folded at 75 octets (RFC 5545 3.1)
+    data = line.encode()
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts, start = [], 0
+    while start < len(data):
+        end = min(start + (75 if not parts else 74), len(data))
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1  # don't split a UTF-8 sequence
+        parts.append(data[start:end].decode())
+        start = end
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _stamp(moment: datetime) -> str:
+    return moment.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _vevent(
+    uid: str, start: datetime, minutes: int, summary: str, location, dtstamp: str, extra=()
+) -> str:
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{dtstamp}",
+        f"DTSTART:{_stamp(start)}",
+        f"DTEND:{_stamp(start + timedelta(minutes=minutes))}",
+        *extra,
+        f"SUMMARY:{_escape(summary)}",
+    ]
+    if location:
+        lines.append(f"LOCATION:{_escape(location)}")
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
+
+
+def _weekly_series(starts: list[datetime]) -> tuple[list[str], list[datetime]] | None:
+    """``(BYDAY values, EXDATEs)`` if ``starts`` (same time of day, sorted) fit a weekly RRULE."""
+    if len(starts) < 2:
+        return None
+    weekdays = sorted({start.weekday() for start in starts})
+    present = set(starts)
+    missing = []
+    moment = starts[0]
+    while moment <= starts[-1]:
+        if moment.weekday() in weekdays and moment not in present:
+            missing.append(moment)
+        moment += timedelta(days=1)
+    if len(missing) > len(starts):
+        # Mostly gaps: single events are clearer and not much longer
+        return None
+    return [WEEKDAYS[day] for day in weekdays], missing
+
+
+def _pattern_events(rows: list[tuple], host: str, dtstamp: str) -> Iterator[str]:
+    # One series per (UTC time of day, duration, location): a pattern with two times a
+    # day yields two RRULEs; classes moved off the rhythm stay single events
+    def series_key(row):
+        start = row[5].astimezone(dt_timezone.utc)
+        return start.time(), row[6], row[7] or ""
+
+    for (time_of_day, minutes, location), group in itertools.groupby(
+        sorted(rows, key=series_key), key=series_key
+    ):
+        group = sorted(group, key=lambda row: row[5])
+        starts = [row[5].astimezone(dt_timezone.utc) for row in group]
+        series = _weekly_series(starts)
+        if series is None:
+            for row in group:
+                yield _vevent(f"class-{row[1]}@{host}", row[5], row[6], row[3], row[7], dtstamp)
+            continue
+        byday, exdates = series
+        first = group[0]
+        extra = [f"RRULE:FREQ=WEEKLY;BYDAY={','.join(byday)};UNTIL={_stamp(starts[-1])}"]
+        if exdates:
+            extra.append("EXDATE:" + ",".join(_stamp(moment) for moment in exdates))
+        yield _vevent(
+            f"pattern-{first[2]}-{time_of_day.strftime('%H%M')}-{minutes}@{host}",
+            starts[0],
+            minutes,
+            first[4] or first[3],
+            location,
+            dtstamp,
+            extra,
+        )
+
+
+def render_feed(kind: str, pk: int, name: str, host: str, version: int) -> Iterable[str]:
+    """The feed of ``kind`` ``pk`` as chunks of ``.ics`` text."""
+    dtstamp = _stamp(datetime.fromtimestamp(version / 1e9, tz=dt_timezone.utc))
+    yield "".join(
+        _fold(line)
+        for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//Driving School//Schedule//EN",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{_escape(name)}",
+            "REFRESH-INTERVAL;VALUE=DURATION:PT15M",
+            "X-PUBLISHED-TTL:PT15M",
+        )
+    )
+    rows = _events_query(kind, pk).iterator(chunk_size=500)
+    for pattern_id, group in itertools.groupby(rows, key=lambda row: row[2]):
+        if pattern_id is None:
+            for row in group:
+                yield _vevent(f"{row[0]}-{row[1]}@{host}", row[5], row[6], row[3], row[7], dtstamp)
+        else:
+            yield from _pattern_events(list(group), host, dtstamp)
+    yield "END:VCALENDAR\r\n"
+
+
+# --- signal receivers (connected in SchoolConfig.ready) ---
+def _remember_participants(sender, instance, raw=False, **kwargs):
+    # The feeds a booking leaves (another instructor, resource or student) change too
+    if raw or instance._state.adding or instance.pk is None or _receivers_paused.get():
+        return
+    instance._feed_participants = booking_participants(sender, [instance.pk])
+
+
+def _booking_saved(sender, instance, raw=False, **kwargs):
+    if raw or _receivers_paused.get():
+        return
+    previous = instance.__dict__.pop("_feed_participants", set())
+    bookings_changed(previous | booking_participants(sender, [instance.pk]))
+
+
+def _booking_deleted(sender, instance, **kwargs):
+    if _receivers_paused.get():
+        return
+    bookings_changed(instance.__dict__.pop("_feed_participants", set()))
+
+
+def _shared_changed(sender, **kwargs):
+    if kwargs.get("raw"):
+        return
+    bookings_changed()
+
+
+def _participant_saved(sender, instance, raw=False, **kwargs):
+    # The calendar name
+    if not raw:
+        bookings_changed({("instructor" if sender is Instructor else "student", instance.pk)})
+
+
+def _roster_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        if action.startswith("post_"):
+            bookings_changed({("student", instance.pk)})
+    elif action in ("post_add", "post_remove"):
+        bookings_changed(("student", pk) for pk in pk_set or ())
+    elif action == "pre_clear":
+        bookings_changed(("student", pk) for pk in instance.students.values_list("pk", flat=True))
+
+
+def _statuses_changed(sender, ids, **kwargs):
+    bookings_changed(booking_participants(sender, ids))
+
+
+def connect_signals() -> None:
+    for model in (Lesson, ScheduledClass):
+        uid = f"school.ical.{model.__name__}"
+        pre_save.connect(_remember_participants, sender=model, dispatch_uid=f"{uid}.saving")
+        post_save.connect(_booking_saved, sender=model, dispatch_uid=f"{uid}.saved")
+        pre_delete.connect(_remember_participants, sender=model, dispatch_uid=f"{uid}.deleting")
+        post_delete.connect(_booking_deleted, sender=model, dispatch_uid=f"{uid}.deleted")
+    for model in (ScheduledClassPattern, Resource, Course):
+        uid = f"school.ical.{model.__name__}"
+        post_save.connect(_shared_changed, sender=model, dispatch_uid=f"{uid}.saved")
+        post_delete.connect(_shared_changed, sender=model, dispatch_uid=f"{uid}.deleted")
+    for model in (Instructor, Student):
+        post_save.connect(
+            _participant_saved, sender=model, dispatch_uid=f"school.ical.{model.__name__}.saved"
+        )
+    m2m_changed.connect(
+        _roster_changed, sender=ScheduledClass.students.through, dispatch_uid="school.ical.roster"
+    )
+    statuses_changed.connect(_statuses_changed, dispatch_uid="school.ical.transitions")
@@ -0,0 +1,152 @@
+"""Resized variants of the school logo and landing image.
+
+After an upload commits, ``schedule_variants`` hands the stored original to a
+background worker that writes downscaled copies next to it (``logos/logo.256w.<hash>.webp``)
+in every format of ``VARIANT_FORMATS`` that this Pillow build can encode. The file
+names carry a hash of their content, so they can be served with immutable caching.
+
+The result is recorded in ``SchoolConfig.<field>_variants`` together with the
+original's name; ``srcsets`` ignores variants of an earlier upload.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import ExifTags, Image, ImageOps, features
+
+from . import config_cache
+from .models import SchoolConfig
+
+logger = logging.getLogger(__name__)
+
+# image field -> target widths in pixels (never upscaled)
+VARIANT_WIDTHS = {
+    "school_logo": (128, 256, 512),
+    "landing_image": (640, 1280, 1920),
+}
+
+# MIME type -> (Pillow format, extension, save options, Pillow module / None). AVIF is
+# skipped on Pillow builds without the module (before 11.2).
+VARIANT_FORMATS = {
+    "image/avif": ("AVIF", "avif", {"quality": 60}, "avif"),
+    "image/webp": ("WEBP", "webp", {"quality": 80, "method": 4}, "webp"),
+    "image/jpeg": ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}, None),
+}
+
+# One worker: uploads are rare and resizing a 5 MB image is CPU-bound
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-variants")
+
+
+def _encoders() -> dict:
+    return {
+        mime: spec
+        for mime, spec in VARIANT_FORMATS.items()
+        if spec[3] is None or (spec[3] in features.modules and features.check_module(spec[3]))
+    }
+
+
+def _encode(image: Image.Image, pil_format: str, options: dict) -> bytes:
+    if pil_format == "JPEG" and image.mode != "RGB":
+        # No alpha in JPEG: flatten onto white
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A") if "A" in image.getbands() else None)
+        image = background
+    buffer = io.BytesIO()
+    image.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def build_variants(name: str, widths) -> dict:
+    """Write the variants of the stored image ``name``; returns the ``<field>_variants`` value."""
+    with default_storage.open(name, "rb") as file, Image.open(file) as original:
+        # EXIF orientations 5-8 store the image rotated by 90 degrees
+        rotated = original.getexif().get(ExifTags.Base.Orientation, 1) in (5, 6, 7, 8)
+        display = original.size[::-1] if rotated else original.size
+        # JPEGs decode at a reduced scale when the largest variant is much smaller
+        largest = min(max(widths), display[0])
+        target = (largest, math.ceil(display[1] * largest / display[0]))
+        original.draft("RGB", target[::-1] if rotated else target)
+        image = ImageOps.exif_transpose(original)
+        alpha = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if alpha else "RGB")
+
+    root, _ = os.path.splitext(name)
+    files: dict[str, dict[str, str]] = {}
+    for width in sorted({min(width, image.width) for width in widths}):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for mime, (pil_format, extension, options, _feature) in _encoders().items():
+            data = _encode(resized, pil_format, options)
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            path = f"{root}.{width}w.{digest}.{extension}"
+            if not default_storage.exists(path):
+                path = default_storage.save(path, ContentFile(data))
+            files.setdefault(mime, {})[str(width)] = path
+    return {"source": name, "width": display[0], "height": display[1], "files": files}
+
+
+def _delete_files(variants: dict, keep: dict) -> None:
+    kept = {path for paths in keep.get("files", {}).values() for path in paths.values()}
+    for paths in variants.get("files", {}).values():
+        for path in paths.values():
+            if path not in kept:
+                default_storage.delete(path)
+
+
+def generate_variants(config_id: int, field: str, name: str) -> None:
+    """Build and record the variants of ``name`` unless ``field`` changed meanwhile."""
+    variants_field = f"{field}_variants"
+    variants = build_variants(name, VARIANT_WIDTHS[field])
+    previous = (
+        SchoolConfig.objects.filter(pk=config_id).values_list(variants_field, flat=True).first()
+    )
+    updated = SchoolConfig.objects.filter(pk=config_id, **{field: name}).update(
+        **{variants_field: variants}
+    )
+    if not updated:
+        # Replaced by a newer upload whose own task records its variants
+        _delete_files(variants, keep={})
+        return
+    _delete_files(previous or {}, keep=variants)
+    # update() sends no signals
+    config_cache.invalidate_config()
+
+
+def _generate_in_worker(config_id: int, field: str, name: str) -> None:
+    # The worker thread keeps its connection between tasks; drop stale / expired ones
+    close_old_connections()
+    try:
+        generate_variants(config_id, field, name)
+    except Exception:
+        logger.exception("Failed to build %s variants for %s", field, name)
+    finally:
+        close_old_connections()
+
+
+def schedule_variants(config: SchoolConfig, field: str) -> None:
+    """Build the variants of ``config.<field>`` in the background once the upload commits."""
+    name = getattr(config, field).name
+    if name:
+        transaction.on_commit(lambda: _executor.submit(_generate_in_worker, config.pk, field, name))
+
+
+def srcsets(variants: dict, current_name: str | None, build_url) -> dict[str, str]:
+    """``{mime type: "url 256w, url 512w"}`` for ``<source srcset>``, ``{}`` if not built yet."""
+    if not variants or not current_name or variants.get("source") != current_name:
+        return {}
+    return {
+        mime: ", ".join(
+            f"{build_url(default_storage.url(path))} {width}w"
+            for width, path in sorted(paths.items(), key=lambda item: int(item[0]))
+        )
+        for mime, paths in variants.get("files", {}).items()
+    }
@@ -0,0 +1,23 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from school.horizon import extend_patterns
+
+
+class Command(BaseCommand):
+    help = "Materialize classes of open-ended scheduled class patterns up to their rolling horizon (idempotent)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--today",
+            type=date.fromisoformat,
+            help="Compute horizons from this day (YYYY-MM-DD). Defaults to today.",
+        )
+
+    def handle(self, *args, **options):
+        results = extend_patterns(options["today"])
+        created = sum(results.values())
+        self.stdout.write(
+            self.style.SUCCESS(f"Extended {len(results)} patterns, created {created} classes.")
+        )
@@ -0,0 +1,36 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from school.rollups import rebuild_missing_rollups, rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild daily dashboard rollups from lessons, scheduled classes and payments (idempotent)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            type=date.fromisoformat,
+            help="First day to rebuild (YYYY-MM-DD). Defaults to the whole history.",
+        )
+        parser.add_argument(
+            "--until",
+            type=date.fromisoformat,
+            help="Stop before this day (YYYY-MM-DD, exclusive). Defaults to open-ended.",
+        )
+
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            help="Only rebuild days that have lessons, classes or payments but no rollup rows.",
+        )
+
+    def handle(self, *args, **options):
+        if options["missing"]:
+            written = rebuild_missing_rollups()
+        else:
+            written = rebuild_rollups(options["since"], options["until"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} rollup rows."))
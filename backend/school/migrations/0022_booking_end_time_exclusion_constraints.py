@@ -0,0 +1,106 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:56
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+ACTIVE_STATUSES = "('SCHEDULED', 'COMPLETED')"
+
+# (table, constraint name, column compared with "=") for the no-overlap rules.
+EXCLUSION_CONSTRAINTS = [
+    ("school_lesson", "lesson_instructor_no_overlap", "instructor_id"),
+    ("school_lesson", "lesson_resource_no_overlap", "resource_id"),
+    ("school_scheduledclass", "scheduledclass_instructor_no_overlap", "instructor_id"),
+    ("school_scheduledclass", "scheduledclass_resource_no_overlap", "resource_id"),
+]
+
+
+def backfill_end_time(apps, schema_editor):
+    for model_name in ("Lesson", "ScheduledClass"):
+        Model = apps.get_model("school", model_name)
+        batch = []
+        for obj in Model.objects.only("id", "scheduled_time", "duration_minutes").iterator():
+            obj.end_time = obj.scheduled_time + timedelta(minutes=int(obj.duration_minutes or 60))
+            batch.append(obj)
+            if len(batch) >= 500:
+                Model.objects.bulk_update(batch, ["end_time"])
+                batch = []
+        if batch:
+            Model.objects.bulk_update(batch, ["end_time"])
+
+
+def overlapping_bookings(connection, limit=50):
+    """Active bookings the no-overlap constraints would reject, as one report line per pair.
+
+    Lists at most ``limit`` pairs per constraint.
+    """
+    conflicts = []
+    with connection.cursor() as cursor:
+        for table, _name, column in EXCLUSION_CONSTRAINTS:
+            cursor.execute(
+                f"SELECT a.id, b.id, a.{column}, a.scheduled_time, b.scheduled_time "
+                f"FROM {table} a JOIN {table} b ON b.{column} = a.{column} AND b.id > a.id "
+                f"AND tstzrange(a.scheduled_time, a.end_time, '[)') "
+                f"&& tstzrange(b.scheduled_time, b.end_time, '[)') "
+                f"WHERE a.end_time IS NOT NULL AND b.end_time IS NOT NULL "
+                f"AND a.status IN {ACTIVE_STATUSES} AND b.status IN {ACTIVE_STATUSES} "
+                f"ORDER BY a.id, b.id LIMIT %s",
+                [limit],
+            )
+            conflicts += [
+                f"{table} {first} ({first_start:%Y-%m-%d %H:%M} UTC) and {second} "
+                f"({second_start:%Y-%m-%d %H:%M} UTC) share {column} {value}"
+                for first, second, value, first_start, second_start in cursor.fetchall()
+            ]
+    return conflicts
+
+
+def add_exclusion_constraints(apps, schema_editor):
+    # Exclusion constraints are PostgreSQL-only; other backends (SQLite in tests)
+    # keep relying on the serializer-level conflict checks.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    # ADD CONSTRAINT would fail on the first of them with a bare constraint violation
+    conflicts = overlapping_bookings(schema_editor.connection)
+    if conflicts:
+        raise RuntimeError(
+            "Active bookings overlap, so the no-overlap constraints cannot be added. Cancel "
+            "or reschedule one booking of each pair, then run migrate again:\n  "
+            + "\n  ".join(conflicts)
+        )
+    for table, name, column in EXCLUSION_CONSTRAINTS:
+        schema_editor.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} EXCLUDE USING gist "
+            f"({column} WITH =, tstzrange(scheduled_time, end_time, '[)') WITH &&) "
+            f"WHERE ({column} IS NOT NULL AND end_time IS NOT NULL AND status IN {ACTIVE_STATUSES})"
+        )
+
+
+def drop_exclusion_constraints(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, name, _column in EXCLUSION_CONSTRAINTS:
+        schema_editor.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("school", "0021_merge_phone_validation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lesson",
+            name="end_time",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="scheduledclass",
+            name="end_time",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_end_time, reverse_code=migrations.RunPython.noop),
+        migrations.RunPython(add_exclusion_constraints, reverse_code=drop_exclusion_constraints),
+    ]
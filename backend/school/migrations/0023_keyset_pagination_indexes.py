@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("school", "0022_booking_end_time_exclusion_constraints"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="lesson",
+            index=models.Index(
+                fields=["scheduled_time", "id"], name="school_less_schedul_436650_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(
+                fields=["payment_date", "id"], name="school_paym_payment_48d3b8_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="scheduledclass",
+            index=models.Index(
+                fields=["scheduled_time", "id"], name="school_sche_schedul_b37a25_idx"
+            ),
+        ),
+    ]
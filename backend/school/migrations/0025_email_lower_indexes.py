@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:22
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("school", "0024_daily_rollups"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="instructor",
+            index=models.Index(
+                django.db.models.functions.text.Lower("email"), name="instructor_email_lower_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                django.db.models.functions.text.Lower("email"), name="student_email_lower_idx"
+            ),
+        ),
+    ]
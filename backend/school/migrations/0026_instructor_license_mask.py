@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:24
+
+from django.db import migrations, models
+
+from school.enums import license_category_mask
+
+
+def backfill_license_mask(apps, schema_editor):
+    Instructor = apps.get_model("school", "Instructor")
+    batch = []
+    for obj in Instructor.objects.only("id", "license_categories").iterator():
+        obj.license_mask = license_category_mask(obj.license_categories or "")
+        batch.append(obj)
+        if len(batch) >= 500:
+            Instructor.objects.bulk_update(batch, ["license_mask"])
+            batch = []
+    if batch:
+        Instructor.objects.bulk_update(batch, ["license_mask"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("school", "0025_email_lower_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="instructor",
+            name="license_mask",
+            field=models.PositiveBigIntegerField(
+                default=0,
+                editable=False,
+                help_text="Bitmask of license_categories for SQL matching (Instructor.objects.licensed_for).",
+            ),
+        ),
+        migrations.RunPython(backfill_license_mask, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="instructor",
+            index=models.Index(fields=["license_mask"], name="instructor_license_mask_idx"),
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.db import migrations
+
+# (table, index name, column) searched by views.base.TrigramSearchFilter. The indexes
+# cover UPPER(column), matching both icontains (UPPER(col) LIKE UPPER(...)) and the
+# trigram word-similarity operator the filter applies to the same expression.
+TRIGRAM_INDEXES = [
+    ("school_student", "student_first_name_trgm", "first_name"),
+    ("school_student", "student_last_name_trgm", "last_name"),
+    ("school_student", "student_email_trgm", "email"),
+    ("school_student", "student_phone_trgm", "phone_number"),
+    ("school_instructor", "instructor_first_name_trgm", "first_name"),
+    ("school_instructor", "instructor_last_name_trgm", "last_name"),
+    ("school_instructor", "instructor_email_trgm", "email"),
+    ("school_instructor", "instructor_phone_trgm", "phone_number"),
+    ("school_resource", "resource_name_trgm", "name"),
+    ("school_resource", "resource_license_plate_trgm", "license_plate"),
+    ("school_resource", "resource_make_trgm", "make"),
+    ("school_resource", "resource_model_trgm", "model"),
+]
+
+
+def add_trigram_indexes(apps, schema_editor):
+    # pg_trgm is PostgreSQL-only; other backends (SQLite in tests) search with plain
+    # icontains through the SearchFilter fallback.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, name, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin (UPPER({column}) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for _table, name, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("school", "0026_instructor_license_mask"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_trigram_indexes, reverse_code=drop_trigram_indexes),
+    ]
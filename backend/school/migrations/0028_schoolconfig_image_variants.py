@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("school", "0027_trigram_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="schoolconfig",
+            name="landing_image_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="schoolconfig",
+            name="school_logo_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
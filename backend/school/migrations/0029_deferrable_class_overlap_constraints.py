@@ -0,0 +1,44 @@
+from django.db import migrations
+
+ACTIVE_STATUSES = "('SCHEDULED', 'COMPLETED')"
+
+# Scheduled-class no-overlap constraints from 0022. Series changes (series.py) shift
+# many classes with one UPDATE, which can overlap rows that have not been moved yet;
+# they defer these constraints to the end of their transaction.
+CLASS_CONSTRAINTS = [
+    ("scheduledclass_instructor_no_overlap", "instructor_id"),
+    ("scheduledclass_resource_no_overlap", "resource_id"),
+]
+
+
+def _recreate(schema_editor, deferrable):
+    # Only foreign keys support ALTER CONSTRAINT ... DEFERRABLE: drop and re-add
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, column in CLASS_CONSTRAINTS:
+        schema_editor.execute(f"ALTER TABLE school_scheduledclass DROP CONSTRAINT IF EXISTS {name}")
+        schema_editor.execute(
+            f"ALTER TABLE school_scheduledclass ADD CONSTRAINT {name} EXCLUDE USING gist "
+            f"({column} WITH =, tstzrange(scheduled_time, end_time, '[)') WITH &&) "
+            f"WHERE ({column} IS NOT NULL AND end_time IS NOT NULL AND status IN {ACTIVE_STATUSES})"
+            + (" DEFERRABLE INITIALLY IMMEDIATE" if deferrable else "")
+        )
+
+
+def make_deferrable(apps, schema_editor):
+    _recreate(schema_editor, deferrable=True)
+
+
+def make_immediate(apps, schema_editor):
+    _recreate(schema_editor, deferrable=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("school", "0028_schoolconfig_image_variants"),
+    ]
+
+    operations = [
+        migrations.RunPython(make_deferrable, reverse_code=make_immediate),
+    ]
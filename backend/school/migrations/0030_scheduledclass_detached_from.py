@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("school", "0029_deferrable_class_overlap_constraints"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scheduledclass",
+            name="detached_from",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("school", "0030_scheduledclass_detached_from"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scheduledclasspattern",
+            name="end_date",
+            field=models.DateField(
+                blank=True, help_text="Last date of an open-ended pattern", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="scheduledclasspattern",
+            name="materialized_until",
+            field=models.DateField(
+                blank=True,
+                editable=False,
+                help_text="Classes exist up to this date (open-ended patterns)",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="scheduledclasspattern",
+            name="open_ended",
+            field=models.BooleanField(
+                default=False, help_text="Repeat until end_date, materializing a rolling horizon"
+            ),
+        ),
+    ]
@@ -0,0 +1,130 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("school", "0031_scheduledclasspattern_rolling_horizon"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("model", models.CharField(max_length=100)),
+                ("object_id", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="enrollment",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="instructor",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="instructoravailability",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="lesson",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="payment",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="resource",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="scheduledclass",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="scheduledclasspattern",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="student",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="vehicle",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(fields=["updated_at", "id"], name="course_updated_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="enrollment",
+            index=models.Index(fields=["updated_at", "id"], name="enrollment_updated_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="instructor",
+            index=models.Index(fields=["updated_at", "id"], name="instructor_updated_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="instructoravailability",
+            index=models.Index(fields=["updated_at", "id"], name="availability_updated_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="lesson",
+            index=models.Index(fields=["updated_at", "id"], name="lesson_updated_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(fields=["updated_at", "id"], name="payment_updated_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="resource",
+            index=models.Index(fields=["updated_at", "id"], name="resource_updated_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="scheduledclass",
+            index=models.Index(fields=["updated_at", "id"], name="class_updated_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="scheduledclasspattern",
+            index=models.Index(fields=["updated_at", "id"], name="pattern_updated_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(fields=["updated_at", "id"], name="student_updated_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="vehicle",
+            index=models.Index(fields=["updated_at", "id"], name="vehicle_updated_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(fields=["model", "deleted_at"], name="school_tomb_model_a6235b_idx"),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:59
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("school", "0032_change_tracking"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="instructor",
+            name="instructor_license_mask_idx",
+        ),
+        migrations.AddIndex(
+            model_name="instructor",
+            index=models.Index(
+                django.db.models.expressions.CombinedExpression(
+                    models.F("license_mask"), "&", models.Value(8)
+                ),
+                name="instructor_license_a_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="instructor",
+            index=models.Index(
+                django.db.models.expressions.CombinedExpression(
+                    models.F("license_mask"), "&", models.Value(32)
+                ),
+                name="instructor_license_b_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="instructor",
+            index=models.Index(
+                django.db.models.expressions.CombinedExpression(
+                    models.F("license_mask"), "&", models.Value(1024)
+                ),
+                name="instructor_license_be_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="instructor",
+            index=models.Index(
+                django.db.models.expressions.CombinedExpression(
+                    models.F("license_mask"), "&", models.Value(128)
+                ),
+                name="instructor_license_c_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="instructor",
+            index=models.Index(
+                django.db.models.expressions.CombinedExpression(
+                    models.F("license_mask"), "&", models.Value(4096)
+                ),
+                name="instructor_license_ce_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="instructor",
+            index=models.Index(
+                django.db.models.expressions.CombinedExpression(
+                    models.F("license_mask"), "&", models.Value(512)
+                ),
+                name="instructor_license_d_idx",
+            ),
+        ),
+    ]
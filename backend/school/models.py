@@ -1,7 +1,9 @@
+from datetime import timedelta
+
 from django.contrib.auth.hashers import make_password
 from django.core.validators import EmailValidator
 from django.db import models
-from django.db.models import Q
+from django.db.models import F, Q
 from django.db.models.functions import Lower
 from phonenumber_field.modelfields import PhoneNumberField
 from solo.models import SingletonModel
@@ -19,8 +21,12 @@ from .enums import (
     LessonStatus,
     PaymentMethod,
     PaymentStatus,
+    RollupKind,
     StudentStatus,
+    INDEXED_LICENSE_CATEGORIES,
+    LICENSE_CATEGORY_BITS,
     VehicleCategory,
+    license_category_mask,
 )
 from .validators import (
     django_validate_name,
@@ -30,6 +36,24 @@ from .validators import (
 )
 
 
+def booking_end_time(start, duration_minutes):
+    """Return the end of a booking starting at ``start`` (None if start is unset).
+
+    Mirrors the 60 minute fallback used by the overlap checks in ``validators``.
+    """
+    if not start:
+        return None
+    return start + timedelta(minutes=int(duration_minutes or 60))
+
+
+def _sync_end_time(instance, save_kwargs):
+    """Refresh ``instance.end_time`` before save, widening ``update_fields`` if needed."""
+    instance.end_time = booking_end_time(instance.scheduled_time, instance.duration_minutes)
+    update_fields = save_kwargs.get("update_fields")
+    if update_fields is not None and {"scheduled_time", "duration_minutes"} & set(update_fields):
+        save_kwargs["update_fields"] = {*update_fields, "end_time"}
+
+
 class Student(models.Model):
     first_name = models.CharField(max_length=50, validators=[django_validate_name])
     last_name = models.CharField(max_length=50, validators=[django_validate_name])
@@ -44,6 +68,14 @@ class Student(models.Model):
         default=StudentStatus.PENDING.value,
         help_text="Lifecycle status. New students start as PENDING then can be set ACTIVE/INACTIVE/GRADUATED on edit.",
     )
+    updated_at = models.DateTimeField(auto_now=True)  # Change tracking, see school.sync
+
+    class Meta:
+        indexes = [
+            # Case-insensitive lookups (validators.email_equals, student login)
+            models.Index(Lower("email"), name="student_email_lower_idx"),
+            models.Index(fields=["updated_at", "id"], name="student_updated_at_idx"),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -67,6 +99,21 @@ class Student(models.Model):
         super().save(*args, **kwargs)
 
 
+class InstructorQuerySet(models.QuerySet):
+    def licensed_for(self, *categories):
+        """Instructors holding every one of ``categories`` (bitwise tests on ``license_mask``).
+
+        Each category is its own ``license_mask & bit = bit`` test, so the expression
+        index of any ``INDEXED_LICENSE_CATEGORIES`` member can serve the query.
+        """
+        bits = {LICENSE_CATEGORY_BITS.get(c.strip().upper()) for c in categories}
+        if not bits or None in bits:
+            return self.none()
+        return self.alias(
+            **{f"_license_{bit}": F("license_mask").bitand(bit) for bit in bits}
+        ).filter(**{f"_license_{bit}": bit for bit in bits})
+
+
 class Instructor(models.Model):
     first_name = models.CharField(max_length=50, validators=[django_validate_name])
     last_name = models.CharField(max_length=50, validators=[django_validate_name])
@@ -80,6 +127,30 @@ class Instructor(models.Model):
         validators=[django_validate_license_categories],
         help_text="Comma separated categories: e.g. 'B,BE,C' ",
     )
+    # Derived from license_categories in save(); see enums.LICENSE_CATEGORY_BITS
+    license_mask = models.PositiveBigIntegerField(
+        default=0,
+        editable=False,
+        help_text="Bitmask of license_categories for SQL matching (Instructor.objects.licensed_for).",
+    )
+    updated_at = models.DateTimeField(auto_now=True)  # Change tracking, see school.sync
+
+    objects = InstructorQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Case-insensitive lookups (validators.email_equals, student login)
+            models.Index(Lower("email"), name="instructor_email_lower_idx"),
+            # Expression indexes matching licensed_for's per-category tests
+            *(
+                models.Index(
+                    F("license_mask").bitand(LICENSE_CATEGORY_BITS[category]),
+                    name=f"instructor_license_{category.lower()}_idx",
+                )
+                for category in INDEXED_LICENSE_CATEGORIES
+            ),
+            models.Index(fields=["updated_at", "id"], name="instructor_updated_at_idx"),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -107,6 +178,10 @@ class Instructor(models.Model):
                 if p not in seen:
                     seen.append(p)
             self.license_categories = ",".join(seen)
+        self.license_mask = license_category_mask(self.license_categories or "")
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "license_categories" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "license_mask"}
         super().save(*args, **kwargs)
 
 
@@ -119,9 +194,13 @@ class InstructorAvailability(models.Model):
         default=list,
         help_text="List of available start times in HH:MM format, e.g. ['08:00', '09:30']",
     )
+    updated_at = models.DateTimeField(auto_now=True)  # Change tracking, see school.sync
 
     class Meta:
         unique_together = ("instructor", "day")
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="availability_updated_at_idx"),
+        ]
 
     def __str__(self):
         return f"{self.instructor} - {self.day}: {self.hours}"
@@ -143,6 +222,7 @@ class Resource(models.Model):
         ("CLASSROOM", "Classroom"),
     ]
     type = models.CharField(max_length=20, choices=RESOURCE_TYPES, default="VEHICLE")
+    updated_at = models.DateTimeField(auto_now=True)  # Change tracking, see school.sync
 
     def __str__(self):
         if self.is_vehicle():
@@ -188,6 +268,9 @@ class Resource(models.Model):
                 name="unique_vehicle_license_plate_ci",
             )
         ]
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="resource_updated_at_idx"),
+        ]
 
 
 class Vehicle(models.Model):
@@ -197,6 +280,12 @@ class Vehicle(models.Model):
     year = models.IntegerField()
     category = models.CharField(max_length=5, choices=VehicleCategory.choices())
     is_available = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)  # Change tracking, see school.sync
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="vehicle_updated_at_idx"),
+        ]
 
     def __str__(self):
         return f"{self.make} {self.model} ({self.license_plate})"
@@ -211,6 +300,12 @@ class Course(models.Model):
     description = models.TextField()
     price = models.DecimalField(max_digits=8, decimal_places=2)
     required_lessons = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)  # Change tracking, see school.sync
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="course_updated_at_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -236,10 +331,18 @@ class ScheduledClassPattern(models.Model):
     )
     start_date = models.DateField(help_text="Start date for the recurrence")
     num_lessons = models.IntegerField(help_text="Total number of lessons to generate")
+    # Open-ended patterns ignore num_lessons: they repeat until end_date (or indefinitely) and
+    # only classes up to PATTERN_HORIZON_WEEKS ahead exist; see school.horizon
+    open_ended = models.BooleanField(default=False, help_text="Repeat until end_date, materializing a rolling horizon")
+    end_date = models.DateField(null=True, blank=True, help_text="Last date of an open-ended pattern")
+    materialized_until = models.DateField(
+        null=True, blank=True, editable=False, help_text="Classes exist up to this date (open-ended patterns)"
+    )
     # Default values for generated classes
     default_duration_minutes = models.IntegerField(default=60, help_text="Default duration for generated classes")
     default_max_students = models.IntegerField(default=10, help_text="Default max students for generated classes")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)  # Change tracking, see school.sync
 
     def clean(self):
         from django.core.exceptions import ValidationError
@@ -250,6 +353,8 @@ class ScheduledClassPattern(models.Model):
             raise ValidationError("Times cannot be empty.")
         if self.start_date < date.today():
             raise ValidationError("Start date cannot be in the past.")
+        if self.end_date and self.end_date < self.start_date:
+            raise ValidationError("End date cannot be before the start date.")
         # Check for valid day names
         valid_days = {'MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY', 'SATURDAY', 'SUNDAY'}
         if not all(day in valid_days for day in self.recurrence_days):
@@ -308,8 +413,32 @@ class ScheduledClassPattern(models.Model):
         self.scheduled_classes.all().delete()
         super().delete(*args, **kwargs)
 
-    def generate_scheduled_classes(self):
-        """Generate ScheduledClass instances based on recurrence."""
+    def horizon_date(self, today=None):
+        """Last date an open-ended pattern materializes classes for."""
+        from datetime import date
+        from django.conf import settings
+        horizon = (today or date.today()) + timedelta(weeks=getattr(settings, "PATTERN_HORIZON_WEEKS", 8))
+        return min(horizon, self.end_date) if self.end_date else horizon
+
+    def materialization_end(self, today=None):
+        """Date an open-ended pattern's classes should reach; None for counted patterns.
+
+        The horizon, but never before what already exists and never past ``end_date``.
+        """
+        if not self.open_ended:
+            return None
+        until = self.horizon_date(today)
+        if self.materialized_until:
+            until = max(until, self.materialized_until)
+        return min(until, self.end_date) if self.end_date else until
+
+    def generate_scheduled_classes(self, start=None, until=None):
+        """Generate ScheduledClass instances based on recurrence.
+
+        ``start`` / ``until`` limit the result to occurrences on those dates (inclusive).
+        Open-ended patterns stop at ``until`` (default: ``horizon_date()``) instead of
+        after ``num_lessons``.
+        """
         import time as time_module
         import logging
         from datetime import datetime, timedelta, date, time
@@ -365,13 +494,22 @@ class ScheduledClassPattern(models.Model):
                 time_objs.append(time_str)
 
         iteration_count = 0
-        max_iterations = self.num_lessons * 10  # Safety limit to prevent infinite loops
+        if self.open_ended:
+            until = self.horizon_date() if until is None else until
+            if start is not None:
+                # No lesson count to keep: skip straight to the first requested date
+                current_date = max(current_date, start)
+            max_iterations = (until - current_date).days + 1
+        else:
+            max_iterations = self.num_lessons * 10  # Safety limit to prevent infinite loops
         
-        while count < self.num_lessons and iteration_count < max_iterations:
+        while (self.open_ended or count < self.num_lessons) and iteration_count < max_iterations:
+            if until is not None and current_date > until:
+                break
             iteration_count += 1
             if current_date.weekday() in recurrence_day_indices:
                 for time_obj in time_objs:
-                    if count >= self.num_lessons:
+                    if not self.open_ended and count >= self.num_lessons:
                         break
                     naive_dt = datetime.combine(current_date, time_obj)
                     # Interpret time as business timezone time, then convert to UTC for storage
@@ -394,11 +532,13 @@ class ScheduledClassPattern(models.Model):
                         resource=self.resource,
                         name=f"{self.name} - {current_date.strftime('%Y-%m-%d')} {time_obj.strftime('%H:%M')}",
                         scheduled_time=scheduled_time,
+                        end_time=booking_end_time(scheduled_time, self.default_duration_minutes),
                         duration_minutes=self.default_duration_minutes,
                         max_students=self.default_max_students,
                         status=LessonStatus.SCHEDULED.value,  # Default status for generated classes
                     )
-                    classes.append(scheduled_class)
+                    if start is None or current_date >= start:
+                        classes.append(scheduled_class)
                     count += 1
             current_date += timedelta(days=1)
         
@@ -407,7 +547,7 @@ class ScheduledClassPattern(models.Model):
         if settings.DEBUG:
             logger.info(f"Class generation completed for pattern '{self.name}' in {generation_time:.3f}s")
             logger.info(f"Generated {len(classes)} classes, iterated through {iteration_count} days")
-            if iteration_count >= max_iterations:
+            if not self.open_ended and iteration_count >= max_iterations:
                 logger.warning(f"Pattern '{self.name}' hit iteration limit ({max_iterations}) - possible infinite loop")
         
         return classes
@@ -420,6 +560,7 @@ class ScheduledClassPattern(models.Model):
             models.Index(fields=['instructor']),
             models.Index(fields=['resource']),
             models.Index(fields=['start_date', 'course']),  # Composite index for common queries
+            models.Index(fields=["updated_at", "id"], name="pattern_updated_at_idx"),
         ]
 
 
@@ -438,6 +579,9 @@ class ScheduledClass(models.Model):
     )
     name = models.CharField(max_length=100, help_text="e.g., 'Monday Theory Class'")
     scheduled_time = models.DateTimeField()
+    # Stored end (scheduled_time + duration) so PostgreSQL exclusion constraints can
+    # index tstzrange(scheduled_time, end_time); kept in sync in save().
+    end_time = models.DateTimeField(null=True, blank=True, editable=False)
     duration_minutes = models.IntegerField(default=60)
     max_students = models.IntegerField()
     status = models.CharField(
@@ -446,6 +590,10 @@ class ScheduledClass(models.Model):
         default=LessonStatus.SCHEDULED.value,
     )
     students = models.ManyToManyField(Student, related_name="scheduled_classes", blank=True)
+    # Pattern start the class was generated for, set once a series change edits it;
+    # regeneration then keeps the class as it is (see school.regeneration)
+    detached_from = models.DateTimeField(null=True, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)  # Change tracking, see school.sync
 
     def __str__(self):
         pattern_name = self.pattern.name if self.pattern else "No Pattern"
@@ -475,6 +623,7 @@ class ScheduledClass(models.Model):
 
     def save(self, *args, **kwargs):
         self.clean()
+        _sync_end_time(self, kwargs)
         super().save(*args, **kwargs)
 
     class Meta:
@@ -484,6 +633,8 @@ class ScheduledClass(models.Model):
             models.Index(fields=['scheduled_time']),
             models.Index(fields=['status']),
             models.Index(fields=['scheduled_time', 'status']),  # Composite index for time range + status queries
+            models.Index(fields=['scheduled_time', 'id']),  # Keyset pagination
+            models.Index(fields=["updated_at", "id"], name="class_updated_at_idx"),
         ]
 
 
@@ -502,9 +653,13 @@ class Enrollment(models.Model):
         choices=EnrollmentStatus.choices(),
         default=EnrollmentStatus.IN_PROGRESS.value,
     )
+    updated_at = models.DateTimeField(auto_now=True)  # Change tracking, see school.sync
 
     class Meta:
         unique_together = ()
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="enrollment_updated_at_idx"),
+        ]
 
     def __str__(self):
         return f"{self.student} înscris la {self.course}"
@@ -517,6 +672,8 @@ class Lesson(models.Model):
         Resource, on_delete=models.SET_NULL, null=True, blank=True, related_name="lessons"
     )
     scheduled_time = models.DateTimeField()
+    # See ScheduledClass.end_time: backs the no-overlap exclusion constraints.
+    end_time = models.DateTimeField(null=True, blank=True, editable=False)
     duration_minutes = models.IntegerField(default=60)
     status = models.CharField(
         max_length=20,
@@ -524,9 +681,18 @@ class Lesson(models.Model):
         default=LessonStatus.SCHEDULED.value,
     )
     notes = models.TextField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)  # Change tracking, see school.sync
 
     class Meta:
         ordering = ["-scheduled_time"]
+        indexes = [
+            models.Index(fields=["scheduled_time", "id"]),  # Keyset pagination
+            models.Index(fields=["updated_at", "id"], name="lesson_updated_at_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        _sync_end_time(self, kwargs)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Lecție pentru {self.enrollment.student} ({self.enrollment.course})"
@@ -541,14 +707,67 @@ class Payment(models.Model):
         max_length=20, choices=PaymentStatus.choices(), default=PaymentStatus.PENDING.value
     )
     description = models.CharField(max_length=255)
+    updated_at = models.DateTimeField(auto_now=True)  # Change tracking, see school.sync
 
     class Meta:
         ordering = ["-payment_date"]
+        indexes = [
+            models.Index(fields=["payment_date", "id"]),  # Keyset pagination
+            models.Index(fields=["updated_at", "id"], name="payment_updated_at_idx"),
+        ]
 
     def __str__(self):
         return f"Plată de {self.amount} MDL pentru {self.enrollment}"
 
 
+class DailyRollup(models.Model):
+    """Pre-aggregated per-day totals of lessons, scheduled classes and payments.
+
+    Maintained by ``school.rollups``: all rows of a day are rebuilt from source at once,
+    so several rows may share a key (e.g. after a resource is deleted) and readers
+    always ``Sum`` them.
+    """
+    day = models.DateField()
+    kind = models.CharField(max_length=10, choices=RollupKind.choices())
+    instructor = models.ForeignKey(
+        Instructor, on_delete=models.CASCADE, null=True, blank=True, related_name="+"
+    )
+    resource = models.ForeignKey(
+        Resource, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    category = models.CharField(max_length=5, blank=True, default="")  # Course category
+    status = models.CharField(max_length=20)
+    count = models.PositiveIntegerField(default=0)
+    minutes = models.PositiveIntegerField(default=0)
+    amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["kind", "day"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.day} {self.status}: {self.count}"
+
+
+class Tombstone(models.Model):
+    """A deleted row of a change-tracked model, reported by the ``?since=`` list mode.
+
+    Written by ``school.sync`` on delete and pruned after ``SYNC_TOMBSTONE_DAYS``.
+    """
+    model = models.CharField(max_length=100)  # Model label, e.g. "school.lesson"
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["model", "deleted_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} deleted {self.deleted_at}"
+
+
 class Address(models.Model):
     """Simple address model for school locations."""
     street = models.CharField(max_length=200)
@@ -571,6 +790,8 @@ class SchoolConfig(SingletonModel):
         validators=[validate_school_logo],
         help_text="School logo image (max 5MB, formats: jpg, png, gif, webp)"
     )
+    # Resized copies built by school.images after an upload
+    school_logo_variants = models.JSONField(default=dict, blank=True, editable=False)
     business_hours = models.CharField(max_length=200, default="Mon-Fri: 9AM-6PM")
     email = models.EmailField(default="contact@school.com")
     contact_phone1 = PhoneNumberField(
@@ -589,6 +810,7 @@ class SchoolConfig(SingletonModel):
         validators=[validate_landing_image],
         help_text="Landing page hero image (max 5MB, formats: jpg, png, gif, webp)"
     )
+    landing_image_variants = models.JSONField(default=dict, blank=True, editable=False)
     landing_text = models.JSONField(
         default=dict,
         help_text="Translation dictionary for landing page text, e.g., {'en': 'Welcome', 'ro': 'Bun venit'}"
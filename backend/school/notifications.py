@@ -212,6 +212,104 @@ Please arrive on time and bring all necessary materials.
         }
 
 
+class ClassUpdatedNotificationTemplate(NotificationTemplate):
+    """Template for notifying a class's students that its details changed"""
+
+    def get_subject_data(self, **kwargs) -> Dict[str, Any]:
+        class_name = kwargs.get('class_name', 'Unknown Class')
+        return {
+            'subject': f'Class Updated: {class_name}'
+        }
+
+    def get_template_data(self, **kwargs) -> Dict[str, Any]:
+        class_name = kwargs.get('class_name', 'Unknown Class')
+        instructor_name = kwargs.get('instructor_name', 'Unknown Instructor')
+        scheduled_time = kwargs.get('scheduled_time', 'Unknown Time')
+        location = kwargs.get('location', 'Unknown Location')
+
+        message = f"""
+A class you are enrolled in has been updated.
+
+Details:
+- Class: {class_name}
+- Instructor: {instructor_name}
+- Date & Time: {scheduled_time}
+- Location: {location}
+
+Please check your schedule for the changes.
+"""
+
+        html_message = f"""
+<html>
+<body>
+    <h2>Class Updated</h2>
+    <p>A class you are enrolled in has been updated.</p>
+
+    <h3>Class Details:</h3>
+    <ul>
+        <li><strong>Class:</strong> {class_name}</li>
+        <li><strong>Instructor:</strong> {instructor_name}</li>
+        <li><strong>Date & Time:</strong> {scheduled_time}</li>
+        <li><strong>Location:</strong> {location}</li>
+    </ul>
+
+    <p>Please check your schedule for the changes.</p>
+</body>
+</html>
+"""
+
+        return {
+            'message': message.strip(),
+            'html_message': html_message.strip()
+        }
+
+
+class ClassRemovedNotificationTemplate(NotificationTemplate):
+    """Template for notifying a class's students that it was removed from the schedule"""
+
+    def get_subject_data(self, **kwargs) -> Dict[str, Any]:
+        class_name = kwargs.get('class_name', 'Unknown Class')
+        return {
+            'subject': f'Class Removed: {class_name}'
+        }
+
+    def get_template_data(self, **kwargs) -> Dict[str, Any]:
+        class_name = kwargs.get('class_name', 'Unknown Class')
+        scheduled_time = kwargs.get('scheduled_time', 'Unknown Time')
+
+        message = f"""
+A class you were enrolled in has been removed from the schedule.
+
+Details:
+- Class: {class_name}
+- Date & Time: {scheduled_time}
+
+Please check your schedule for the classes that replace it.
+"""
+
+        html_message = f"""
+<html>
+<body>
+    <h2>Class Removed</h2>
+    <p>A class you were enrolled in has been removed from the schedule.</p>
+
+    <h3>Class Details:</h3>
+    <ul>
+        <li><strong>Class:</strong> {class_name}</li>
+        <li><strong>Date & Time:</strong> {scheduled_time}</li>
+    </ul>
+
+    <p>Please check your schedule for the classes that replace it.</p>
+</body>
+</html>
+"""
+
+        return {
+            'message': message.strip(),
+            'html_message': html_message.strip()
+        }
+
+
 class NotificationService:
     """Main notification service following Dependency Inversion principle"""
 
@@ -1,4 +1,336 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import EmptyPage
+from django.core.paginator import Page as DjangoPage
+from django.core.paginator import PageNotAnInteger
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.functional import cached_property
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Keyset (seek) pagination over a unique ordering such as ``("-scheduled_time", "-id")``.
+
+    - Never runs COUNT(*) or OFFSET, so deep pages cost the same as the first one
+    - The cursor is an opaque token encoding the sort key of the last row returned
+    - Forward-only: responses carry ``next`` / ``next_cursor`` and no ``count``
+    """
+
+    cursor_query_param = "cursor"
+    page_size = 25
+    ordering = ("-id",)
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, ordering=None, page_size=None):
+        if ordering:
+            self.ordering = tuple(ordering)
+        if page_size:
+            self.page_size = page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(
+            request.query_params.get(self.cursor_query_param), queryset.model
+        )
+        if position is not None:
+            queryset = queryset.filter(self._seek_filter(position))
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        page = rows[: self.page_size]
+        self.next_cursor = self.encode_cursor(page[-1]) if (self.has_next and page) else None
+        return page
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "next_cursor": self.next_cursor,
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "next_cursor": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, self.next_cursor)
+
+    # --- cursor helpers ---
+    def _fields(self):
+        return [(name.lstrip("-"), name.startswith("-")) for name in self.ordering]
+
+    def encode_cursor(self, obj) -> str:
+        return self.encode_position(self.row_position(obj))
+
+    def row_position(self, obj) -> list:
+        # Rows may be model instances or .values() dicts (fast list serializers)
+        return [
+            obj[name] if isinstance(obj, dict) else getattr(obj, name)
+            for name, _desc in self._fields()
+        ]
+
+    def encode_position(self, position) -> str:
+        values = [value.isoformat() if hasattr(value, "isoformat") else value for value in position]
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, token, model):
+        """Return the list of sort-key values encoded in ``token`` (None for the first page)."""
+        if not token:
+            return None
+        try:
+            return self.position_from_values(self.load_cursor(token), model)
+        except (ValueError, TypeError, DjangoValidationError) as exc:
+            # Bad base64 / JSON (ValueError subclasses) or values the fields reject
+            raise NotFound(self.invalid_cursor_message) from exc
+
+    @staticmethod
+    def load_cursor(token: str):
+        return json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+
+    def position_from_values(self, values, model) -> list:
+        fields = self._fields()
+        if not isinstance(values, list) or len(values) != len(fields):
+            raise ValueError(values)
+        return [
+            model._meta.get_field(name).to_python(value)
+            for (name, _desc), value in zip(fields, values)
+        ]
+
+    def _seek_filter(self, position) -> Q:
+        """Rows strictly after ``position`` in lexicographic ``ordering`` order."""
+        fields = self._fields()
+        seek = Q()
+        for i, (name, desc) in enumerate(fields):
+            clause = Q(**{prev: position[j] for j, (prev, _d) in enumerate(fields[:i])})
+            clause &= Q(**{f"{name}__{'lt' if desc else 'gt'}": position[i]})
+            seek |= clause
+        # Redundant bound on the leading column lets the planner use a plain index range scan.
+        lead, lead_desc = fields[0]
+        return Q(**{f"{lead}__{'lte' if lead_desc else 'gte'}": position[0]}) & seek
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "Sync cursor expired; resync from ?since="
+    default_code = "cursor_expired"
+
+
+class ChangesPagination(KeysetPagination):
+    """Incremental sync over the rows changed after a cursor (``?since=<cursor>``).
+
+    - Rows come in ``(updated_at, id)`` order; ``?since=`` (empty) starts a full sync
+    - Every response carries the ``next_cursor`` to send next, also when nothing
+      changed, and ``has_more`` while the window is not exhausted
+    - ``deleted`` lists the ids deleted in the same window (``Tombstone`` rows)
+    - Changes from the last ``SYNC_LAG_SECONDS`` are left to the next request, so rows
+      saved with an earlier ``updated_at`` by a transaction still in flight are not skipped
+    - Cursors carry the start of their window next to the seek position. Windows that
+      started more than ``SYNC_TOMBSTONE_DAYS`` ago raise 410 ``cursor_expired``: their
+      tombstones may be pruned, so the client must resync. A full sync has no window
+      start and never expires, however old the rows it pages over
+    """
+
+    cursor_query_param = "since"
+    ordering = ("updated_at", "id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        from .models import Tombstone
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        model = queryset.model
+        now = timezone.now()
+        window_start, position = self.decode_cursor(
+            request.query_params.get(self.cursor_query_param), model
+        )
+        if window_start is not None and window_start < now - timedelta(
+            days=getattr(settings, "SYNC_TOMBSTONE_DAYS", 30)
+        ):
+            raise CursorExpired()
+
+        until = now - timedelta(seconds=getattr(settings, "SYNC_LAG_SECONDS", 5))
+        queryset = queryset.order_by(*self.ordering).filter(updated_at__lt=until)
+        if position is not None:
+            queryset = queryset.filter(self._seek_filter(position))
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        page = rows[: self.page_size]
+        if self.has_next:
+            last = self.row_position(page[-1])
+            self.next_cursor = self.encode_position(last, window_start)
+            until = last[0]
+        else:
+            # The window is exhausted: the next one starts where this one ends
+            self.next_cursor = self.encode_position([until, 0], until)
+
+        # A full sync's first page has nothing to delete; otherwise the page spans [cursor, until)
+        self.deleted = []
+        if position is not None:
+            self.deleted = list(
+                Tombstone.objects.filter(
+                    model=model._meta.label_lower, deleted_at__gte=position[0], deleted_at__lt=until
+                )
+                .order_by("deleted_at", "id")
+                .values_list("object_id", flat=True)
+            )
+        return page
+
+    def encode_position(self, position, window_start=None) -> str:
+        return super().encode_position([window_start, *position])
+
+    def decode_cursor(self, token, model):
+        """Return ``(window_start, position)``; both are None for a full sync's first page."""
+        if not token:
+            return None, None
+        try:
+            values = self.load_cursor(token)
+            if not isinstance(values, list) or not values:
+                raise ValueError(values)
+            field = model._meta.get_field("updated_at")
+            window_start = None if values[0] is None else field.to_python(values[0])
+            position = self.position_from_values(values[1:], model)
+        except (ValueError, TypeError, DjangoValidationError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+        if position[0] is None or timezone.is_naive(position[0]):
+            raise NotFound(self.invalid_cursor_message)
+        if window_start is not None and timezone.is_naive(window_start):
+            raise NotFound(self.invalid_cursor_message)
+        return window_start, position
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "next_cursor": self.next_cursor,
+                "has_more": self.has_next,
+                "results": data,
+                "deleted": self.deleted,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["required"] = ["next_cursor", "results", "deleted"]
+        response_schema["properties"]["has_more"] = {"type": "boolean"}
+        response_schema["properties"]["deleted"] = {"type": "array", "items": {"type": "integer"}}
+        return response_schema
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return super().get_next_link()
+
+
+class ExactPage(DjangoPage):
+    """Page that knows whether a next page exists without the paginator's ``count``."""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class ApproximateCountPaginator(DjangoPaginator):
+    """Django paginator that trusts the PostgreSQL row estimate for large result sets.
+
+    - Unfiltered querysets read ``pg_class.reltuples``; filtered ones use the planner's
+      ``EXPLAIN`` row estimate
+    - Only estimates at or above ``PAGINATION_APPROX_COUNT_THRESHOLD`` replace the
+      exact ``COUNT(*)``, so small filtered lists keep exact totals
+    - Other backends (SQLite in tests) always count exactly
+    - ``count`` is only the reported total: pages are validated and sliced without it
+      (one extra row tells whether a next page exists), so an underestimate never
+      hides or truncates real pages
+    """
+
+    count_is_approximate = False
+
+    def validate_number(self, number):
+        """Like Django's check, without the upper bound derived from ``count``."""
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError) as exc:
+            raise PageNotAnInteger(self.error_messages["invalid_page"]) from exc
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and (number > 1 or not self.allow_empty_first_page):
+            raise EmptyPage(self.error_messages["no_results"])
+        return ExactPage(rows[: self.per_page], number, self, has_next=len(rows) > self.per_page)
+
+    @cached_property
+    def count(self):
+        threshold = getattr(settings, "PAGINATION_APPROX_COUNT_THRESHOLD", None)
+        if threshold:
+            estimate = self.estimated_count()
+            if estimate is not None and estimate >= threshold:
+                self.count_is_approximate = True
+                return estimate
+        return super().count
+
+    def estimated_count(self):
+        qs = self.object_list
+        if not hasattr(qs, "query"):
+            return None
+        connection = connections[qs.db]
+        if connection.vendor != "postgresql":
+            return None
+        try:
+            with connection.cursor() as cursor:
+                if not qs.query.where and not qs.query.distinct:
+                    cursor.execute(
+                        "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                        [qs.model._meta.db_table],
+                    )
+                    row = cursor.fetchone()
+                    estimate = row[0] if row else None
+                else:
+                    sql, params = qs.order_by().query.sql_with_params()
+                    cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+                    plan = cursor.fetchone()[0]
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    estimate = plan[0]["Plan"]["Plan Rows"]
+        except (DatabaseError, LookupError, TypeError, ValueError):
+            return None
+        # reltuples is -1 for tables that were never analyzed
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -7,8 +339,56 @@ class StandardResultsSetPagination(PageNumberPagination):
     - Default page size: 25 (react-admin List default)
     - Allow clients to override via ?page_size=
     - Cap maximum to avoid abuse in dev
+    - Totals on large tables come from the planner estimate and are flagged with
+      ``count_approximate`` (see ApproximateCountPaginator)
+    - Views declaring ``cursor_ordering`` switch to keyset pagination when the request
+      carries ``?pagination=cursor`` or a ``?cursor=`` token (deep scrolling)
+    - ``?since=<cursor>`` on change-tracked models returns only the rows changed after
+      the cursor (see ChangesPagination)
     """
 
     page_size = 25
     page_size_query_param = "page_size"
     max_page_size = 200
+    django_paginator_class = ApproximateCountPaginator
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    since_query_param = ChangesPagination.cursor_query_param
+    keyset = None
+
+    def use_keyset(self, request, view) -> bool:
+        if not getattr(view, "cursor_ordering", None):
+            return False
+        params = request.query_params
+        return self.cursor_query_param in params or params.get(self.mode_query_param) == "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.since_query_param in request.query_params:
+            from .sync import is_tracked
+
+            if not is_tracked(queryset.model):
+                raise ValidationError(
+                    {self.since_query_param: ["This list does not support incremental sync."]}
+                )
+            self.keyset = ChangesPagination(page_size=self.get_page_size(request))
+            return self.keyset.paginate_queryset(queryset, request, view)
+        if self.use_keyset(request, view):
+            ordering = view.cursor_ordering
+            self.keyset = KeysetPagination(ordering, page_size=self.get_page_size(request))
+            return self.keyset.paginate_queryset(queryset, request, view)
+        self.keyset = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        response = super().get_paginated_response(data)
+        response.data["count_approximate"] = getattr(
+            self.page.paginator, "count_is_approximate", False
+        )
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_approximate"] = {"type": "boolean"}
+        return response_schema
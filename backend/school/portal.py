@@ -0,0 +1,286 @@
+"""Student portal payloads shared by the DRF views and their async variants.
+
+``student_dashboard`` is split into independent sections (plain synchronous
+functions of the student id). ``legacy_views.student_dashboard`` runs them one after
+another; ``async_views.student_dashboard`` awaits ``astudent_dashboard``, which spreads
+them over ``PORTAL_DASHBOARD_CONNECTIONS`` worker threads, each running its share on
+its own database connection.
+
+The sections stay on the sync ORM: the async ORM runs every query through the one
+shared sync thread, so the sections would not overlap. The cost is up to
+``PORTAL_DASHBOARD_CONNECTIONS`` extra connections per dashboard request (opened and
+closed per request under ASGI, where ``CONN_MAX_AGE`` is 0), counted against the
+database's connection limit for every concurrent request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.db.models import Count, Q
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .enums import LessonStatus, StudentStatus
+from .models import (
+    Course,
+    Enrollment,
+    Instructor,
+    Lesson,
+    Payment,
+    ScheduledClass,
+    ScheduledClassPattern,
+    Student,
+)
+from .serializers import (
+    CourseSerializer,
+    EnrollmentSerializer,
+    InstructorSerializer,
+    LessonSerializer,
+    PaymentSerializer,
+    ScheduledClassPatternSerializer,
+    ScheduledClassSerializer,
+)
+from .validators import email_equals
+
+logger = logging.getLogger(__name__)
+
+# status -> error returned by login, or None when the student may log in
+LOGIN_STATUS_ERRORS = {
+    StudentStatus.PENDING.value: "Your account is pending approval. Please wait to be approved.",
+    StudentStatus.INACTIVE.value: "This account has been deactivated",
+    StudentStatus.ACTIVE.value: None,
+    StudentStatus.GRADUATED.value: None,  # allowed, portal is read-only
+}
+
+
+def _credentials(data) -> tuple[str, str]:
+    return (data.get("email") or "").strip().lower(), (data.get("password") or "").strip()
+
+
+def _login_result(student: Student | None, password_ok: bool) -> tuple[dict, int]:
+    if student is None:
+        return {"detail": "This account has not been found"}, 404
+    if not password_ok:
+        return {"detail": "Invalid credentials"}, 401
+    if student.status not in LOGIN_STATUS_ERRORS:
+        return {"detail": "Invalid account status"}, 403
+    if LOGIN_STATUS_ERRORS[student.status]:
+        return {"detail": LOGIN_STATUS_ERRORS[student.status]}, 403
+
+    # Generate JWT tokens
+    refresh = RefreshToken()
+    refresh["student_id"] = student.id
+    refresh["status"] = student.status
+    access = refresh.access_token
+    access["student_id"] = student.id
+    access["status"] = student.status
+    return {
+        "access": str(access),
+        "refresh": str(refresh),
+        "student": {
+            "id": student.id,
+            "first_name": student.first_name,
+            "last_name": student.last_name,
+            "email": student.email,
+            "status": student.status,
+        },
+    }, 200
+
+
+def login(data) -> tuple[dict, int]:
+    """``(payload, HTTP status)`` for a student login attempt with ``email`` / ``password``."""
+    email, password = _credentials(data)
+    if not email or not password:
+        return {"detail": "Email and password required"}, 400
+    student = Student.objects.filter(email_equals(email)).first()
+    return _login_result(student, student is not None and student.check_password(password))
+
+
+async def alogin(data) -> tuple[dict, int]:
+    """Async ``login``: the password hash is checked off the event loop."""
+    email, password = _credentials(data)
+    if not email or not password:
+        return {"detail": "Email and password required"}, 400
+    student = await Student.objects.filter(email_equals(email)).afirst()
+    password_ok = student is not None and await sync_to_async(
+        student.check_password, thread_sensitive=False
+    )(password)
+    return _login_result(student, password_ok)
+
+
+# --- dashboard sections ---
+def _enrollments(student_id: int):
+    return Enrollment.objects.filter(student_id=student_id)
+
+
+def _patterns(student_id: int):
+    # Patterns that explicitly include this student and belong to enrolled courses
+    return ScheduledClassPattern.objects.filter(
+        course_id__in=_enrollments(student_id).values("course_id"),
+        students=student_id,
+    )
+
+
+def _instructors(student_id: int) -> list:
+    return InstructorSerializer(Instructor.objects.all(), many=True).data
+
+
+def _courses(student_id: int) -> list:
+    return CourseSerializer(Course.objects.all(), many=True).data
+
+
+def _lessons(student_id: int) -> list:
+    lessons = (
+        Lesson.objects.filter(enrollment__student_id=student_id)
+        .select_related("enrollment__course", "instructor", "resource")
+        .order_by("scheduled_time")
+    )
+    return LessonSerializer(lessons, many=True).data
+
+
+def _pattern_data(student_id: int) -> list:
+    patterns = (
+        _patterns(student_id)
+        .select_related("course", "instructor", "resource")
+        .prefetch_related("students")
+    )
+    data = ScheduledClassPatternSerializer(patterns, many=True).data
+    logger.debug("student_dashboard: patterns_count=%s for student_id=%s", len(data), student_id)
+    return data
+
+
+def _scheduled_classes(student_id: int) -> list:
+    # Classes of the above patterns where the student participates (theory side)
+    scheduled_classes = (
+        ScheduledClass.objects.filter(students=student_id, pattern__in=_patterns(student_id))
+        .select_related(
+            "pattern__course",
+            "pattern__instructor",
+            "pattern__resource",
+            "course",
+            "instructor",
+            "resource",
+        )
+        .prefetch_related("pattern__students", "students")
+        .order_by("scheduled_time")
+    )
+    data = ScheduledClassSerializer(scheduled_classes, many=True).data
+    logger.debug(
+        "student_dashboard: scheduled_classes_count=%s for student_id=%s", len(data), student_id
+    )
+    return data
+
+
+def _payments(student_id: int) -> list:
+    payments = (
+        Payment.objects.filter(enrollment__student_id=student_id)
+        .select_related("enrollment__course")
+        .order_by("-payment_date")
+    )
+    return PaymentSerializer(payments, many=True).data
+
+
+def _enrollment_data(student_id: int) -> list:
+    # Serialized for frontend aggregation
+    enrollments = _enrollments(student_id).select_related("course", "student")
+    return EnrollmentSerializer(enrollments, many=True).data
+
+
+def _lesson_summary(student_id: int) -> dict:
+    """Completed / remaining lessons per course type and category."""
+    summary: dict = {
+        "remaining": {"theory": {}, "practice": {}},
+        "completed": {"theory": {}, "practice": {}},
+    }
+    enrollments = (
+        _enrollments(student_id)
+        .select_related("course")
+        .annotate(
+            completed_count=Count("lessons", filter=Q(lessons__status=LessonStatus.COMPLETED.value))
+        )
+    )
+    for enrollment in enrollments:
+        course = enrollment.course
+        course_type = course.type.lower()  # theory or practice
+        remaining = summary["remaining"][course_type]
+        completed = summary["completed"][course_type]
+        # Remaining lessons = required lessons - completed lessons
+        remaining[course.category] = remaining.get(course.category, 0) + max(
+            0, course.required_lessons - enrollment.completed_count
+        )
+        completed[course.category] = completed.get(course.category, 0) + enrollment.completed_count
+    return summary
+
+
+# response key -> section; each runs its own queries and can run in any order
+DASHBOARD_SECTIONS: dict[str, Callable[[int], Any]] = {
+    "instructors": _instructors,
+    "courses": _courses,
+    "lessons": _lessons,
+    "scheduled_classes": _scheduled_classes,
+    "patterns": _pattern_data,
+    "payments": _payments,
+    "enrollments": _enrollment_data,
+    "lesson_summary": _lesson_summary,
+}
+
+
+def dashboard_payload(student, sections: dict[str, Any]) -> dict:
+    """Dashboard response for ``student`` (a ``StudentPrincipal``) from computed sections."""
+    return {
+        "student": {
+            "id": student.id,
+            "first_name": student.first_name,
+            "last_name": student.last_name,
+            "email": student.email,
+            "phone_number": student.phone_number,
+            "status": student.status,
+            # Graduated students keep read-only access
+            "read_only": student.status == StudentStatus.GRADUATED.value,
+        },
+        **{key: sections[key] for key in DASHBOARD_SECTIONS},
+    }
+
+
+def student_dashboard(student) -> dict:
+    """Dashboard computed section by section in the calling thread."""
+    return dashboard_payload(
+        student, {key: section(student.id) for key, section in DASHBOARD_SECTIONS.items()}
+    )
+
+
+def _run_sections(keys: list[str], student_id: int) -> list:
+    # Worker threads keep their connections between tasks; drop stale / expired ones
+    close_old_connections()
+    try:
+        return [DASHBOARD_SECTIONS[key](student_id) for key in keys]
+    finally:
+        close_old_connections()
+
+
+async def astudent_dashboard(student) -> dict:
+    """Dashboard with its sections split over ``PORTAL_DASHBOARD_CONNECTIONS`` threads.
+
+    On SQLite (tests, local development) the sections run one after another in the
+    request's own thread: other connections cannot see its uncommitted test data.
+    """
+    workers = min(getattr(settings, "PORTAL_DASHBOARD_CONNECTIONS", 3), len(DASHBOARD_SECTIONS))
+    if connections["default"].vendor == "sqlite" or workers <= 1:
+        return await sync_to_async(student_dashboard)(student)
+    keys = list(DASHBOARD_SECTIONS)
+    groups = [keys[offset::workers] for offset in range(workers)]
+    results = await asyncio.gather(
+        *(
+            sync_to_async(_run_sections, thread_sensitive=False)(group, student.id)
+            for group in groups
+        )
+    )
+    sections = {
+        key: value for group, values in zip(groups, results) for key, value in zip(group, values)
+    }
+    return dashboard_payload(student, sections)
@@ -0,0 +1,119 @@
+"""Dry-run expansion of a scheduled class pattern for the pattern form.
+
+``preview_pattern`` expands an unsaved (or edited) pattern into the classes generation
+would create and checks them all at once, writing nothing:
+
+- Instructor and resource overlaps against bookings loaded with one query per table
+  (``series.booking_intervals``); when editing, the pattern's own SCHEDULED classes are
+  ignored since regeneration replaces them (completed and series-edited ones stay)
+- Instructor availability, loaded once
+
+Results are cached for ``PATTERN_PREVIEW_CACHE_SECONDS`` under a hash of the pattern's
+parameters, so re-previewing while the form is edited is cheap. Bookings made meanwhile
+only show once the entry expires.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+import orjson
+from django.conf import settings
+from django.db.models import Q
+from rest_framework import serializers
+
+from .enums import LessonStatus
+from .models import booking_end_time
+from .series import booking_intervals, overlaps_any
+from .utils import cache_get_or_compute
+from .validators import instructor_availability_checker
+
+SLOT_OK = "ok"
+INSTRUCTOR_CONFLICT = "instructor_conflict"
+RESOURCE_CONFLICT = "resource_conflict"
+OUTSIDE_AVAILABILITY = "outside_availability"
+
+# Pattern fields the expansion and its checks depend on
+PARAMETERS = (
+    "id",
+    "course_id",
+    "instructor_id",
+    "resource_id",
+    "recurrence_days",
+    "times",
+    "start_date",
+    "num_lessons",
+    "open_ended",
+    "end_date",
+    "default_duration_minutes",
+)
+
+
+def preview_key(pattern) -> str:
+    params = {name: getattr(pattern, name) for name in PARAMETERS}
+    params["recurrence_days"] = sorted(params["recurrence_days"])
+    # Open-ended patterns expand up to a horizon that moves with the date
+    params["until"] = pattern.materialization_end()
+    digest = hashlib.sha256(orjson.dumps(params, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    return f"school:pattern-preview:{digest}"
+
+
+def _expand(pattern) -> dict:
+    slots = []
+    classes = pattern.generate_scheduled_classes(until=pattern.materialization_end())
+    if not classes:
+        return {"count": 0, "conflicts": 0, "slots": slots}
+
+    by_instructor, by_resource = booking_intervals(
+        [pattern.instructor_id],
+        [pattern.resource_id] if pattern.resource_id else [],
+        min(cls.scheduled_time for cls in classes),
+        max(cls.end_time for cls in classes),
+        exclude=(
+            Q(
+                pattern_id=pattern.pk,
+                status=LessonStatus.SCHEDULED.value,
+                detached_from__isnull=True,
+            )
+            if pattern.pk
+            else None
+        ),
+    )
+    check_availability = instructor_availability_checker(pattern.instructor_id)
+    for cls in classes:
+        start, end = cls.scheduled_time, booking_end_time(cls.scheduled_time, cls.duration_minutes)
+        issues = []
+        if overlaps_any(by_instructor[pattern.instructor_id], start, end):
+            issues.append(INSTRUCTOR_CONFLICT)
+        if pattern.resource_id and overlaps_any(by_resource[pattern.resource_id], start, end):
+            issues.append(RESOURCE_CONFLICT)
+        try:
+            check_availability(start)
+        except serializers.ValidationError:
+            issues.append(OUTSIDE_AVAILABILITY)
+        slots.append(
+            {
+                "scheduled_time": start,
+                "end_time": end,
+                "status": issues[0] if issues else SLOT_OK,
+                "issues": issues,
+            }
+        )
+    return {
+        "count": len(slots),
+        "conflicts": sum(1 for slot in slots if slot["issues"]),
+        "slots": slots,
+    }
+
+
+def preview_pattern(pattern) -> dict:
+    """``{"count", "conflicts", "slots"}``: every would-be class of ``pattern`` with its status.
+
+    Each slot has ``scheduled_time``, ``end_time``, ``status`` (``ok`` or its first issue)
+    and ``issues``. Raises ``ValueError`` like generation on an unusable pattern.
+    """
+    return cache_get_or_compute(
+        preview_key(pattern),
+        lambda: _expand(pattern),
+        getattr(settings, "PATTERN_PREVIEW_CACHE_SECONDS", 30),
+    )
@@ -0,0 +1,186 @@
+"""Diff-based regeneration of a ``ScheduledClassPattern``'s classes.
+
+The pattern is expanded into its target occurrences (for open-ended patterns: up to
+``materialization_end()``) and compared with the classes it already has, keyed by
+start time (the pattern's date + time):
+
+- An existing class at a target start is kept with its roster; if it is still
+  SCHEDULED, fields that follow the pattern (course, instructor, resource, duration,
+  capacity, name) are updated when they differ
+- Target starts without a class are created
+- Classes at starts the pattern no longer produces are deleted, except COMPLETED ones
+- Classes a series change edited (``detached_from`` set) are kept as they are and
+  hold the start they were generated for, so it is not generated again
+- Pattern students are added to kept and created SCHEDULED classes they are missing
+  from, up to each class's ``max_students``
+
+Everything runs in one transaction; ``RegenerationResult`` lists the new roster
+entries and the rosters of updated and deleted classes (read before the delete), so
+callers notify just those students.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.utils import timezone
+
+from .enums import LessonStatus, RollupKind
+from .ical import booking_participants, bookings_changed, per_row_receivers_paused
+from .models import ScheduledClass, ScheduledClassPattern, booking_end_time
+from .rollups import schedule_rebuild
+from .sync import touch
+
+# Fields copied from the pattern's generated classes onto kept SCHEDULED classes
+SYNCED_FIELDS = (
+    "name",
+    "course_id",
+    "instructor_id",
+    "resource_id",
+    "duration_minutes",
+    "max_students",
+)
+
+
+@dataclass
+class RegenerationResult:
+    created: list = field(default_factory=list)
+    updated: list = field(default_factory=list)
+    deleted: list[int] = field(default_factory=list)
+    unchanged: int = 0
+    # (scheduled class, student) roster entries added by this regeneration
+    enrolled: list[tuple] = field(default_factory=list)
+    # (scheduled class, student) rosters of the updated / deleted classes
+    updated_rosters: list[tuple] = field(default_factory=list)
+    deleted_rosters: list[tuple] = field(default_factory=list)
+    # pattern students left out of a class because it was full
+    not_enrolled: int = 0
+
+
+def enroll_pattern_students(pattern, classes: list) -> tuple[list[tuple], int]:
+    """Add pattern students missing from ``classes``, up to each class's ``max_students``.
+
+    Returns the added ``(class, student)`` pairs and how many were left out of full classes.
+    """
+    students = list(pattern.students.all())
+    if not students or not classes:
+        return [], 0
+    Roster = ScheduledClass.students.through
+    rosters: dict[int, set[int]] = {cls.pk: set() for cls in classes}
+    for class_id, student_id in Roster.objects.filter(scheduledclass_id__in=rosters).values_list(
+        "scheduledclass_id", "student_id"
+    ):
+        rosters[class_id].add(student_id)
+
+    rows, enrolled, left_out = [], [], 0
+    for cls in classes:
+        roster = rosters[cls.pk]
+        missing = [student for student in students if student.pk not in roster]
+        free = max(0, cls.max_students - len(roster))
+        for student in missing[:free]:
+            rows.append(Roster(scheduledclass_id=cls.pk, student_id=student.pk))
+            enrolled.append((cls, student))
+        left_out += len(missing[free:])
+    Roster.objects.bulk_create(rows, ignore_conflicts=True)
+    touch(ScheduledClass, {row.scheduledclass_id for row in rows})
+    return enrolled, left_out
+
+
+def rosters(classes: list) -> list[tuple]:
+    """``(class, student)`` pairs of the current rosters of ``classes``."""
+    by_pk = {cls.pk: cls for cls in classes}
+    if not by_pk:
+        return []
+    entries = (
+        ScheduledClass.students.through.objects.filter(scheduledclass_id__in=by_pk)
+        .select_related("student")
+        .order_by("scheduledclass_id", "student_id")
+    )
+    return [(by_pk[entry.scheduledclass_id], entry.student) for entry in entries]
+
+
+def regenerate_classes(pattern) -> RegenerationResult:
+    """Bring the pattern's classes in line with its current settings (see module docstring).
+
+    Raises ``ValueError`` / ``django.core.exceptions.ValidationError`` like generation.
+    """
+    result = RegenerationResult()
+    until = pattern.materialization_end()
+    with transaction.atomic():
+        pattern.validate_generation()
+        targets = {
+            cls.scheduled_time: cls for cls in pattern.generate_scheduled_classes(until=until)
+        }
+        existing = list(
+            pattern.scheduled_classes.select_for_update(of=("self",)).order_by(
+                "scheduled_time", "pk"
+            )
+        )
+
+        kept: dict = {}
+        stale = []
+        for cls in existing:
+            start = cls.detached_from or cls.scheduled_time
+            if start in targets and start not in kept:
+                kept[start] = cls
+            elif cls.detached_from is None and cls.status != LessonStatus.COMPLETED.value:
+                stale.append(cls)
+
+        for start, cls in kept.items():
+            if cls.status != LessonStatus.SCHEDULED.value or cls.detached_from is not None:
+                result.unchanged += 1
+                continue
+            target = targets[start]
+            changed = [
+                name for name in SYNCED_FIELDS if getattr(cls, name) != getattr(target, name)
+            ]
+            if not changed:
+                result.unchanged += 1
+                continue
+            for name in SYNCED_FIELDS:
+                setattr(cls, name, getattr(target, name))
+            cls.end_time = booking_end_time(cls.scheduled_time, cls.duration_minutes)
+            cls.updated_at = timezone.now()
+            result.updated.append(cls)
+
+        # Stale classes go first so their slots are free for the updated / created ones
+        result.updated_rosters = rosters(result.updated)
+        # Feeds the changed classes leave, read before the writes
+        participants = booking_participants(
+            ScheduledClass, [cls.pk for cls in (*stale, *result.updated)]
+        )
+        if stale:
+            result.deleted_rosters = rosters(stale)
+            result.deleted = [cls.pk for cls in stale]
+            with per_row_receivers_paused():  # participants are reported below
+                ScheduledClass.objects.filter(pk__in=result.deleted).delete()
+        if result.updated:
+            ScheduledClass.objects.bulk_update(
+                result.updated,
+                [name.removesuffix("_id") for name in SYNCED_FIELDS] + ["end_time", "updated_at"],
+                batch_size=500,
+            )
+        result.created = ScheduledClass.objects.bulk_create(
+            [target for start, target in targets.items() if start not in kept]
+        )
+
+        result.enrolled, result.not_enrolled = enroll_pattern_students(
+            pattern,
+            result.created
+            + [cls for cls in kept.values() if cls.status == LessonStatus.SCHEDULED.value],
+        )
+        schedule_rebuild(
+            RollupKind.CLASS,
+            [cls.scheduled_time for cls in (*stale, *result.updated, *result.created)],
+        )
+        if until is not None:
+            ScheduledClassPattern.objects.filter(pk=pattern.pk).update(
+                materialized_until=until, updated_at=timezone.now()
+            )
+        participants |= booking_participants(
+            ScheduledClass, [cls.pk for cls in (*result.created, *result.updated)]
+        )
+        participants.update(("student", student.pk) for _cls, student in result.enrolled)
+        bookings_changed(participants)
+    return result
@@ -0,0 +1,57 @@
+"""orjson-backed drop-ins for DRF's JSONRenderer / JSONParser.
+
+Output matches DRF's default compact JSON: UTC datetimes end in ``Z``, non-native
+values (``Decimal``, lazy translation strings, querysets, ...) go through DRF's own
+``JSONEncoder.default`` and U+2028/U+2029 are escaped. Indented output (``?format``
+/ ``Accept: application/json; indent=4``) and non-default ``COMPACT_JSON`` /
+``UNICODE_JSON`` settings fall back to the stdlib implementation.
+"""
+
+import codecs
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+_LINE_SEPARATOR, _PARAGRAPH_SEPARATOR = "\u2028".encode(), "\u2029".encode()
+
+
+class ORJSONRenderer(JSONRenderer):
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+    default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        renderer_context = renderer_context or {}
+        if (
+            self.get_indent(accepted_media_type, renderer_context)
+            or not self.compact
+            or self.ensure_ascii
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.default, option=self.options)
+        # Keep output valid inside <script> / JavaScript, like JSONRenderer
+        if _LINE_SEPARATOR in ret or _PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(_LINE_SEPARATOR, b"\\u2028").replace(_PARAGRAPH_SEPARATOR, b"\\u2029")
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if not api_settings.STRICT_JSON or codecs.lookup(encoding).name != "utf-8":
+            # orjson only reads UTF-8 and always rejects NaN / Infinity
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}") from exc
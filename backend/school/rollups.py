@@ -0,0 +1,245 @@
+"""Daily rollups of lessons, scheduled classes and payments (``DailyRollup``).
+
+Dashboards read these pre-aggregated rows instead of scanning raw history, so their
+cost depends on the reporting window rather than on table size.
+
+- ``rebuild_rollups`` recomputes every row of a day range with one GROUP BY per
+  source; it is idempotent and backs ``manage.py rollup --since``
+- ``rebuild_missing_rollups`` only fills days that have source rows but no rollup row
+  (fresh installs, imported history); container start runs it as ``rollup --missing``
+- Rebuilds of the same kind and day are serialized with transaction-scoped advisory
+  locks on PostgreSQL, so concurrent commits cannot both insert a day's rows
+- Model signals rebuild the affected day(s) once the writing transaction commits; a
+  transaction rebuilds each (kind, day) once, however many of its rows touch it
+- Bulk writes bypass signals: call ``schedule_rebuild`` after ``bulk_create``; bulk
+  status transitions send ``transitions.statuses_changed``, which is handled here
+- Edits that only change a course category are picked up by the next ``rollup`` run
+"""
+
+from __future__ import annotations
+
+import zlib
+from datetime import date, datetime, time, timedelta
+from typing import Iterable
+
+from django.db import connections, router, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils.timezone import localdate, make_aware
+
+from .enums import RollupKind
+from .models import DailyRollup, Lesson, Payment, ScheduledClass
+from .transitions import statuses_changed
+from .utils import on_commit_batch
+
+# kind -> (model, time field, instructor, resource, category, minutes, amount)
+SOURCES = {
+    RollupKind.LESSON: (
+        Lesson,
+        "scheduled_time",
+        "instructor_id",
+        "resource_id",
+        "enrollment__course__category",
+        "duration_minutes",
+        None,
+    ),
+    RollupKind.CLASS: (
+        ScheduledClass,
+        "scheduled_time",
+        "instructor_id",
+        "resource_id",
+        "course__category",
+        "duration_minutes",
+        None,
+    ),
+    RollupKind.PAYMENT: (
+        Payment,
+        "payment_date",
+        None,
+        None,
+        "enrollment__course__category",
+        None,
+        "amount",
+    ),
+}
+KIND_BY_MODEL = {source[0]: kind for kind, source in SOURCES.items()}
+
+# Longer (or open) rebuild ranges lock the whole kind instead of each day
+LOCK_MAX_DAYS = 31
+
+
+def _start_of(day: date) -> datetime:
+    return make_aware(datetime.combine(day, time.min))
+
+
+def _lock_key(kind: RollupKind) -> int:
+    key = zlib.crc32(f"school.rollups.{kind.value}".encode())
+    return key - (1 << 32) if key >= 1 << 31 else key  # signed int4
+
+
+def _locks(kinds, since: date | None, until: date | None) -> list[tuple[int, int, bool]]:
+    """Advisory locks a rebuild takes, as ``(kind key, day ordinal or 0, shared)``.
+
+    Day rebuilds share the kind lock and hold their days exclusively; long or open
+    ranges hold the kind exclusively. Locks are listed in one global order (kind, day).
+    """
+    days = None
+    if since is not None and until is not None and (until - since).days <= LOCK_MAX_DAYS:
+        days = [since + timedelta(days=offset) for offset in range((until - since).days)]
+    locks = []
+    for kind in (kind for kind in SOURCES if kind in kinds):
+        key = _lock_key(kind)
+        if days is None:
+            locks.append((key, 0, False))
+        else:
+            locks.append((key, 0, True))
+            locks += [(key, day.toordinal(), False) for day in days]
+    return locks
+
+
+def _acquire(using: str, locks) -> None:
+    # Other backends (SQLite in tests) serialize writers on their own
+    if connections[using].vendor != "postgresql":
+        return
+    with connections[using].cursor() as cursor:
+        for key, day, shared in locks:
+            function = "pg_advisory_xact_lock_shared" if shared else "pg_advisory_xact_lock"
+            cursor.execute(f"SELECT {function}(%s, %s)", [key, day])
+
+
+def rebuild_rollups(
+    since: date | None = None, until: date | None = None, kinds: Iterable[RollupKind] | None = None
+) -> int:
+    """Recompute rollup rows for days in ``[since, until)``; open bounds cover all history.
+
+    Returns the number of rollup rows written.
+    """
+    kinds = list(kinds or SOURCES)
+    using = router.db_for_write(DailyRollup)
+    written = 0
+    with transaction.atomic(using=using):
+        _acquire(using, _locks(kinds, since, until))
+        for kind in kinds:
+            model, time_field, instructor, resource, category, minutes, amount = SOURCES[kind]
+            source = model.objects.order_by()
+            stale = DailyRollup.objects.filter(kind=kind.value)
+            if since is not None:
+                source = source.filter(**{f"{time_field}__gte": _start_of(since)})
+                stale = stale.filter(day__gte=since)
+            if until is not None:
+                source = source.filter(**{f"{time_field}__lt": _start_of(until)})
+                stale = stale.filter(day__lt=until)
+            stale.delete()
+
+            keys = [key for key in (instructor, resource, category) if key]
+            metrics = {"_count": Count("id")}
+            if minutes:
+                metrics["_minutes"] = Sum(minutes)
+            if amount:
+                metrics["_amount"] = Sum(amount)
+            rows = (
+                source.annotate(_day=TruncDate(time_field))
+                .values("_day", "status", *keys)
+                .annotate(**metrics)
+            )
+            written += len(
+                DailyRollup.objects.bulk_create(
+                    [
+                        DailyRollup(
+                            day=row["_day"],
+                            kind=kind.value,
+                            instructor_id=row.get(instructor),
+                            resource_id=row.get(resource),
+                            category=row[category] or "",
+                            status=row["status"],
+                            count=row["_count"],
+                            minutes=row.get("_minutes") or 0,
+                            amount=row.get("_amount") or 0,
+                        )
+                        for row in rows
+                    ],
+                    batch_size=1000,
+                )
+            )
+    return written
+
+
+def missing_days(kind: RollupKind) -> list[date]:
+    """Days with ``kind`` source rows but no rollup row, oldest first."""
+    model, time_field = SOURCES[kind][:2]
+    covered = DailyRollup.objects.filter(kind=kind.value).values("day")
+    return list(
+        model.objects.order_by()
+        .annotate(_day=TruncDate(time_field))
+        .exclude(_day__in=covered)
+        .values_list("_day", flat=True)
+        .distinct()
+        .order_by("_day")
+    )
+
+
+def rebuild_missing_rollups() -> int:
+    """Rebuild each run of consecutive missing days; returns the rollup rows written."""
+    written = 0
+    for kind in SOURCES:
+        runs: list[list[date]] = []
+        for day in missing_days(kind):
+            if runs and runs[-1][1] == day:
+                runs[-1][1] = day + timedelta(days=1)
+            else:
+                runs.append([day, day + timedelta(days=1)])
+        for since, until in runs:
+            written += rebuild_rollups(since, until, kinds=[kind])
+    return written
+
+
+def _rebuild_pending(pending: set[tuple[RollupKind, date]]) -> None:
+    for kind, day in sorted(pending, key=lambda item: (item[0].value, item[1])):
+        rebuild_rollups(day, day + timedelta(days=1), kinds=[kind])
+
+
+def schedule_rebuild(kind: RollupKind, moments: Iterable[datetime | None]) -> None:
+    """Rebuild the days touched by ``moments`` after the current transaction commits."""
+    on_commit_batch(
+        "school.rollups",
+        ((kind, localdate(moment)) for moment in moments if moment),
+        _rebuild_pending,
+    )
+
+
+# --- signal receivers (connected in SchoolConfig.ready) ---
+def _remember_previous_time(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    time_field = SOURCES[KIND_BY_MODEL[sender]][1]
+    instance._rollup_previous_time = (
+        sender._default_manager.filter(pk=instance.pk).values_list(time_field, flat=True).first()
+    )
+
+
+def _rollup_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    kind = KIND_BY_MODEL[sender]
+    time_field = SOURCES[kind][1]
+    previous = instance.__dict__.pop("_rollup_previous_time", None)
+    schedule_rebuild(kind, [getattr(instance, time_field), previous])
+
+
+def _rollup_deleted(sender, instance, **kwargs):
+    kind = KIND_BY_MODEL[sender]
+    schedule_rebuild(kind, [getattr(instance, SOURCES[kind][1])])
+
+
+def _rollup_statuses_changed(sender, moments, **kwargs):
+    schedule_rebuild(KIND_BY_MODEL[sender], moments)
+
+
+def connect_signals() -> None:
+    for model in KIND_BY_MODEL:
+        uid = f"school.rollups.{model.__name__}"
+        pre_save.connect(_remember_previous_time, sender=model, dispatch_uid=uid)
+        post_save.connect(_rollup_saved, sender=model, dispatch_uid=uid)
+        post_delete.connect(_rollup_deleted, sender=model, dispatch_uid=uid)
+    statuses_changed.connect(_rollup_statuses_changed, dispatch_uid="school.rollups.transitions")
@@ -1,10 +1,12 @@
 from datetime import datetime, timedelta
 
 from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from django.utils.translation import gettext as _
 from phonenumber_field.serializerfields import PhoneNumberField
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
 
 from .models import (
     Address,
@@ -21,7 +23,11 @@ from .models import (
     Student,
     Vehicle,
 )
+from .images import srcsets
+from .passwords import hash_password
+from .transitions import BULK_TRANSITIONS, MAX_BULK_TRANSITION
 from .validators import (
+    email_equals,
     validate_name,
     validate_phone,
     canonicalize_license_categories,
@@ -35,6 +41,7 @@ from .validators import (
     validate_date_of_birth,
     validate_unique_email,
     validate_unique_phone,
+    booking_conflict_from_integrity_error,
     MINIMUM_STUDENT_AGE,
 )
 
@@ -44,7 +51,60 @@ except Exception:  # pragma: no cover
     ZoneInfo = None  # type: ignore
 
 
-class StudentSerializer(serializers.ModelSerializer):
+class BookingConstraintMixin:
+    """Map database no-overlap constraint violations to the booking validation errors.
+
+    ``validate`` catches conflicts up front; this covers the race where two concurrent
+    requests both pass validation and the database rejects the second write.
+    """
+
+    def _save_booking(self, save, *args):
+        try:
+            with transaction.atomic():
+                return save(*args)
+        except IntegrityError as e:
+            conflict = booking_conflict_from_integrity_error(e)
+            if conflict is None:
+                raise
+            raise conflict from e
+
+    def create(self, validated_data):
+        return self._save_booking(super().create, validated_data)
+
+    def update(self, instance, validated_data):
+        return self._save_booking(super().update, instance, validated_data)
+
+
+class PrecheckedContactsMixin:
+    """Skip per-row email / phone uniqueness queries when ``context["contacts_prechecked"]``.
+
+    CSV imports check whole chunks with ``validators.existing_contacts`` first; the
+    DB unique constraints still apply on insert.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.context.get("contacts_prechecked"):
+            for name in ("email", "phone_number"):
+                field = fields[name]
+                field.validators = [v for v in field.validators if not isinstance(v, UniqueValidator)]
+        return fields
+
+
+def student_integrity_errors(exc: Exception) -> dict[str, list[str]]:
+    """Field errors for a unique-constraint violation on ``Student``."""
+    msg = str(exc).lower()
+    errors: dict[str, list[str]] = {}
+    if "email" in msg:
+        errors.setdefault("email", ["Email already registered"])
+    if "phone" in msg or "phone_number" in msg:
+        errors.setdefault("phone_number", ["Phone number already registered"])
+    if not errors:
+        errors["non_field_errors"] = ["Unexpected integrity error"]
+    return errors
+
+
+class StudentSerializer(PrecheckedContactsMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True, min_length=6)
 
     class Meta:
@@ -120,7 +180,10 @@ class StudentSerializer(serializers.ModelSerializer):
             value = validate_phone(value)
         except ValueError as e:
             raise serializers.ValidationError(str(e))
-        # Soft uniqueness check (also enforced by DB unique constraint)
+        # Soft uniqueness check (also enforced by DB unique constraint); imports
+        # check whole chunks up front (``existing_contacts``) and skip it
+        if self.context.get("contacts_prechecked"):
+            return value
         qs = Student.objects.filter(phone_number=value)
         if self.instance:
             qs = qs.exclude(pk=self.instance.pk)
@@ -129,7 +192,9 @@ class StudentSerializer(serializers.ModelSerializer):
         return value
 
     def validate_email(self, value: str) -> str:
-        qs = Student.objects.filter(email__iexact=value)
+        if self.context.get("contacts_prechecked"):
+            return value.lower()
+        qs = Student.objects.filter(email_equals(value))
         if self.instance:
             qs = qs.exclude(pk=self.instance.pk)
         if qs.exists():
@@ -146,28 +211,13 @@ class StudentSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         from django.db import IntegrityError, transaction
 
-        # Hash the password before creating
-        password = validated_data.pop("password")
+        # Hash the password before creating (provided Django-style hashes are kept)
+        validated_data["password"] = hash_password(validated_data["password"])
         try:
             with transaction.atomic():
-                student = super().create(validated_data)
-                if password.startswith(("pbkdf2_", "argon2$", "bcrypt$", "bcrypt_sha256$")):
-                    student.password = password  # keep provided Django-style hash
-                else:
-                    student.set_password(password)  # hash plain text
-
-                student.save()
-                return student
+                return super().create(validated_data)
         except IntegrityError as e:  # race condition uniqueness fallback
-            msg = str(e).lower()
-            errors: dict[str, list[str]] = {}
-            if "email" in msg:
-                errors.setdefault("email", ["Email already registered"])
-            if "phone" in msg or "phone_number" in msg:
-                errors.setdefault("phone_number", ["Phone number already registered"])
-            if not errors:
-                errors["non_field_errors"] = ["Unexpected integrity error"]
-            raise serializers.ValidationError(errors)
+            raise serializers.ValidationError(student_integrity_errors(e))
 
     def update(self, instance, validated_data):
         from django.db import IntegrityError, transaction
@@ -176,18 +226,10 @@ class StudentSerializer(serializers.ModelSerializer):
             with transaction.atomic():
                 return super().update(instance, validated_data)
         except IntegrityError as e:
-            msg = str(e).lower()
-            errors: dict[str, list[str]] = {}
-            if "email" in msg:
-                errors.setdefault("email", ["Email already registered"])
-            if "phone" in msg or "phone_number" in msg:
-                errors.setdefault("phone_number", ["Phone number already registered"])
-            if not errors:
-                errors["non_field_errors"] = ["Unexpected integrity error"]
-            raise serializers.ValidationError(errors)
+            raise serializers.ValidationError(student_integrity_errors(e))
 
 
-class InstructorSerializer(serializers.ModelSerializer):
+class InstructorSerializer(PrecheckedContactsMixin, serializers.ModelSerializer):
     class Meta:
         model = Instructor
         fields = [
@@ -244,6 +286,10 @@ class InstructorSerializer(serializers.ModelSerializer):
             value = validate_phone(value)
         except ValueError as e:
             raise serializers.ValidationError(str(e))
+        # Soft uniqueness check (also enforced by DB unique constraint); imports
+        # check whole chunks up front (``existing_contacts``) and skip it
+        if self.context.get("contacts_prechecked"):
+            return value
         qs = Instructor.objects.filter(phone_number=value)
         if self.instance:
             qs = qs.exclude(pk=self.instance.pk)
@@ -252,7 +298,9 @@ class InstructorSerializer(serializers.ModelSerializer):
         return value
 
     def validate_email(self, value: str) -> str:
-        qs = Instructor.objects.filter(email__iexact=value)
+        if self.context.get("contacts_prechecked"):
+            return value.lower()
+        qs = Instructor.objects.filter(email_equals(value))
         if self.instance:
             qs = qs.exclude(pk=self.instance.pk)
         if qs.exists():
@@ -388,7 +436,7 @@ class EnrollmentSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class LessonSerializer(serializers.ModelSerializer):
+class LessonSerializer(BookingConstraintMixin, serializers.ModelSerializer):
     instructor = InstructorSerializer(read_only=True)
     enrollment = EnrollmentSerializer(read_only=True)
     resource = ResourceSerializer(read_only=True)
@@ -600,6 +648,9 @@ class ScheduledClassPatternSerializer(serializers.ModelSerializer):
             "times",
             "start_date",
             "num_lessons",
+            "open_ended",
+            "end_date",
+            "materialized_until",
             "default_duration_minutes",
             "default_max_students",
             # Removed: status - patterns don't have status, only generated classes do
@@ -667,7 +718,7 @@ class ScheduledClassPatternNestedSerializer(serializers.ModelSerializer):
         ]
 
 
-class ScheduledClassSerializer(serializers.ModelSerializer):
+class ScheduledClassSerializer(BookingConstraintMixin, serializers.ModelSerializer):
     pattern = ScheduledClassPatternNestedSerializer(read_only=True)
     pattern_id = serializers.PrimaryKeyRelatedField(
         queryset=ScheduledClassPattern.objects.all(), source="pattern", required=False, allow_null=True
@@ -842,6 +893,9 @@ class SchoolConfigSerializer(serializers.ModelSerializer):
     # Phone number fields with proper serialization
     contact_phone1 = PhoneNumberField()
     contact_phone2 = PhoneNumberField(required=False, allow_blank=True)
+    # {mime type: srcset} of the resized copies, empty until they are built
+    school_logo_srcset = serializers.SerializerMethodField()
+    landing_image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = SchoolConfig
@@ -849,11 +903,13 @@ class SchoolConfigSerializer(serializers.ModelSerializer):
             "id",
             "school_name",
             "school_logo",
+            "school_logo_srcset",
             "business_hours",
             "email",
             "contact_phone1",
             "contact_phone2",
             "landing_image",
+            "landing_image_srcset",
             "landing_text",
             "social_links",
             "rules",
@@ -863,6 +919,17 @@ class SchoolConfigSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id"]
 
+    def _srcset(self, variants, image):
+        request = self.context.get("request")
+        build_url = request.build_absolute_uri if request is not None else str
+        return srcsets(variants, image.name if image else None, build_url)
+
+    def get_school_logo_srcset(self, obj):
+        return self._srcset(obj.school_logo_variants, obj.school_logo)
+
+    def get_landing_image_srcset(self, obj):
+        return self._srcset(obj.landing_image_variants, obj.landing_image)
+
     def validate_landing_text(self, value):
         """Validate landing_text is a dictionary."""
         if not isinstance(value, dict):
@@ -901,3 +968,92 @@ class SchoolConfigSerializer(serializers.ModelSerializer):
             instance.addresses.set(address_ids)
 
         return instance
+
+
+class BulkTransitionSerializer(serializers.Serializer):
+    """Input of the ``transition`` actions; without ``ids`` the list filters select the rows."""
+
+    status = serializers.ChoiceField(choices=sorted(BULK_TRANSITIONS))
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=MAX_BULK_TRANSITION,
+    )
+
+
+class SeriesChangeSerializer(serializers.Serializer):
+    """Input of the pattern ``series`` action: cancel, or shift and/or move, from ``from_date`` on."""
+
+    from_date = serializers.DateField()
+    until_date = serializers.DateField(required=False)
+    shift_minutes = serializers.IntegerField(required=False, default=0, min_value=-1440, max_value=1440)
+    resource_id = serializers.PrimaryKeyRelatedField(
+        queryset=Resource.objects.all(), source="resource", required=False
+    )
+    cancel = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs):
+        until_date = attrs.get("until_date")
+        if until_date is not None and until_date < attrs["from_date"]:
+            raise serializers.ValidationError({"until_date": ["Must not be before from_date."]})
+        changes = bool(attrs["shift_minutes"]) or "resource" in attrs
+        if attrs["cancel"] and changes:
+            raise serializers.ValidationError("cancel cannot be combined with shift_minutes or resource_id.")
+        if not attrs["cancel"] and not changes:
+            raise serializers.ValidationError("Provide cancel, shift_minutes or resource_id.")
+        return attrs
+
+
+class PatternPreviewSerializer(ScheduledClassPatternSerializer):
+    """Input of the pattern ``preview`` action: the form's pattern fields, nothing is saved.
+
+    Booking checks are reported per slot by the preview instead of rejecting the input.
+    """
+
+    pattern_id = serializers.PrimaryKeyRelatedField(
+        queryset=ScheduledClassPattern.objects.all(), source="pattern", required=False
+    )
+
+    class Meta(ScheduledClassPatternSerializer.Meta):
+        fields = [
+            "pattern_id",
+            "name",
+            "course_id",
+            "instructor_id",
+            "resource_id",
+            "recurrence_days",
+            "times",
+            "start_date",
+            "num_lessons",
+            "open_ended",
+            "end_date",
+            "default_duration_minutes",
+            "default_max_students",
+        ]
+        extra_kwargs = {"name": {"required": False}}
+
+    def validate(self, attrs):
+        return attrs
+
+    def to_pattern(self) -> ScheduledClassPattern:
+        attrs = dict(self.validated_data)
+        pattern = attrs.pop("pattern", None)
+        attrs.setdefault("name", pattern.name if pattern else "Preview")
+        return ScheduledClassPattern(pk=pattern.pk if pattern else None, **attrs)
+
+
+class CalendarRangeSerializer(serializers.Serializer):
+    """``?start=&end=`` of calendar views: at most ``MAX_DAYS`` days."""
+
+    MAX_DAYS = 366
+
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+
+    def validate(self, attrs):
+        if attrs["end"] <= attrs["start"]:
+            raise serializers.ValidationError({"end": ["Must be after start."]})
+        if attrs["end"] - attrs["start"] > timedelta(days=self.MAX_DAYS):
+            raise serializers.ValidationError({"end": [f"The range cannot exceed {self.MAX_DAYS} days."]})
+        return attrs
@@ -0,0 +1,312 @@
+"""Series changes for the classes generated from a ``ScheduledClassPattern``.
+
+From a date on (optionally until a date), a pattern's SCHEDULED classes can be shifted
+by N minutes, moved to another resource, or cancelled in one request:
+
+- The affected classes are locked and validated as a set: one query per source loads
+  every booking they could now overlap, instructor availability is loaded once per
+  instructor, and a resource move is checked against each class's capacity and roster
+- All classes are written with one ``bulk_update``; rosters (the ``students`` M2M)
+  are left as they are
+- Changed classes record their generated start in ``detached_from``, so a later
+  regeneration keeps them instead of restoring the pattern's time or resource
+- On open-ended patterns a change may not reach occurrences past ``materialized_until``
+  (the horizon would bring them back unchanged), except a cancel without
+  ``until_date``, which ends the pattern the day before ``from_date``
+- The PostgreSQL no-overlap constraints are deferred until the whole set is written
+  (see migration 0029), then checked before the transaction ends
+"""
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.translation import gettext as _
+from rest_framework import serializers
+
+from .enums import LessonStatus, RollupKind
+from .ical import booking_participants, bookings_changed
+from .models import Lesson, Resource, ScheduledClass, ScheduledClassPattern, booking_end_time
+from .rollups import schedule_rebuild
+from .validators import (
+    booking_conflict_from_integrity_error,
+    instructor_availability_checker,
+    validate_category_and_license,
+    validate_classroom_resource_for_class,
+    validate_scheduled_class_capacity,
+)
+
+ACTIVE_STATUSES = [LessonStatus.SCHEDULED.value, LessonStatus.COMPLETED.value]
+# Same look-back as the per-booking checks in validators
+CONFLICT_LOOKBACK = timedelta(hours=8)
+DEFERRED_CONSTRAINTS = "scheduledclass_instructor_no_overlap, scheduledclass_resource_no_overlap"
+
+
+class SeriesConflict(Exception):
+    """The change breaks booking rules.
+
+    ``conflicts`` lists ``{"id", "scheduled_time", "errors"}`` per conflicting class.
+    """
+
+    def __init__(self, conflicts: list[dict]):
+        super().__init__(f"{len(conflicts)} conflicting classes")
+        self.conflicts = conflicts
+
+
+@dataclass(frozen=True)
+class SeriesChange:
+    from_date: date
+    until_date: date | None = None
+    shift_minutes: int = 0
+    resource: Resource | None = None
+    cancel: bool = False
+
+
+def _business_midnight(day: date) -> datetime:
+    return datetime.combine(
+        day, time.min, tzinfo=ZoneInfo(getattr(settings, "BUSINESS_TZ", "Europe/Chisinau"))
+    )
+
+
+def series_classes(pattern, change: SeriesChange):
+    """SCHEDULED classes of ``pattern`` on business-local days in the change's range."""
+    queryset = pattern.scheduled_classes.filter(
+        status=LessonStatus.SCHEDULED.value,
+        scheduled_time__gte=_business_midnight(change.from_date),
+    )
+    if change.until_date is not None:
+        queryset = queryset.filter(
+            scheduled_time__lt=_business_midnight(change.until_date + timedelta(days=1))
+        )
+    return queryset
+
+
+def overlaps_any(
+    intervals: list[tuple[datetime, datetime]], start: datetime, end: datetime
+) -> bool:
+    """Whether ``[start, end)`` overlaps one of the sorted ``(start, end)`` ``intervals``."""
+    # Walk back from the last interval starting before ``end``
+    index = bisect.bisect_left(intervals, (end,))
+    while index > 0:
+        index -= 1
+        other_start, other_end = intervals[index]
+        if other_start < start - CONFLICT_LOOKBACK:
+            return False
+        if other_end > start:
+            return True
+    return False
+
+
+def booking_intervals(
+    instructor_ids, resource_ids, start: datetime, end: datetime, exclude: Q | None = None
+):
+    """Active bookings of the instructors / resources that may overlap ``[start, end)``.
+
+    Returns ``(by_instructor, by_resource)``: id -> sorted ``(start, end)`` list, loaded with
+    one lesson and one class query. Classes matching ``exclude`` are left out.
+    """
+    window = (start - CONFLICT_LOOKBACK, end)
+    by_instructor: dict[int, list] = {pk: [] for pk in instructor_ids}
+    by_resource: dict[int, list] = {pk: [] for pk in resource_ids}
+    lessons = Lesson.objects.filter(
+        instructor_id__in=by_instructor,
+        status__in=ACTIVE_STATUSES,
+        scheduled_time__range=window,
+    ).values_list("instructor_id", "scheduled_time", "duration_minutes")
+    for instructor_id, lesson_start, duration in lessons:
+        by_instructor[instructor_id].append(
+            (lesson_start, booking_end_time(lesson_start, duration))
+        )
+    classes = ScheduledClass.objects.filter(
+        Q(instructor_id__in=by_instructor) | Q(resource_id__in=by_resource),
+        status__in=ACTIVE_STATUSES,
+        scheduled_time__range=window,
+    )
+    if exclude is not None:
+        classes = classes.exclude(exclude)
+    for instructor_id, resource_id, class_start, duration in classes.values_list(
+        "instructor_id", "resource_id", "scheduled_time", "duration_minutes"
+    ):
+        interval = (class_start, booking_end_time(class_start, duration))
+        if instructor_id in by_instructor:
+            by_instructor[instructor_id].append(interval)
+        if resource_id in by_resource:
+            by_resource[resource_id].append(interval)
+    for intervals in (*by_instructor.values(), *by_resource.values()):
+        intervals.sort()
+    return by_instructor, by_resource
+
+
+def _add_errors(errors: dict, exc: serializers.ValidationError) -> None:
+    detail = exc.detail if isinstance(exc.detail, dict) else {"non_field_errors": exc.detail}
+    for field, messages in detail.items():
+        errors.setdefault(field, []).extend(str(message) for message in messages)
+
+
+def series_conflicts(classes: list, change: SeriesChange) -> list[dict]:
+    """Booking rule violations of applying ``change`` to ``classes``, one entry per class."""
+    if change.cancel or not classes:
+        return []
+    shift = timedelta(minutes=change.shift_minutes)
+    moved = [(cls, cls.scheduled_time + shift, change.resource or cls.resource) for cls in classes]
+    ends = {cls.pk: booking_end_time(start, cls.duration_minutes) for cls, start, _r in moved}
+    instructor_ids = {cls.instructor_id for cls in classes if cls.instructor_id}
+    resource_ids = {resource.pk for _c, _s, resource in moved if resource is not None}
+    by_instructor, by_resource = booking_intervals(
+        instructor_ids,
+        resource_ids,
+        min(start for _c, start, _r in moved),
+        max(ends.values()),
+        exclude=Q(pk__in=list(ends)),
+    )
+
+    checkers = {pk: instructor_availability_checker(pk) for pk in instructor_ids} if shift else {}
+    roster_sizes = {}
+    if change.resource is not None:
+        roster_sizes = dict(
+            ScheduledClass.students.through.objects.filter(scheduledclass_id__in=ends.keys())
+            .values("scheduledclass_id")
+            .annotate(size=Count("id"))
+            .values_list("scheduledclass_id", "size")
+        )
+
+    conflicts = []
+    for cls, start, resource in moved:
+        errors: dict[str, list[str]] = {}
+        end = ends[cls.pk]
+        checks = []
+        if cls.instructor_id in checkers:
+            checks.append(lambda: checkers[cls.instructor_id](start))
+        if change.resource is not None:
+            checks += [
+                lambda: validate_classroom_resource_for_class(resource),
+                lambda: validate_category_and_license(cls.course, cls.instructor, resource),
+                lambda: validate_scheduled_class_capacity(resource, cls.max_students),
+            ]
+        for check in checks:
+            try:
+                check()
+            except serializers.ValidationError as exc:
+                _add_errors(errors, exc)
+        roster = roster_sizes.get(cls.pk, 0)
+        if resource is not None and change.resource is not None and roster > resource.max_capacity:
+            errors.setdefault("resource_id", []).append(
+                _("validation.selectedStudentsExceedCapacity")
+                + f" (Selected: {roster}, Capacity: {resource.max_capacity})"
+            )
+        if cls.instructor_id and overlaps_any(by_instructor[cls.instructor_id], start, end):
+            errors.setdefault("instructor_id", []).append(_("validation.instructorConflict"))
+        if resource is not None and overlaps_any(by_resource[resource.pk], start, end):
+            errors.setdefault("resource_id", []).append(_("validation.resourceConflict"))
+        if errors:
+            conflicts.append({"id": cls.pk, "scheduled_time": start, "errors": errors})
+    return conflicts
+
+
+def check_horizon(pattern, change: SeriesChange) -> None:
+    """Reject a change reaching not yet materialized occurrences of an open-ended pattern.
+
+    Raises ``serializers.ValidationError``; see the module docstring.
+    """
+    if not pattern.open_ended:
+        return
+    if change.cancel and change.until_date is None:
+        if change.from_date <= pattern.start_date:
+            raise serializers.ValidationError(
+                {"from_date": ["Delete the pattern to cancel all of its classes."]}
+            )
+        return
+    horizon = pattern.materialized_until
+    last = change.until_date or pattern.end_date
+    if horizon is None:
+        raise serializers.ValidationError(
+            {"from_date": ["This pattern has no classes to change yet."]}
+        )
+    if last is None or last > horizon:
+        raise serializers.ValidationError(
+            {
+                "until_date": [
+                    f"Classes of this pattern can only be changed up to {horizon.isoformat()}."
+                ]
+            }
+        )
+
+
+def apply_series_change(pattern, change: SeriesChange) -> list[int]:
+    """Validate and apply ``change`` to the pattern's classes; returns the changed ids.
+
+    Raises ``SeriesConflict`` listing every conflicting class, and
+    ``serializers.ValidationError`` from ``check_horizon``.
+    """
+    with transaction.atomic():
+        if pattern.open_ended:
+            # Same lock as horizon.extend_pattern, so materialized_until stays put
+            pattern = ScheduledClassPattern.objects.select_for_update().get(pk=pattern.pk)
+            check_horizon(pattern, change)
+        # Lock first: FOR UPDATE cannot be combined with the joins / grouping below
+        ids = list(
+            series_classes(pattern, change)
+            .select_for_update(of=("self",))
+            .values_list("pk", flat=True)
+        )
+        classes = list(
+            ScheduledClass.objects.filter(pk__in=ids)
+            .select_related("course", "instructor", "resource")
+            .order_by("scheduled_time")
+        )
+        conflicts = series_conflicts(classes, change)
+        if conflicts:
+            raise SeriesConflict(conflicts)
+
+        previous = [cls.scheduled_time for cls in classes]
+        participants = booking_participants(ScheduledClass, ids)
+        if change.resource is not None:
+            participants.add(("resource", change.resource.pk))
+        for cls in classes:
+            cls.detached_from = cls.detached_from or cls.scheduled_time
+        if change.cancel:
+            fields = ["status"]
+            for cls in classes:
+                cls.status = LessonStatus.CANCELED.value
+        else:
+            fields = ["scheduled_time", "end_time", "resource"]
+            for cls in classes:
+                cls.scheduled_time += timedelta(minutes=change.shift_minutes)
+                cls.end_time = booking_end_time(cls.scheduled_time, cls.duration_minutes)
+                cls.resource = change.resource or cls.resource
+
+        if classes:
+            now = timezone.now()
+            for cls in classes:
+                cls.updated_at = now
+            fields += ["detached_from", "updated_at"]  # bulk_update skips auto_now
+            defer = connection.vendor == "postgresql"
+            try:
+                with connection.cursor() as cursor:
+                    if defer:
+                        cursor.execute(f"SET CONSTRAINTS {DEFERRED_CONSTRAINTS} DEFERRED")
+                    ScheduledClass.objects.bulk_update(classes, fields, batch_size=500)
+                    if defer:
+                        # Check now (not at COMMIT) so a conflict maps to the usual error
+                        cursor.execute(f"SET CONSTRAINTS {DEFERRED_CONSTRAINTS} IMMEDIATE")
+            except IntegrityError as e:
+                conflict = booking_conflict_from_integrity_error(e)
+                if conflict is None:
+                    raise
+                raise conflict from e
+            schedule_rebuild(RollupKind.CLASS, previous + [cls.scheduled_time for cls in classes])
+            bookings_changed(participants)
+        if pattern.open_ended and change.cancel and change.until_date is None:
+            end_date = change.from_date - timedelta(days=1)
+            if pattern.end_date is None or end_date < pattern.end_date:
+                ScheduledClassPattern.objects.filter(pk=pattern.pk).update(
+                    end_date=end_date, updated_at=timezone.now()
+                )
+    return [cls.pk for cls in classes]
@@ -6,8 +6,221 @@ of fat views or serializers. Keep functions small & composable.
 
 from __future__ import annotations
 
+from datetime import date, datetime, timedelta
+from typing import Iterable
 
-# Placeholder example (remove when real logic added)
-def example_service() -> None:  # pragma: no cover - illustrative stub
-    """Example placeholder service function."""
-    return
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils.timezone import localdate, now
+
+from .enums import EnrollmentStatus, LessonStatus, PaymentStatus, RollupKind
+from .models import (
+    Course,
+    DailyRollup,
+    Enrollment,
+    Instructor,
+    Resource,
+    ScheduledClass,
+    ScheduledClassPattern,
+    Student,
+)
+from .utils import scalar_aggregates
+
+LESSON_ROLLUPS = Q(kind=RollupKind.LESSON.value)
+
+
+def dashboard_summary() -> dict:
+    """Entity counts and payment total for the admin dashboard (single query).
+
+    Lesson and payment figures come from ``DailyRollup`` (see ``school.rollups``).
+    """
+    row = scalar_aggregates(
+        students=(Student.objects.all(), Count("id")),
+        instructors=(Instructor.objects.all(), Count("id")),
+        resources=(Resource.objects.all(), Count("id")),
+        courses=(Course.objects.all(), Count("id")),
+        enrollments_active=(
+            Enrollment.objects.all(),
+            Count("id", filter=~Q(status=EnrollmentStatus.COMPLETED.value)),
+        ),
+        lessons_scheduled=(
+            DailyRollup.objects.filter(LESSON_ROLLUPS, status=LessonStatus.SCHEDULED.value),
+            Sum("count"),
+        ),
+        payments_total=(
+            DailyRollup.objects.filter(kind=RollupKind.PAYMENT.value),
+            Sum("amount"),
+        ),
+    )
+    data = {key: int(value or 0) for key, value in row.items() if key != "payments_total"}
+    data["payments_total"] = float(row["payments_total"] or 0)
+    return data
+
+
+def lesson_stats(now_ts: datetime | None = None) -> dict:
+    """Lesson KPIs for the admin dashboard (camelCase to match frontend expectations).
+
+    - todayScheduled: SCHEDULED lessons scheduled for today
+    - thisWeekCompleted: COMPLETED lessons in current ISO week
+    - attendanceRate: for current week, completed / (completed + canceled) * 100
+    - topInstructors: top 3 instructors over last 4 weeks with completion rate
+    - weeklyTrend: total lessons per week for last 4 weeks (oldest -> newest)
+
+    Reads the lesson rollups of the 4-week window: one conditional aggregate plus one
+    grouped aggregate for the instructor ranking.
+    """
+    today = localdate(now_ts or now())
+    # ISO week: Monday is 0
+    week_start = today - timedelta(days=today.weekday())
+    week_end = week_start + timedelta(days=7)
+    last4_start = week_start - timedelta(days=21)
+
+    window = DailyRollup.objects.filter(LESSON_ROLLUPS, day__gte=last4_start, day__lt=week_end)
+    this_week = Q(day__gte=week_start)
+    # Week buckets oldest -> newest; the last one is the current week
+    week_buckets = {
+        f"week_{i}": Sum(
+            "count",
+            filter=Q(
+                day__gte=last4_start + timedelta(days=7 * i),
+                day__lt=last4_start + timedelta(days=7 * (i + 1)),
+            ),
+        )
+        for i in range(4)
+    }
+    totals = window.aggregate(
+        today_scheduled=Sum("count", filter=Q(day=today, status=LessonStatus.SCHEDULED.value)),
+        week_completed=Sum("count", filter=this_week & Q(status=LessonStatus.COMPLETED.value)),
+        week_canceled=Sum("count", filter=this_week & Q(status=LessonStatus.CANCELED.value)),
+        **week_buckets,
+    )
+    totals = {key: value or 0 for key, value in totals.items()}
+    completed = totals["week_completed"]
+    denom = completed + totals["week_canceled"]
+
+    instr_stats = (
+        window.values("instructor_id", "instructor__first_name", "instructor__last_name")
+        .annotate(
+            total=Sum("count"),
+            completed=Sum("count", filter=Q(status=LessonStatus.COMPLETED.value)),
+        )
+        .order_by("-total")[:3]
+    )
+    top_instructors = [
+        {
+            "name": f"{row['instructor__first_name']} {row['instructor__last_name']}",
+            "total": row["total"] or 0,
+            "completed": row["completed"] or 0,
+            "completionRate": (
+                int(round(((row["completed"] or 0) / row["total"]) * 100)) if row["total"] else 0
+            ),
+        }
+        for row in instr_stats
+    ]
+
+    return {
+        "todayScheduled": totals["today_scheduled"],
+        "thisWeekCompleted": completed,
+        "attendanceRate": int(round((completed / denom) * 100)) if denom else 0,
+        "topInstructors": top_instructors,
+        "weeklyTrend": [{"week": f"W{i + 1}", "lessons": totals[f"week_{i}"]} for i in range(4)],
+    }
+
+
+def daily_trends(days: int = 30, today: date | None = None) -> list[dict]:
+    """Per-day lesson, class and revenue series for the last ``days`` days (oldest first).
+
+    Days without activity are included with zeros so charts get a continuous axis.
+    """
+    today = today or localdate()
+    first_day = today - timedelta(days=days - 1)
+    rows = (
+        DailyRollup.objects.filter(day__gte=first_day, day__lte=today)
+        .values("day")
+        .annotate(
+            lessons=Sum("count", filter=LESSON_ROLLUPS),
+            lessons_completed=Sum(
+                "count", filter=LESSON_ROLLUPS & Q(status=LessonStatus.COMPLETED.value)
+            ),
+            classes=Sum("count", filter=Q(kind=RollupKind.CLASS.value)),
+            minutes=Sum("minutes", filter=~Q(status=LessonStatus.CANCELED.value)),
+            revenue=Sum(
+                "amount",
+                filter=Q(kind=RollupKind.PAYMENT.value, status=PaymentStatus.COMPLETED.value),
+            ),
+        )
+        .order_by("day")
+    )
+    by_day = {row.pop("day"): row for row in rows}
+    series = []
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        row = by_day.get(day, {})
+        series.append(
+            {
+                "day": day.isoformat(),
+                "lessons": row.get("lessons") or 0,
+                "lessons_completed": row.get("lessons_completed") or 0,
+                "classes": row.get("classes") or 0,
+                "minutes": row.get("minutes") or 0,
+                "revenue": float(row.get("revenue") or 0),
+            }
+        )
+    return series
+
+
+def pattern_statistics(patterns: Iterable[ScheduledClassPattern]) -> list[dict]:
+    """Class and enrollment statistics for each pattern, in one grouped query.
+
+    Enrollments are the real per-class student counts (through-table rows), not the
+    pattern roster; capacity is the sum of ``max_students`` over the pattern's classes.
+    """
+    patterns = list(patterns)
+    per_class_enrolled = (
+        ScheduledClass.students.through.objects.filter(scheduledclass_id=OuterRef("pk"))
+        .order_by()
+        .values("scheduledclass_id")
+        .annotate(n=Count("*"))
+        .values("n")
+    )
+    rows = (
+        ScheduledClass.objects.filter(pattern_id__in=[p.id for p in patterns])
+        .order_by()
+        .values("pattern_id")
+        .annotate(
+            total_classes=Count("id"),
+            scheduled_classes=Count("id", filter=Q(status=LessonStatus.SCHEDULED.value)),
+            completed_classes=Count("id", filter=Q(status=LessonStatus.COMPLETED.value)),
+            cancelled_classes=Count("id", filter=Q(status=LessonStatus.CANCELED.value)),
+            total_capacity=Sum("max_students"),
+            total_enrolled_students=Sum(
+                Coalesce(Subquery(per_class_enrolled, output_field=IntegerField()), 0)
+            ),
+        )
+    )
+    by_pattern = {row.pop("pattern_id"): row for row in rows}
+
+    stats = []
+    for pattern in patterns:
+        row = by_pattern.get(pattern.id, {})
+        total_classes = row.get("total_classes", 0)
+        enrolled = row.get("total_enrolled_students") or 0
+        capacity = row.get("total_capacity") or 0
+        stats.append(
+            {
+                "pattern_id": pattern.id,
+                "pattern_name": pattern.name,
+                "total_classes": total_classes,
+                "scheduled_classes": row.get("scheduled_classes", 0),
+                "completed_classes": row.get("completed_classes", 0),
+                "cancelled_classes": row.get("cancelled_classes", 0),
+                "total_enrolled_students": enrolled,
+                "average_students_per_class": (
+                    round(enrolled / total_classes, 2) if total_classes else 0
+                ),
+                "capacity_utilization_percent": (
+                    round(enrolled / capacity * 100, 2) if capacity else 0
+                ),
+            }
+        )
+    return stats
@@ -0,0 +1,138 @@
+"""Student principals for token-authenticated portal requests.
+
+``StudentJWTAuthentication`` resolves the ``student_id`` claim to a ``StudentPrincipal``
+(id, status, name, contact fields) instead of a ``Student`` instance, so a portal
+request does not have to load the student row every time.
+
+- Principals are kept in a small per-process cache for
+  ``STUDENT_PRINCIPAL_CACHE_SECONDS`` (0 disables it)
+- Saving or deleting a ``Student`` drops its entry and bumps its version, so a lookup
+  that raced with the write cannot store stale data (connected in ``SchoolConfig.ready``)
+- Bulk ``update()`` calls bypass signals: call ``invalidate_student`` for affected ids
+- Other worker processes pick up changes once their entry expires
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .models import Student
+
+# Entries beyond this are dropped wholesale rather than tracked for LRU eviction
+MAX_CACHED_PRINCIPALS = 10_000
+
+_FIELDS = ("id", "status", "first_name", "last_name", "email", "phone_number")
+
+_lock = threading.Lock()
+_principals: dict[int, tuple[float, StudentPrincipal]] = {}
+_versions: dict[int, int] = {}
+
+
+@dataclass(frozen=True)
+class StudentPrincipal:
+    """Read-only snapshot of the student behind a token (``request.user`` on portal views)."""
+
+    id: int
+    status: str
+    first_name: str
+    last_name: str
+    email: str
+    phone_number: str
+
+    is_authenticated = True
+    is_anonymous = False
+
+    @property
+    def pk(self) -> int:
+        return self.id
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "first_name": self.first_name,
+            "last_name": self.last_name,
+            "email": self.email,
+            "status": self.status,
+        }
+
+
+def _cached(student_id: int) -> StudentPrincipal | None:
+    entry = _principals.get(student_id)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _principal_row(student_id: int):
+    return Student.objects.filter(id=student_id).values(*_FIELDS)
+
+
+def _remember(student_id: int, version: int, row: dict | None) -> StudentPrincipal | None:
+    if row is None:
+        return None
+    principal = StudentPrincipal(**{**row, "phone_number": str(row["phone_number"] or "")})
+    timeout = getattr(settings, "STUDENT_PRINCIPAL_CACHE_SECONDS", 60)
+    if timeout > 0:
+        with _lock:
+            # A save that happened while the row was being read wins
+            if _versions.get(student_id, 0) == version:
+                if len(_principals) >= MAX_CACHED_PRINCIPALS:
+                    _principals.clear()
+                _principals[student_id] = (time.monotonic() + timeout, principal)
+    return principal
+
+
+def get_student_principal(student_id: int) -> StudentPrincipal | None:
+    """Principal for ``student_id``, or ``None`` if the student does not exist."""
+    principal = _cached(student_id)
+    if principal is None:
+        version = _versions.get(student_id, 0)
+        principal = _remember(student_id, version, _principal_row(student_id).first())
+    return principal
+
+
+async def aget_student_principal(student_id: int) -> StudentPrincipal | None:
+    """Async ``get_student_principal``; a cache miss reads the row through the async ORM."""
+    principal = _cached(student_id)
+    if principal is None:
+        version = _versions.get(student_id, 0)
+        principal = _remember(student_id, version, await _principal_row(student_id).afirst())
+    return principal
+
+
+def invalidate_student(student_id: int) -> None:
+    with _lock:
+        _principals.pop(student_id, None)
+        _versions[student_id] = _versions.get(student_id, 0) + 1
+
+
+def clear_principal_cache() -> None:
+    with _lock:
+        _principals.clear()
+        _versions.clear()
+
+
+# --- signal receivers (connected in SchoolConfig.ready) ---
+def _student_changed(sender, instance, raw=False, **kwargs):
+    if instance.pk is None:
+        return
+    invalidate_student(instance.pk)
+    # Readers may re-cache the uncommitted row's previous state until the write commits
+    transaction.on_commit(lambda pk=instance.pk: invalidate_student(pk))
+
+
+def connect_signals() -> None:
+    post_save.connect(_student_changed, sender=Student, dispatch_uid="school.student_auth.saved")
+    post_delete.connect(
+        _student_changed, sender=Student, dispatch_uid="school.student_auth.deleted"
+    )
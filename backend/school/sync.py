@@ -0,0 +1,115 @@
+"""Change tracking behind the incremental ``?since=<cursor>`` list mode.
+
+- The ``TRACKED_MODELS`` carry ``updated_at`` (``auto_now``, indexed with ``id``).
+  Writes that bypass ``save()`` (``.update()``, ``bulk_update``) must set it
+  themselves, e.g. with ``touch``
+- Deleting a tracked row (cascades included) records a ``Tombstone`` so clients can
+  drop it; a transaction's tombstones are written with one ``bulk_create`` once it
+  commits. Tombstones are pruned after ``SYNC_TOMBSTONE_DAYS`` (``manage.py
+  prune_tombstones``) and older cursors must resync
+- Roster changes touch the class or pattern, and deleting a resource touches the
+  lessons whose ``resource`` is set to NULL
+
+The receivers are connected in ``SchoolConfig.ready``; see
+``pagination.ChangesPagination`` for the read side.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Iterable
+
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, pre_delete
+from django.utils import timezone
+
+from .models import (
+    Course,
+    Enrollment,
+    Instructor,
+    InstructorAvailability,
+    Lesson,
+    Payment,
+    Resource,
+    ScheduledClass,
+    ScheduledClassPattern,
+    Student,
+    Tombstone,
+    Vehicle,
+)
+from .utils import on_commit_batch
+
+TRACKED_MODELS = (
+    Student,
+    Instructor,
+    InstructorAvailability,
+    Vehicle,
+    Resource,
+    Course,
+    ScheduledClassPattern,
+    ScheduledClass,
+    Enrollment,
+    Lesson,
+    Payment,
+)
+
+
+def is_tracked(model) -> bool:
+    return model in TRACKED_MODELS
+
+
+def touch(model, ids: Iterable[int]) -> int:
+    """Mark rows of ``model`` as changed without saving them; returns the row count."""
+    ids = list(ids)
+    if not ids:
+        return 0
+    return model._default_manager.filter(pk__in=ids).update(updated_at=timezone.now())
+
+
+def prune_tombstones(now=None) -> int:
+    """Delete tombstones past ``SYNC_TOMBSTONE_DAYS``; returns how many."""
+    cutoff = (now or timezone.now()) - timedelta(days=getattr(settings, "SYNC_TOMBSTONE_DAYS", 30))
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    return deleted
+
+
+def _write_tombstones(pending: set[tuple[str, int]]) -> None:
+    Tombstone.objects.bulk_create(
+        [Tombstone(model=label, object_id=pk) for label, pk in sorted(pending)], batch_size=1000
+    )
+
+
+# --- signal receivers (connected in SchoolConfig.ready) ---
+def _record_delete(sender, instance, **kwargs):
+    on_commit_batch("school.sync", [(sender._meta.label_lower, instance.pk)], _write_tombstones)
+
+
+def _roster_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        touch(type(instance), [instance.pk])
+    elif action == "pre_clear":
+        # ``student.scheduled_classes.clear()``: the affected rows are only known beforehand
+        touch(model, model._default_manager.filter(students=instance).values_list("pk", flat=True))
+    else:
+        touch(model, pk_set or ())
+
+
+def _resource_deleting(sender, instance, **kwargs):
+    # Lesson.resource is SET_NULL, which the collector applies with a plain UPDATE
+    touch(Lesson, instance.lessons.values_list("pk", flat=True))
+
+
+def connect_signals() -> None:
+    for model in TRACKED_MODELS:
+        post_delete.connect(
+            _record_delete, sender=model, dispatch_uid=f"school.sync.{model.__name__}.deleted"
+        )
+    for through in (ScheduledClass.students.through, ScheduledClassPattern.students.through):
+        m2m_changed.connect(
+            _roster_changed, sender=through, dispatch_uid=f"school.sync.{through.__name__}"
+        )
+    pre_delete.connect(
+        _resource_deleting, sender=Resource, dispatch_uid="school.sync.resource.deleting"
+    )
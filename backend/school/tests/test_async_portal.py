@@ -0,0 +1,138 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import orjson
+from asgiref.sync import async_to_sync
+from django.db import connections
+from django.test import AsyncRequestFactory, TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from school import async_views, portal
+from school.enums import StudentStatus
+from school.models import Course, Enrollment, Student
+from school.student_auth import aget_student_principal, clear_principal_cache
+
+
+def make_student(**extra):
+    student = Student(
+        first_name="Ana",
+        last_name="Popescu",
+        email="ana@example.com",
+        phone_number="+37369111222",
+        date_of_birth="2000-01-01",
+        status=StudentStatus.ACTIVE.value,
+        **extra,
+    )
+    student.set_password("secret")
+    student.save()
+    return student
+
+
+def bearer(student):
+    token = AccessToken()
+    token["student_id"] = student.id
+    token["status"] = student.status
+    return f"Bearer {token}"
+
+
+class AsyncPortalViewTests(TestCase):
+    def setUp(self):
+        clear_principal_cache()
+        self.addCleanup(clear_principal_cache)
+        self.student = make_student()
+        course = Course.objects.create(
+            name="Category B",
+            category="B",
+            type="PRACTICE",
+            description="",
+            price=100,
+            required_lessons=10,
+        )
+        Enrollment.objects.create(student=self.student, course=course, type="PRACTICE")
+        self.factory = AsyncRequestFactory()
+
+    async def test_login_matches_sync_view(self):
+        request = self.factory.post(
+            "/",
+            data={"email": "ANA@example.com", "password": "secret"},
+            content_type="application/json",
+        )
+        response = await async_views.student_login(request)
+        self.assertEqual(response.status_code, 200)
+        body = orjson.loads(response.content)
+        self.assertEqual(body["student"]["id"], self.student.id)
+        self.assertIn("access", body)
+
+        wrong = self.factory.post(
+            "/",
+            data={"email": "ana@example.com", "password": "nope"},
+            content_type="application/json",
+        )
+        response = await async_views.student_login(wrong)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(orjson.loads(response.content), {"detail": "Invalid credentials"})
+        empty = self.factory.post("/", data={}, content_type="application/json")
+        response = await async_views.student_login(empty)
+        self.assertEqual(response.status_code, 400)
+
+    async def test_me_requires_student_token(self):
+        response = await async_views.student_me(self.factory.get("/"))
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+
+        request = self.factory.get("/", headers={"Authorization": bearer(self.student)})
+        response = await async_views.student_me(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(orjson.loads(response.content)["email"], "ana@example.com")
+
+
+class ConcurrentDashboardTests(TransactionTestCase):
+    def setUp(self):
+        clear_principal_cache()
+        self.addCleanup(clear_principal_cache)
+        # As under ASGI: worker threads close their connections after each use, so none
+        # outlives the test and keeps the test database from being dropped
+        patcher = mock.patch.dict(connections.settings["default"], CONN_MAX_AGE=0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.student = make_student()
+
+    # Committed rows: the sections run on worker threads' own connections
+    def test_dashboard_matches_sync_view(self):
+        course = Course.objects.create(
+            name="Category B",
+            category="B",
+            type="PRACTICE",
+            description="",
+            price=100,
+            required_lessons=10,
+        )
+        Enrollment.objects.create(student=self.student, course=course, type="PRACTICE")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=bearer(self.student))
+        expected = client.get("/api/student/dashboard/").json()
+
+        request = AsyncRequestFactory().get("/", headers={"Authorization": bearer(self.student)})
+        response = async_to_sync(async_views.student_dashboard)(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(orjson.loads(response.content), expected)
+        self.assertEqual(expected["lesson_summary"]["remaining"]["practice"], {"B": 10})
+
+    async def test_sections_are_gathered_in_worker_threads(self):
+        principal = await aget_student_principal(self.student.id)
+        sequential = await portal.astudent_dashboard(principal)
+        # Take the PostgreSQL path; the rows are committed, so worker connections see them
+        with (
+            mock.patch.object(
+                portal, "connections", {"default": SimpleNamespace(vendor="postgresql")}
+            ),
+            mock.patch.object(portal, "_run_sections", wraps=portal._run_sections) as workers,
+        ):
+            concurrent = await portal.astudent_dashboard(principal)
+        # One connection per worker, not per section
+        self.assertEqual(workers.call_count, 3)
+        self.assertEqual(
+            orjson.dumps(concurrent, default=str), orjson.dumps(sequential, default=str)
+        )
+        self.assertEqual(list(concurrent), ["student", *portal.DASHBOARD_SECTIONS])
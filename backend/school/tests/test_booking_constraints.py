@@ -0,0 +1,122 @@
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from importlib import import_module
+from types import SimpleNamespace
+from unittest import skipUnless
+
+from django.db import IntegrityError, connection
+from django.test import TestCase
+
+from school.enums import CourseType, VehicleCategory
+from school.models import Course, Instructor, Resource, ScheduledClass, ScheduledClassPattern
+from school.validators import booking_conflict_from_integrity_error
+
+
+class BookingEndTimeTests(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(
+            name="Theory B",
+            category=VehicleCategory.B.value,
+            type=CourseType.THEORY.value,
+            description="Theory",
+            price=1000,
+            required_lessons=10,
+        )
+        self.instructor = Instructor.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            phone_number="+37369123456",
+            hire_date=date.today(),
+            license_categories="B",
+        )
+        self.resource = Resource.objects.create(name="Room 1", max_capacity=20)
+        self.start = datetime(2030, 1, 7, 10, 0, tzinfo=dt_timezone.utc)
+
+    def test_end_time_kept_in_sync_on_save(self):
+        cls = ScheduledClass.objects.create(
+            name="Class",
+            course=self.course,
+            instructor=self.instructor,
+            resource=self.resource,
+            scheduled_time=self.start,
+            duration_minutes=90,
+            max_students=10,
+        )
+        self.assertEqual(cls.end_time, self.start + timedelta(minutes=90))
+
+        cls.duration_minutes = 30
+        cls.save(update_fields=["duration_minutes"])
+        cls.refresh_from_db()
+        self.assertEqual(cls.end_time, self.start + timedelta(minutes=30))
+
+    def test_generated_classes_carry_end_time(self):
+        pattern = ScheduledClassPattern.objects.create(
+            name="Mon",
+            course=self.course,
+            instructor=self.instructor,
+            resource=self.resource,
+            recurrence_days=["MONDAY"],
+            times=["10:00"],
+            start_date=date.today(),
+            num_lessons=2,
+            default_duration_minutes=45,
+        )
+        for cls in pattern.generate_scheduled_classes():
+            self.assertEqual(cls.end_time, cls.scheduled_time + timedelta(minutes=45))
+
+    @skipUnless(connection.vendor == "postgresql", "exclusion constraints are PostgreSQL-only")
+    def test_migration_reports_existing_overlaps(self):
+        migration = import_module("school.migrations.0022_booking_end_time_exclusion_constraints")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "ALTER TABLE school_scheduledclass "
+                "DROP CONSTRAINT scheduledclass_instructor_no_overlap"
+            )
+        classes = [
+            ScheduledClass.objects.create(
+                name="Class",
+                course=self.course,
+                instructor=self.instructor,
+                resource=Resource.objects.create(name=f"Room {minutes}", max_capacity=20),
+                scheduled_time=self.start + timedelta(minutes=minutes),
+                max_students=10,
+            )
+            for minutes in (0, 30, 60)
+        ]
+        report = (
+            f"school_scheduledclass {classes[0].pk} (2030-01-07 10:00 UTC) and {classes[1].pk} "
+            f"(2030-01-07 10:30 UTC) share instructor_id {self.instructor.pk}"
+        )
+        # 10:00 and 11:00 only touch
+        self.assertEqual(len(migration.overlapping_bookings(connection)), 2)
+
+        editor = SimpleNamespace(connection=connection, execute=lambda sql: None)
+        with self.assertRaisesMessage(RuntimeError, report):
+            migration.add_exclusion_constraints(None, editor)
+
+
+class BookingConflictMappingTests(TestCase):
+    def _integrity_error(self, constraint_name, message=""):
+        cause = Exception(message)
+        cause.diag = SimpleNamespace(constraint_name=constraint_name)
+        exc = IntegrityError(message)
+        exc.__cause__ = cause
+        return exc
+
+    def test_instructor_constraint_maps_to_instructor_conflict(self):
+        err = booking_conflict_from_integrity_error(
+            self._integrity_error("lesson_instructor_no_overlap")
+        )
+        self.assertEqual(err.detail["instructor_id"][0], "validation.instructorConflict")
+
+    def test_resource_constraint_maps_to_resource_conflict(self):
+        err = booking_conflict_from_integrity_error(
+            self._integrity_error("scheduledclass_resource_no_overlap")
+        )
+        self.assertEqual(err.detail["resource_id"][0], "validation.resourceConflict")
+
+    def test_unrelated_constraint_is_not_mapped(self):
+        self.assertIsNone(
+            booking_conflict_from_integrity_error(self._integrity_error("school_student_email_key"))
+        )
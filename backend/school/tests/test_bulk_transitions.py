@@ -0,0 +1,165 @@
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from school import rollups
+from school.enums import CourseType, LessonStatus, RollupKind, VehicleCategory
+from school.models import (
+    Course,
+    DailyRollup,
+    Enrollment,
+    Instructor,
+    Lesson,
+    ScheduledClass,
+    Student,
+)
+
+
+class BulkTransitionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        course = Course.objects.create(
+            name="Driving B",
+            category=VehicleCategory.B.value,
+            type=CourseType.PRACTICE.value,
+            description="Practice",
+            price=1000,
+            required_lessons=10,
+        )
+        self.instructor = Instructor.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            phone_number="+37369123456",
+            hire_date=date.today(),
+            license_categories="B",
+        )
+        student = Student.objects.create(
+            first_name="Jane",
+            last_name="Smith",
+            email="jane@example.com",
+            phone_number="+37360111223",
+            date_of_birth="1990-01-01",
+        )
+        self.enrollment = Enrollment.objects.create(student=student, course=course)
+        self.start = datetime(2030, 1, 7, 8, 0, tzinfo=dt_timezone.utc)
+
+    def _lessons(self, *statuses):
+        # Committed, so their rollup rebuilds stay out of the tests' own transactions
+        with self.captureOnCommitCallbacks(execute=True):
+            return [
+                Lesson.objects.create(
+                    enrollment=self.enrollment,
+                    instructor=self.instructor,
+                    scheduled_time=self.start + timedelta(hours=2 * i),
+                    status=status,
+                )
+                for i, status in enumerate(statuses)
+            ]
+
+    def test_lessons_by_id_in_one_update(self):
+        scheduled, other, done, canceled = self._lessons(
+            LessonStatus.SCHEDULED.value,
+            LessonStatus.SCHEDULED.value,
+            LessonStatus.COMPLETED.value,
+            LessonStatus.CANCELED.value,
+        )
+        capture = CaptureQueriesContext(connection)
+        with (
+            mock.patch.object(rollups, "rebuild_rollups", wraps=rollups.rebuild_rollups) as rebuild,
+            capture as ctx,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            response = self.client.post(
+                "/api/lessons/transition/",
+                {
+                    "status": "COMPLETED",
+                    "ids": [scheduled.id, other.id, done.id, canceled.id, 999999],
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual(
+            response.data["results"],
+            [
+                {"id": scheduled.id, "result": "updated"},
+                {"id": other.id, "result": "updated"},
+                {"id": done.id, "result": "unchanged"},
+                {"id": canceled.id, "result": "invalid_transition", "from": "CANCELED"},
+                {"id": 999999, "result": "not_found"},
+            ],
+        )
+        self.assertEqual(Lesson.objects.get(pk=scheduled.pk).status, "COMPLETED")
+        self.assertEqual(Lesson.objects.get(pk=canceled.pk).status, "CANCELED")
+        updates = [q for q in ctx.captured_queries if q["sql"].startswith('UPDATE "school_lesson"')]
+        self.assertEqual(len(updates), 1)
+        # One aggregated event: a single rollup rebuild for the touched day
+        rebuild.assert_called_once()
+        rollup = DailyRollup.objects.get(
+            kind=RollupKind.LESSON.value, day=date(2030, 1, 7), status="COMPLETED"
+        )
+        self.assertEqual(rollup.count, 3)
+
+    def test_scheduled_classes_by_filter(self):
+        theory = Course.objects.create(
+            name="Theory B",
+            category=VehicleCategory.B.value,
+            type=CourseType.THEORY.value,
+            description="Theory",
+            price=500,
+            required_lessons=20,
+        )
+        classes = [
+            ScheduledClass.objects.create(
+                name=f"Class {i}",
+                course=theory,
+                instructor=self.instructor,
+                scheduled_time=self.start + timedelta(days=i),
+                max_students=10,
+            )
+            for i in range(3)
+        ]
+        response = self.client.post(
+            "/api/scheduled-classes/transition/?scheduled_time__lte=2030-01-08T12:00:00Z",
+            {"status": "CANCELED"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [r["id"] for r in response.data["results"]], [classes[0].id, classes[1].id]
+        )
+        self.assertEqual(
+            list(ScheduledClass.objects.order_by("id").values_list("status", flat=True)),
+            ["CANCELED", "CANCELED", "SCHEDULED"],
+        )
+
+    def test_requires_ids_or_filter_and_valid_status(self):
+        self._lessons(LessonStatus.SCHEDULED.value)
+        response = self.client.post(
+            "/api/lessons/transition/", {"status": "COMPLETED"}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        for query in ("page=1", "ordering=id", "format=json", "status="):
+            response = self.client.post(
+                f"/api/lessons/transition/?{query}", {"status": "COMPLETED"}, format="json"
+            )
+            self.assertEqual(response.status_code, 400, query)
+        response = self.client.post(
+            "/api/lessons/transition/", {"status": "SCHEDULED", "ids": [1]}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Lesson.objects.get().status, "SCHEDULED")
+
+        response = self.client.post(
+            f"/api/lessons/transition/?instructor_id={self.instructor.id}",
+            {"status": "COMPLETED"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Lesson.objects.get().status, "COMPLETED")
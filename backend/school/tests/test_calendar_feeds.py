@@ -0,0 +1,281 @@
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from school import ical
+from school.enums import CourseType, LessonStatus, VehicleCategory
+from school.models import (
+    Course,
+    Enrollment,
+    Instructor,
+    Lesson,
+    Resource,
+    ScheduledClass,
+    ScheduledClassPattern,
+    Student,
+)
+
+
+class CalendarFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Outside the test's savepoint: feed bumps pending here stay apart from the
+        # ones the tests commit
+        cls.course = Course.objects.create(
+            name="Driving B",
+            category=VehicleCategory.B.value,
+            type=CourseType.PRACTICE.value,
+            description="Practice",
+            price=1000,
+            required_lessons=10,
+        )
+        cls.theory = Course.objects.create(
+            name="Theory B",
+            category=VehicleCategory.B.value,
+            type=CourseType.THEORY.value,
+            description="Theory",
+            price=1000,
+            required_lessons=10,
+        )
+        cls.instructor = Instructor.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            phone_number="+37369123456",
+            hire_date=date.today(),
+            license_categories="B",
+        )
+        cls.room = Resource.objects.create(
+            name="Room 1", max_capacity=20, category=VehicleCategory.B.value, is_available=True
+        )
+        cls.student = Student.objects.create(
+            first_name="Jane",
+            last_name="Smith",
+            email="jane@example.com",
+            phone_number="+37360111223",
+            date_of_birth="1990-01-01",
+        )
+        cls.enrollment = Enrollment.objects.create(student=cls.student, course=cls.course)
+        cls.pattern = ScheduledClassPattern.objects.create(
+            name="Mondays",
+            course=cls.theory,
+            instructor=cls.instructor,
+            resource=cls.room,
+            recurrence_days=["MONDAY"],
+            times=["10:00"],
+            start_date=date(2030, 1, 7),
+            num_lessons=4,
+        )
+        cls.monday = datetime(2030, 1, 7, 10, 0, tzinfo=dt_timezone.utc)
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+
+    def _class(self, when, **kwargs):
+        return ScheduledClass.objects.create(
+            pattern=self.pattern,
+            course=self.theory,
+            instructor=self.instructor,
+            resource=self.room,
+            name="Mondays",
+            scheduled_time=when,
+            max_students=5,
+            **kwargs,
+        )
+
+    def _feed(self, kind, pk, **headers):
+        response = self.client.get(f"/api/calendar/{ical.feed_token(kind, pk)}.ics", **headers)
+        body = b"".join(response.streaming_content).decode() if response.status_code == 200 else ""
+        return response, body
+
+    def test_token_round_trip(self):
+        token = ical.feed_token("instructor", self.instructor.pk)
+        self.assertEqual(ical.resolve_feed_token(token), ("instructor", self.instructor.pk))
+        self.assertIsNone(ical.resolve_feed_token(token[:-1] + ("A" if token[-1] != "A" else "B")))
+        self.assertIsNone(
+            ical.resolve_feed_token(ical._signer().sign(f"vehicle-{self.instructor.pk}"))
+        )
+
+        self.assertEqual(self.client.get(f"/api/calendar/{token}x.ics").status_code, 404)
+        self.assertEqual(self._feed("resource", 999999)[0].status_code, 404)
+
+    def test_pattern_classes_become_one_recurring_event(self):
+        first, second, _ = [
+            self._class(self.monday + timedelta(weeks=week)) for week in (0, 1, 3)
+        ]  # third deleted
+        first.students.add(self.student)
+        second.students.add(self.student)
+        moved = self._class(self.monday + timedelta(weeks=2, days=1, hours=4))
+        Lesson.objects.create(
+            enrollment=self.enrollment,
+            instructor=self.instructor,
+            resource=self.room,
+            scheduled_time=datetime(2030, 1, 9, 8, 0, tzinfo=dt_timezone.utc),
+        )
+        Lesson.objects.create(
+            enrollment=self.enrollment,
+            instructor=self.instructor,
+            scheduled_time=datetime(2030, 1, 10, 8, 0, tzinfo=dt_timezone.utc),
+            status=LessonStatus.CANCELED.value,
+        )
+
+        response, body = self._feed("instructor", self.instructor.pk)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/calendar"))
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        self.assertTrue(
+            body.startswith("BEGIN:VCALENDAR\r\n") and body.endswith("END:VCALENDAR\r\n")
+        )
+        self.assertIn("X-WR-CALNAME:John Doe", body)
+        self.assertEqual(body.count("BEGIN:VEVENT"), 3)
+        self.assertIn("RRULE:FREQ=WEEKLY;BYDAY=MO;UNTIL=20300128T100000Z", body)
+        self.assertIn("EXDATE:20300121T100000Z", body)
+        self.assertIn(f"UID:class-{moved.pk}@", body)
+        self.assertIn("DTSTART:20300122T140000Z", body)
+        self.assertIn("DTSTART:20300109T080000Z\r\nDTEND:20300109T090000Z", body)
+        self.assertIn("SUMMARY:Driving B\r\nLOCATION:Room 1", body)
+        self.assertNotIn("20300110T080000Z", body)
+
+        _, student_body = self._feed("student", self.student.pk)
+        self.assertEqual(student_body.count("BEGIN:VEVENT"), 2)
+        self.assertIn("RRULE:FREQ=WEEKLY;BYDAY=MO;UNTIL=20300114T100000Z", student_body)
+
+    def test_conditional_requests_until_a_booking_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._class(self.monday)
+        response, _ = self._feed("resource", self.room.pk)
+        etag, last_modified = response["ETag"], response["Last-Modified"]
+
+        self.assertEqual(
+            self._feed("resource", self.room.pk, HTTP_IF_NONE_MATCH=etag)[0].status_code, 304
+        )
+        self.assertEqual(
+            self._feed("resource", self.room.pk, HTTP_IF_MODIFIED_SINCE=last_modified)[
+                0
+            ].status_code,
+            304,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._class(self.monday + timedelta(weeks=1))
+        response, body = self._feed("resource", self.room.pk, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertIn("BYDAY=MO", body)
+        self.assertEqual(
+            self._feed(
+                "resource",
+                self.room.pk,
+                HTTP_IF_MODIFIED_SINCE=http_date(datetime(2000, 1, 1).timestamp()),
+            )[0].status_code,
+            200,
+        )
+
+    def test_changes_only_revalidate_the_feeds_they_touch(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            other_room = Resource.objects.create(
+                name="Room 2", max_capacity=20, category=VehicleCategory.B.value, is_available=True
+            )
+            lesson = Lesson.objects.create(
+                enrollment=self.enrollment,
+                instructor=self.instructor,
+                resource=self.room,
+                scheduled_time=datetime(2030, 1, 9, 8, 0, tzinfo=dt_timezone.utc),
+            )
+        feeds = [
+            ("resource", self.room.pk),
+            ("resource", other_room.pk),
+            ("student", self.student.pk),
+        ]
+
+        def revalidate(etags):
+            return [
+                self._feed(*feed, HTTP_IF_NONE_MATCH=etags[feed])[0].status_code for feed in feeds
+            ]
+
+        etags = {feed: self._feed(*feed)[0]["ETag"] for feed in feeds}
+        with self.captureOnCommitCallbacks(execute=True):
+            ScheduledClass.objects.create(
+                course=self.theory,
+                instructor=self.instructor,
+                resource=other_room,
+                name="Workshop",
+                scheduled_time=self.monday,
+                max_students=5,
+            )
+        self.assertEqual(revalidate(etags), [304, 200, 304])
+
+        # Moving a booking changes the feed it leaves as well as the one it joins
+        etags = {feed: self._feed(*feed)[0]["ETag"] for feed in feeds}
+        with self.captureOnCommitCallbacks(execute=True):
+            lesson.resource = other_room
+            lesson.save()
+        self.assertEqual(revalidate(etags), [200, 200, 200])
+
+    def test_versions_are_shared_between_workers(self):
+        etag = self._feed("resource", self.room.pk)[0]["ETag"]
+        ical.invalidate_feeds(frozenset({("resource", self.room.pk)}))
+        # Another worker's memory holds nothing of this one
+        cache.clear()
+        response, _ = self._feed("resource", self.room.pk, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_feed_urls(self):
+        # 401 with the project's JWT authentication, 403 with DRF's default classes
+        self.assertIn(
+            self.client.get(f"/api/instructors/{self.instructor.pk}/calendar-feed/").status_code,
+            (401, 403),
+        )
+        self.client.force_authenticate(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+        url = self.client.get(f"/api/instructors/{self.instructor.pk}/calendar-feed/").data["url"]
+        self.assertTrue(url.startswith("http://testserver/api/calendar/"))
+        self.assertEqual(
+            ical.resolve_feed_token(url[len("http://testserver/api/calendar/") : -len(".ics")]),
+            ("instructor", self.instructor.pk),
+        )
+
+        student_client = APIClient()
+        token = AccessToken()
+        token["student_id"] = self.student.id
+        token["status"] = self.student.status
+        student_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        url = student_client.get("/api/student/calendar-feed/").data["url"]
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(
+            ical.resolve_feed_token(url.rsplit("/", 1)[1].removesuffix(".ics")),
+            ("student", self.student.pk),
+        )
+
+    def test_a_transaction_bumps_the_feed_versions_once(self):
+        with (
+            patch.object(ical, "invalidate_feeds") as invalidate,
+            self.captureOnCommitCallbacks(execute=True),
+            transaction.atomic(),
+        ):
+            first = self._class(self.monday)
+            self._class(self.monday + timedelta(weeks=1))
+            first.delete()
+            self.student.first_name = "Janet"
+            self.student.save()
+        invalidate.assert_called_once_with(
+            frozenset(
+                {
+                    ("instructor", self.instructor.pk),
+                    ("resource", self.room.pk),
+                    ("student", self.student.pk),
+                }
+            )
+        )
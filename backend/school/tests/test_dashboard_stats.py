@@ -0,0 +1,128 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from school import services, utils
+from school.enums import CourseType, LessonStatus, VehicleCategory
+from school.models import Course, Enrollment, Instructor, Lesson, Payment, Resource, Student
+from school.rollups import rebuild_rollups
+
+
+class DashboardStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        course = Course.objects.create(
+            name="Driving B",
+            category=VehicleCategory.B.value,
+            type=CourseType.PRACTICE.value,
+            description="Practice",
+            price=1000,
+            required_lessons=10,
+        )
+        self.instructor = Instructor.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            phone_number="+37369123456",
+            hire_date=date.today(),
+            license_categories="B",
+        )
+        student = Student.objects.create(
+            first_name="Jane",
+            last_name="Smith",
+            email="jane@example.com",
+            phone_number="+37360111223",
+            date_of_birth="1990-01-01",
+        )
+        self.enrollment = Enrollment.objects.create(student=student, course=course)
+        Payment.objects.create(
+            enrollment=self.enrollment, amount=150, payment_method="CASH", description="Fee"
+        )
+        # Wednesday noon: the ISO week starts on Monday 2030-01-07
+        self.now = datetime(2030, 1, 9, 12, 0, tzinfo=dt_timezone.utc)
+
+    def _lesson(self, when, status=LessonStatus.SCHEDULED.value):
+        return Lesson.objects.create(
+            enrollment=self.enrollment,
+            instructor=self.instructor,
+            scheduled_time=when,
+            status=status,
+        )
+
+    def test_lesson_stats_values(self):
+        self._lesson(self.now + timedelta(hours=2))
+        self._lesson(self.now - timedelta(days=1), LessonStatus.COMPLETED.value)
+        self._lesson(self.now - timedelta(days=2), LessonStatus.COMPLETED.value)
+        self._lesson(self.now - timedelta(days=2, hours=1), LessonStatus.CANCELED.value)
+        self._lesson(self.now - timedelta(days=14), LessonStatus.COMPLETED.value)
+        self._lesson(self.now - timedelta(days=60), LessonStatus.COMPLETED.value)  # outside window
+        rebuild_rollups()
+
+        with CaptureQueriesContext(connection) as ctx:
+            stats = services.lesson_stats(self.now)
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+        self.assertEqual(stats["todayScheduled"], 1)
+        self.assertEqual(stats["thisWeekCompleted"], 2)
+        self.assertEqual(stats["attendanceRate"], 67)
+        self.assertEqual([w["lessons"] for w in stats["weeklyTrend"]], [0, 1, 0, 4])
+        self.assertEqual(
+            stats["topInstructors"],
+            [{"name": "John Doe", "total": 5, "completed": 3, "completionRate": 60}],
+        )
+
+    def test_dashboard_summary_is_one_query(self):
+        self._lesson(self.now)
+        rebuild_rollups()
+        with CaptureQueriesContext(connection) as ctx:
+            data = services.dashboard_summary()
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(
+            data,
+            {
+                "students": 1,
+                "instructors": 1,
+                "resources": Resource.objects.count(),
+                "courses": 1,
+                "enrollments_active": 1,
+                "lessons_scheduled": 1,
+                "payments_total": 150.0,
+            },
+        )
+
+
+class CacheGetOrComputeTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_concurrent_misses_compute_once_and_release_their_lock(self):
+        calls = []
+        started = threading.Event()
+
+        def compute():
+            calls.append(1)
+            started.set()
+            time.sleep(0.05)
+            return 42
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            first = pool.submit(utils.cache_get_or_compute, "stats:a", compute, 30)
+            started.wait()
+            others = [
+                pool.submit(utils.cache_get_or_compute, "stats:a", compute, 30) for _ in range(3)
+            ]
+            results = [first.result()] + [future.result() for future in others]
+        self.assertEqual(results, [42] * 4)
+        self.assertEqual(len(calls), 1)
+
+        for key in ("stats:b", "stats:c"):
+            utils.cache_get_or_compute(key, lambda: 0, 30)
+        self.assertEqual(utils._inflight_locks, {})
@@ -0,0 +1,69 @@
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from school.db_router import PIN_COOKIE, ReplicaRouter
+from school.models import Resource
+
+REPLICA_CONFIGURED = "replica" in settings.DATABASES
+
+
+@skipUnless(REPLICA_CONFIGURED, "set REPLICA_DATABASE_URL to run the routing tests")
+@override_settings(READ_REPLICA_ALIAS="replica")
+class ReplicaRoutingTests(TransactionTestCase):
+    databases = {"default", "replica"} if REPLICA_CONFIGURED else {"default"}
+
+    def setUp(self):
+        self.client = APIClient()
+        self.resource = Resource.objects.create(name="Room 1", max_capacity=20)
+
+    def get(self, url):
+        with (
+            CaptureQueriesContext(connections["default"]) as primary,
+            CaptureQueriesContext(connections["replica"]) as replica,
+        ):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, len(primary.captured_queries), len(replica.captured_queries)
+
+    def test_safe_requests_read_from_replica(self):
+        response, primary, replica = self.get("/api/resources/")
+        self.assertIn("Room 1", [row["name"] for row in response.json()["results"]])
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_write_pins_client_to_primary(self):
+        response = self.client.patch(
+            f"/api/resources/{self.resource.id}/", {"name": "Room 2"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        response, primary, replica = self.get(f"/api/resources/{self.resource.id}/")
+        self.assertEqual(response.json()["name"], "Room 2")
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    @override_settings(DASHBOARD_STATS_CACHE_SECONDS=30)
+    def test_dashboard_summary_reads_from_replica(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        response, primary, replica = self.get("/api/utils/summary/")
+        self.assertGreaterEqual(response.json()["resources"], 1)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+
+@patch("school.db_router.replica_alias", return_value="replica")
+class ReplicaMigrationTests(SimpleTestCase):
+    def test_replica_is_never_migrated(self, _replica_alias):
+        router = ReplicaRouter()
+        self.assertIs(router.allow_migrate("replica", "school"), False)
+        self.assertIsNone(router.allow_migrate("default", "school"))
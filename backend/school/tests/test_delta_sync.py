@@ -0,0 +1,203 @@
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.generics import GenericAPIView
+from rest_framework.test import APIClient
+
+from school.enums import CourseType, VehicleCategory
+from school.models import (
+    Course,
+    Enrollment,
+    Instructor,
+    Lesson,
+    Resource,
+    ScheduledClass,
+    Student,
+    Tombstone,
+)
+from school.pagination import ChangesPagination, StandardResultsSetPagination
+from school.sync import prune_tombstones
+
+
+# The test settings paginate with DRF's PageNumberPagination
+@patch.object(GenericAPIView, "pagination_class", StandardResultsSetPagination)
+@override_settings(SYNC_LAG_SECONDS=0)
+class DeltaSyncTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        course = Course.objects.create(
+            name="Driving B",
+            category=VehicleCategory.B.value,
+            type=CourseType.PRACTICE.value,
+            description="Practice",
+            price=1000,
+            required_lessons=10,
+        )
+        self.instructor = Instructor.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            phone_number="+37369123456",
+            hire_date=date.today(),
+            license_categories="B",
+        )
+        self.student = Student.objects.create(
+            first_name="Jane",
+            last_name="Smith",
+            email="jane@example.com",
+            phone_number="+37360111223",
+            date_of_birth="1990-01-01",
+        )
+        self.enrollment = Enrollment.objects.create(
+            student=self.student, course=course, type="PRACTICE"
+        )
+        start = datetime(2030, 1, 7, 8, 0, tzinfo=dt_timezone.utc)
+        self.lessons = [
+            Lesson.objects.create(
+                enrollment=self.enrollment,
+                instructor=self.instructor,
+                scheduled_time=start + timedelta(hours=2 * i),
+            )
+            for i in range(3)
+        ]
+
+    def _sync(self, path, since="", **params):
+        response = self.client.get(path, {"since": since, **params})
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_full_sync_then_only_changes_and_deletes(self):
+        first = self._sync("/api/lessons/")
+        self.assertEqual(
+            [row["id"] for row in first["results"]], [lesson.id for lesson in self.lessons]
+        )
+        self.assertEqual(first["deleted"], [])
+        self.assertFalse(first["has_more"])
+        self.assertIsNone(first["next"])
+
+        self.assertEqual(self._sync("/api/lessons/", first["next_cursor"])["results"], [])
+
+        changed, removed, _ = self.lessons
+        removed_id = removed.id
+        changed.notes = "Bring glasses"
+        changed.save()
+        with self.captureOnCommitCallbacks(execute=True):  # tombstones are written on commit
+            removed.delete()
+
+        second = self._sync("/api/lessons/", first["next_cursor"])
+        self.assertEqual([row["id"] for row in second["results"]], [changed.id])
+        self.assertEqual(second["results"][0]["notes"], "Bring glasses")
+        self.assertEqual(second["deleted"], [removed_id])
+
+        third = self._sync("/api/lessons/", second["next_cursor"])
+        self.assertEqual((third["results"], third["deleted"]), ([], []))
+
+    def test_pages_through_a_window_and_keeps_filters(self):
+        cursor = self._sync("/api/lessons/")["next_cursor"]
+        self.client.post(
+            "/api/lessons/transition/",
+            {"status": "CANCELED", "ids": [lesson.id for lesson in self.lessons]},
+            format="json",
+        )
+
+        seen, pages = [], 0
+        while True:
+            page = self._sync("/api/lessons/", cursor, page_size=2)
+            seen += [row["id"] for row in page["results"]]
+            cursor, pages = page["next_cursor"], pages + 1
+            if not page["has_more"]:
+                break
+        self.assertEqual(sorted(seen), sorted(lesson.id for lesson in self.lessons))
+        self.assertEqual(pages, 2)
+
+        other = self._sync("/api/lessons/", "", instructor_id=self.instructor.id + 1)
+        self.assertEqual(other["results"], [])
+
+    @override_settings(SYNC_TOMBSTONE_DAYS=30)
+    def test_full_sync_pages_over_rows_older_than_the_tombstone_window(self):
+        Lesson.objects.update(updated_at=timezone.now() - timedelta(days=40))
+
+        cursor, seen = "", []
+        while True:
+            page = self._sync("/api/lessons/", cursor, page_size=2)
+            seen += [row["id"] for row in page["results"]]
+            cursor = page["next_cursor"]
+            if not page["has_more"]:
+                break
+        self.assertEqual(seen, [lesson.id for lesson in self.lessons])
+        self.assertEqual(self._sync("/api/lessons/", cursor)["results"], [])
+
+    def test_roster_and_cascade_changes_are_tracked(self):
+        theory = Course.objects.create(
+            name="Theory B",
+            category=VehicleCategory.B.value,
+            type=CourseType.THEORY.value,
+            description="Theory",
+            price=1000,
+            required_lessons=10,
+        )
+        room = Resource.objects.create(
+            name="Room 1", max_capacity=20, category=VehicleCategory.B.value
+        )
+        cls = ScheduledClass.objects.create(
+            course=theory,
+            instructor=self.instructor,
+            resource=room,
+            name="Monday Theory",
+            scheduled_time=datetime(2030, 1, 7, 18, 0, tzinfo=dt_timezone.utc),
+            max_students=5,
+        )
+        Lesson.objects.filter(pk=self.lessons[0].pk).update(resource=room)
+        classes_cursor = self._sync("/api/scheduled-classes/")["next_cursor"]
+        lessons_cursor = self._sync("/api/lessons/")["next_cursor"]
+
+        self.student.scheduled_classes.add(cls)
+        classes = self._sync("/api/scheduled-classes/", classes_cursor)
+        self.assertEqual([row["id"] for row in classes["results"]], [cls.id])
+
+        class_id = cls.id
+        with self.captureOnCommitCallbacks(execute=True):
+            room.delete()
+        lessons = self._sync("/api/lessons/", lessons_cursor)
+        self.assertEqual([row["id"] for row in lessons["results"]], [self.lessons[0].id])
+        self.assertEqual(
+            self._sync("/api/scheduled-classes/", classes_cursor)["deleted"], [class_id]
+        )
+
+    def test_a_transaction_writes_its_tombstones_at_once(self):
+        with (
+            CaptureQueriesContext(connection) as ctx,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            Lesson.objects.filter(pk__in=[lesson.pk for lesson in self.lessons]).delete()
+            self.assertFalse(Tombstone.objects.exists())
+        inserts = [
+            q for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "school_tombstone"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(
+            sorted(Tombstone.objects.values_list("object_id", flat=True)),
+            sorted(lesson.pk for lesson in self.lessons),
+        )
+
+    def test_cursor_errors(self):
+        self.assertEqual(
+            self.client.get("/api/lessons/", {"since": "not-a-cursor"}).status_code, 404
+        )
+        self.assertEqual(self.client.get("/api/addresses/", {"since": ""}).status_code, 400)
+
+        expired = timezone.now() - timedelta(days=31)
+        stale = ChangesPagination().encode_position([expired, 0], expired)
+        response = self.client.get("/api/lessons/", {"since": stale})
+        self.assertEqual(response.status_code, 410)
+
+        Tombstone.objects.create(model="school.lesson", object_id=1)
+        Tombstone.objects.filter(object_id=1).update(deleted_at=timezone.now() - timedelta(days=31))
+        Tombstone.objects.create(model="school.lesson", object_id=2)
+        self.assertEqual(prune_tombstones(), 1)
+        self.assertEqual(list(Tombstone.objects.values_list("object_id", flat=True)), [2])
@@ -0,0 +1,169 @@
+import json
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from school.enums import CourseType, LessonStatus, VehicleCategory
+from school.fast_serializers import MAX_PLANS, ValuesSerializer
+from school.models import (
+    Course,
+    Enrollment,
+    Instructor,
+    Lesson,
+    Resource,
+    ScheduledClass,
+    ScheduledClassPattern,
+    Student,
+)
+from school.serializers import (
+    EnrollmentSerializer,
+    LessonSerializer,
+    ScheduledClassPatternSerializer,
+    ScheduledClassSerializer,
+)
+from school.views.base import prune_fields
+
+
+class FastListSerializerParityTests(TestCase):
+    def setUp(self):
+        self.theory = Course.objects.create(
+            name="Theory B",
+            category=VehicleCategory.B.value,
+            type=CourseType.THEORY.value,
+            description="Theory",
+            price="1000.50",
+            required_lessons=10,
+        )
+        self.practice = Course.objects.create(
+            name="Practice B",
+            category=VehicleCategory.B.value,
+            type=CourseType.PRACTICE.value,
+            description="Practice",
+            price=2500,
+            required_lessons=20,
+        )
+        self.instructor = Instructor.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            phone_number="+37369123456",
+            hire_date=date(2020, 5, 1),
+            license_categories="B",
+        )
+        self.room = Resource.objects.create(name="Room 1", max_capacity=20)
+        self.car = Resource.objects.create(
+            name="Car 1", max_capacity=2, license_plate="ABC123", make="VW", model="Golf", year=2020
+        )
+        self.students = [
+            Student.objects.create(
+                first_name=f"Student{i}",
+                last_name="Test",
+                email=f"s{i}@example.com",
+                phone_number=f"+3736011122{i}",
+                date_of_birth="2000-01-01",
+            )
+            for i in range(3)
+        ]
+        practice_enrollment = Enrollment.objects.create(
+            student=self.students[0], course=self.practice
+        )
+        for student in self.students:
+            Enrollment.objects.create(student=student, course=self.theory)
+
+        start = datetime(2030, 1, 7, 9, 0, tzinfo=dt_timezone.utc)
+        Lesson.objects.create(
+            enrollment=practice_enrollment,
+            instructor=self.instructor,
+            resource=self.car,
+            scheduled_time=start,
+            notes="First drive",
+        )
+        Lesson.objects.create(
+            enrollment=practice_enrollment,
+            instructor=self.instructor,
+            scheduled_time=start + timedelta(days=1, minutes=30),
+            duration_minutes=90,
+            status=LessonStatus.COMPLETED.value,
+        )
+
+        pattern = ScheduledClassPattern.objects.create(
+            name="Mon theory",
+            course=self.theory,
+            instructor=self.instructor,
+            resource=self.room,
+            recurrence_days=["MONDAY"],
+            times=["18:00"],
+            start_date=date(2030, 1, 7),
+            num_lessons=4,
+        )
+        pattern.students.set([self.students[2], self.students[0]])
+        with_pattern = ScheduledClass.objects.create(
+            pattern=pattern,
+            name="Mon theory #1",
+            course=self.theory,
+            instructor=self.instructor,
+            resource=self.room,
+            scheduled_time=start + timedelta(hours=9),
+            max_students=10,
+        )
+        with_pattern.students.set(self.students)
+        ScheduledClass.objects.create(
+            name="Standalone",
+            course=self.theory,
+            instructor=self.instructor,
+            resource=self.room,
+            scheduled_time=start + timedelta(days=2),
+            max_students=1,
+        )
+
+    def assertParity(self, serializer_class, queryset):
+        expected = serializer_class(queryset, many=True).data
+        fast = ValuesSerializer(serializer_class)
+        actual = fast.serialize(fast.values(queryset))
+        # Compare the JSON text so key order and value types must match too
+        self.assertEqual(json.dumps(actual), json.dumps(expected))
+
+    def test_lesson_parity(self):
+        self.assertParity(LessonSerializer, Lesson.objects.all())
+
+    def test_enrollment_parity(self):
+        self.assertParity(EnrollmentSerializer, Enrollment.objects.order_by("id"))
+
+    def test_scheduled_class_parity(self):
+        self.assertParity(
+            ScheduledClassSerializer, ScheduledClass.objects.order_by("scheduled_time")
+        )
+
+    def test_pattern_parity(self):
+        self.assertParity(ScheduledClassPatternSerializer, ScheduledClassPattern.objects.all())
+
+    def test_pruned_plans_are_bounded(self):
+        fast = ValuesSerializer(LessonSerializer)
+        names = list(LessonSerializer().fields)
+        full = fast._plan()
+        for count in range(1, len(names)):
+            for start in range(len(names) - count + 1):
+                fast._plan(prune_fields(LessonSerializer(), names[start : start + count]))
+                fast._plan()  # the unpruned plan stays in use
+        self.assertLessEqual(len(fast._plans), MAX_PLANS)
+        self.assertIs(fast._plan(), full)
+
+    # No planner-estimate query on PostgreSQL
+    @override_settings(PAGINATION_APPROX_COUNT_THRESHOLD=0)
+    def test_list_endpoint_uses_fast_path(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser("admin", "admin@example.com", "pw"))
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get("/api/scheduled-classes/")
+        self.assertEqual(response.status_code, 200)
+        expected = ScheduledClassSerializer(
+            ScheduledClass.objects.order_by("scheduled_time"), many=True
+        ).data
+        self.assertEqual(json.dumps(response.data["results"]), json.dumps(expected))
+        # count + page + (through + student rows) for class and pattern students
+        self.assertLessEqual(len(ctx.captured_queries), 6)
@@ -0,0 +1,223 @@
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from school.enums import CourseType, VehicleCategory
+from school.horizon import extend_pattern, extend_patterns, virtual_classes
+from school.models import (
+    Course,
+    Instructor,
+    Resource,
+    ScheduledClass,
+    ScheduledClassPattern,
+    Student,
+)
+from school.series import SeriesChange, apply_series_change
+
+
+@override_settings(PATTERN_HORIZON_WEEKS=2)
+class RollingHorizonTests(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(
+            name="Theory B",
+            category=VehicleCategory.B.value,
+            type=CourseType.THEORY.value,
+            description="Theory",
+            price=1000,
+            required_lessons=10,
+        )
+        self.instructor = Instructor.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            phone_number="+37369123456",
+            hire_date=date.today(),
+            license_categories="B",
+        )
+        self.room = Resource.objects.create(
+            name="Room 1", max_capacity=20, category=VehicleCategory.B.value, is_available=True
+        )
+        self.pattern = ScheduledClassPattern.objects.create(
+            name="Mondays",
+            course=self.course,
+            instructor=self.instructor,
+            resource=self.room,
+            recurrence_days=["MONDAY"],
+            times=["10:00"],
+            start_date=date(2030, 1, 7),
+            num_lessons=1,
+            open_ended=True,
+        )
+        self.student = Student.objects.create(
+            first_name="Jane",
+            last_name="Smith",
+            email="jane@example.com",
+            phone_number="+37360111223",
+            date_of_birth="1990-01-01",
+        )
+        self.pattern.students.add(self.student)
+
+    def _days(self):
+        return [
+            cls.scheduled_time.date() for cls in ScheduledClass.objects.order_by("scheduled_time")
+        ]
+
+    def test_extends_incrementally_up_to_the_horizon(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            created = extend_pattern(self.pattern, today=date(2030, 1, 1))
+        self.assertEqual(len(created), 2)  # num_lessons does not cap open-ended patterns
+        self.assertEqual(self._days(), [date(2030, 1, 7), date(2030, 1, 14)])
+        self.pattern.refresh_from_db()
+        self.assertEqual(self.pattern.materialized_until, date(2030, 1, 15))
+        self.assertEqual(list(created[0].students.all()), [self.student])
+
+        self.assertEqual(extend_patterns(today=date(2030, 1, 1)), {})
+        self.assertEqual(extend_patterns(today=date(2030, 1, 8)), {self.pattern.pk: 1})
+        self.assertEqual(self._days()[-1], date(2030, 1, 21))
+
+    def test_skips_occurrences_booked_meanwhile_and_stops_at_end_date(self):
+        ScheduledClass.objects.create(
+            course=self.course,
+            instructor=self.instructor,
+            resource=self.room,
+            name="Workshop",
+            scheduled_time=datetime(2030, 1, 14, 10, 30, tzinfo=dt_timezone.utc),
+            max_students=5,
+        )
+        ScheduledClassPattern.objects.filter(pk=self.pattern.pk).update(end_date=date(2030, 1, 21))
+        self.pattern.refresh_from_db()
+
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("extend_patterns", "--today", "2030-02-01", stdout=out)
+
+        self.assertIn("created 2 classes", out.getvalue())
+        self.assertEqual(
+            list(self.pattern.scheduled_classes.values_list("scheduled_time__day", flat=True)),
+            [7, 21],
+        )
+        self.pattern.refresh_from_db()
+        self.assertEqual(self.pattern.materialized_until, date(2030, 1, 21))
+
+    def test_continues_after_the_last_class_in_business_time(self):
+        # Monday 00:30 in Chisinau, still Sunday in UTC
+        ScheduledClass.objects.create(
+            pattern=self.pattern,
+            course=self.course,
+            instructor=self.instructor,
+            resource=self.room,
+            name="Mondays",
+            scheduled_time=datetime(2030, 1, 13, 22, 30, tzinfo=dt_timezone.utc),
+            max_students=5,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            created = extend_pattern(self.pattern, today=date(2030, 1, 8))
+        self.assertEqual([cls.scheduled_time.date() for cls in created], [date(2030, 1, 21)])
+
+    def test_checks_conflicts_of_times_listed_out_of_order(self):
+        ScheduledClassPattern.objects.filter(pk=self.pattern.pk).update(times=["18:00", "08:00"])
+        self.pattern.refresh_from_db()
+        first_day = self.pattern.generate_scheduled_classes(
+            start=date(2030, 1, 7), until=date(2030, 1, 7)
+        )
+        morning = min(cls.scheduled_time for cls in first_day)
+        ScheduledClass.objects.create(
+            course=self.course,
+            instructor=self.instructor,
+            resource=self.room,
+            name="Workshop",
+            scheduled_time=morning + timedelta(minutes=30),
+            max_students=5,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            created = extend_pattern(self.pattern, today=date(2030, 1, 1))
+        self.assertEqual(len(created), 3)
+        self.assertNotIn(morning, [cls.scheduled_time for cls in created])
+
+    def test_series_changes_stay_within_the_materialized_classes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            extend_pattern(self.pattern, today=date(2030, 1, 1))
+        other_room = Resource.objects.create(
+            name="Room 2", max_capacity=20, category=VehicleCategory.B.value, is_available=True
+        )
+        client = APIClient()
+        client.force_authenticate(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+        url = f"/api/scheduled-class-patterns/{self.pattern.pk}/series/"
+
+        # Moving "from now on" would only move the rows up to materialized_until
+        response = client.post(
+            url, {"from_date": "2030-01-14", "resource_id": other_room.pk}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        # Nested under "errors" by the project's exception handler, top level otherwise
+        errors = response.data.get("errors", response.data)
+        self.assertIn("2030-01-15", str(errors["until_date"]))
+        response = client.post(
+            url,
+            {"from_date": "2030-01-14", "until_date": "2030-01-15", "resource_id": other_room.pk},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+
+        # An open cancel ends the pattern, so the horizon creates nothing after it
+        with self.captureOnCommitCallbacks(execute=True):
+            ids = apply_series_change(
+                self.pattern, SeriesChange(from_date=date(2030, 1, 14), cancel=True)
+            )
+        self.assertEqual(len(ids), 1)
+        self.pattern.refresh_from_db()
+        self.assertEqual(self.pattern.end_date, date(2030, 1, 13))
+        self.assertEqual(extend_patterns(today=date(2030, 2, 1)), {})
+        self.assertEqual(self._days(), [date(2030, 1, 7), date(2030, 1, 14)])
+        start = datetime(2030, 1, 14, tzinfo=dt_timezone.utc)
+        patterns = ScheduledClassPattern.objects.all()
+        self.assertEqual(virtual_classes(patterns, start, start + timedelta(weeks=4)), [])
+
+    def test_calendar_adds_virtual_occurrences(self):
+        extend_pattern(self.pattern, today=date(2030, 1, 1))
+        client = APIClient()
+        client.force_authenticate(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+
+        response = client.get(
+            "/api/scheduled-classes/calendar/",
+            {"start": "2030-01-10T00:00:00Z", "end": "2030-02-01T00:00:00Z"},
+        )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            [(row["scheduled_time"].day, row["virtual"]) for row in response.data],
+            [(14, False), (21, True), (28, True)],
+        )
+        self.assertIsNone(response.data[1]["id"])
+        self.assertEqual(response.data[1]["pattern_id"], self.pattern.pk)
+        self.assertEqual(ScheduledClass.objects.count(), 2)
+
+        other_course = Course.objects.create(
+            name="Theory C",
+            category=VehicleCategory.C.value,
+            type=CourseType.THEORY.value,
+            description="Theory",
+            price=1000,
+            required_lessons=10,
+        )
+        other = client.get(
+            "/api/scheduled-classes/calendar/",
+            {
+                "start": "2030-01-10T00:00:00Z",
+                "end": "2030-02-01T00:00:00Z",
+                "pattern__course": other_course.id,
+            },
+        )
+        self.assertEqual(other.status_code, 200)
+        self.assertEqual(other.data, [])
@@ -0,0 +1,98 @@
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from school import config_cache, images
+from school.models import SchoolConfig
+from school.validators import validate_image_file
+
+
+def png_bytes(size, mode="RGBA"):
+    buffer = io.BytesIO()
+    Image.new(mode, size, (200, 30, 30, 128) if mode == "RGBA" else 1).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class ImageVariantTests(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media)
+        override.enable()
+        self.addCleanup(override.disable)
+        cache.clear()
+        config_cache._local.clear()
+        self.config = SchoolConfig.objects.create(pk=1)
+        self.client = APIClient()
+
+    def test_header_check_rejects_huge_images(self):
+        huge = SimpleUploadedFile(
+            "huge.png", png_bytes((10_000, 6_000), mode="1"), content_type="image/png"
+        )
+        with self.assertRaisesMessage(ValueError, "too large"):
+            validate_image_file(huge)
+        fake = SimpleUploadedFile("fake.png", b"not an image", content_type="image/png")
+        with self.assertRaisesMessage(ValueError, "Invalid or corrupted"):
+            validate_image_file(fake)
+
+    def test_variants_are_built_and_exposed_as_srcset(self):
+        self.config.school_logo.save("logo.png", ContentFile(png_bytes((800, 400))))
+        images.generate_variants(self.config.pk, "school_logo", self.config.school_logo.name)
+
+        variants = SchoolConfig.objects.get(pk=1).school_logo_variants
+        self.assertEqual(variants["source"], self.config.school_logo.name)
+        self.assertEqual(sorted(variants["files"]["image/jpeg"]), ["128", "256", "512"])
+        webp_256 = variants["files"]["image/webp"]["256"]
+        self.assertRegex(webp_256, r"^logos/logo\.256w\.[0-9a-f]{12}\.webp$")
+
+        srcset = self.client.get("/api/school/config/").json()["school_logo_srcset"]
+        self.assertIn("image/webp", srcset)
+        self.assertTrue(srcset["image/jpeg"].endswith(" 512w"))
+        self.assertEqual(self.client.get("/api/school/config/").json()["landing_image_srcset"], {})
+
+    def test_exif_rotated_photo_is_sized_upright(self):
+        # stored landscape, displayed portrait (orientation 6: rotate 90 degrees clockwise)
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        buffer = io.BytesIO()
+        Image.new("RGB", (2400, 1200), (10, 120, 200)).save(buffer, "JPEG", exif=exif)
+        name = default_storage.save("landing/photo.jpg", ContentFile(buffer.getvalue()))
+
+        variants = images.build_variants(name, (640, 1280, 1920))
+
+        self.assertEqual((variants["width"], variants["height"]), (1200, 2400))
+        self.assertEqual(sorted(variants["files"]["image/jpeg"]), ["1200", "640"])
+        with (
+            default_storage.open(variants["files"]["image/jpeg"]["640"]) as file,
+            Image.open(file) as variant,
+        ):
+            self.assertEqual(variant.size, (640, 1280))
+
+    def test_upload_schedules_variants_after_commit(self):
+        upload = SimpleUploadedFile("logo.png", png_bytes((300, 300)), content_type="image/png")
+        with mock.patch.object(images, "_executor") as executor:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                response = self.client.post(
+                    "/api/school/config/upload_logo/", {"logo": upload}, format="multipart"
+                )
+            self.assertEqual(response.status_code, 200)
+            executor.submit.assert_not_called()
+            for callback in callbacks:
+                callback()
+        name = SchoolConfig.objects.get(pk=1).school_logo.name
+        executor.submit.assert_called_once_with(images._generate_in_worker, 1, "school_logo", name)
+
+        bad = SimpleUploadedFile("logo.png", b"not an image", content_type="image/png")
+        response = self.client.post(
+            "/api/school/config/upload_logo/", {"logo": bad}, format="multipart"
+        )
+        self.assertEqual(response.status_code, 400)
@@ -1,3 +1,6 @@
+from unittest import skipUnless
+
+from django.db import connection
 from django.test import TestCase
 from rest_framework.test import APIClient
 
@@ -49,3 +52,36 @@ class InstructorValidationTests(TestCase):
         r = self.client.post(self.url, bad, format="json")
         self.assertEqual(r.status_code, 400)
         self.assertIn("phone_number", r.json()['errors'])
+
+    def test_license_mask_filter(self):
+        self.client.post(self.url, self.payload, format="json")
+        self.client.post(
+            self.url,
+            {
+                **self.payload,
+                "email": "truck@example.com",
+                "phone_number": "+37360111223",
+                "license_categories": "C,CE",
+            },
+            format="json",
+        )
+        instructor = Instructor.objects.get(email="instructor@example.com")
+        instructor.license_categories = "b, c1"
+        instructor.save(update_fields=["license_categories"])
+
+        self.assertEqual(
+            list(Instructor.objects.licensed_for("C").values_list("email", flat=True)),
+            ["truck@example.com"],
+        )
+        self.assertEqual(Instructor.objects.licensed_for("b", "C1").get(), instructor)
+        self.assertFalse(Instructor.objects.licensed_for("BE").exists())
+        self.assertFalse(Instructor.objects.licensed_for("X").exists())
+        r = self.client.get(self.url, {"category": "C1"})
+        self.assertEqual([row["email"] for row in r.json()["results"]], ["instructor@example.com"])
+
+    @skipUnless(connection.vendor == "postgresql", "reads a PostgreSQL query plan")
+    def test_license_filter_uses_the_category_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = Instructor.objects.licensed_for("C").explain()
+        self.assertIn("instructor_license_c_idx", plan)
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.core.paginator import EmptyPage
+from django.test import TestCase, override_settings
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from school.models import ScheduledClass
+from school.pagination import ApproximateCountPaginator, StandardResultsSetPagination
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.view = SimpleNamespace(cursor_ordering=("scheduled_time", "id"))
+        base = datetime(2030, 1, 1, 9, 0, tzinfo=dt_timezone.utc)
+        # Two classes share each start time to exercise the id tie-breaker
+        for i in range(7):
+            ScheduledClass.objects.create(
+                name=f"Class {i}", scheduled_time=base + timedelta(hours=i // 2), max_students=5
+            )
+
+    def _page(self, **params):
+        paginator = StandardResultsSetPagination()
+        request = Request(self.factory.get("/api/scheduled-classes/", params))
+        page = paginator.paginate_queryset(ScheduledClass.objects.all(), request, self.view)
+        return paginator, page
+
+    def test_walks_all_rows_in_keyset_order_without_count(self):
+        seen = []
+        paginator, page = self._page(pagination="cursor", page_size=3)
+        while True:
+            seen.extend(obj.id for obj in page)
+            body = paginator.get_paginated_response([]).data
+            self.assertNotIn("count", body)
+            if not body["next_cursor"]:
+                break
+            paginator, page = self._page(cursor=body["next_cursor"], page_size=3)
+
+        expected = list(
+            ScheduledClass.objects.order_by("scheduled_time", "id").values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_page_numbers_remain_the_default(self):
+        paginator, page = self._page(page=1, page_size=3)
+        self.assertIsNone(paginator.keyset)
+        self.assertEqual(paginator.get_paginated_response([]).data["count"], 7)
+
+    def test_invalid_cursor_is_rejected(self):
+        with self.assertRaises(NotFound):
+            self._page(cursor="not-a-cursor")
+
+
+@override_settings(PAGINATION_APPROX_COUNT_THRESHOLD=1000)
+class ApproximateCountTests(TestCase):
+    def setUp(self):
+        start = datetime(2030, 1, 1, 9, 0, tzinfo=dt_timezone.utc)
+        for i in range(3):
+            ScheduledClass.objects.create(name=f"Class {i}", scheduled_time=start, max_students=5)
+
+    def test_sqlite_counts_exactly(self):
+        paginator = ApproximateCountPaginator(ScheduledClass.objects.all(), 2)
+        self.assertEqual(paginator.count, 3)
+        self.assertFalse(paginator.count_is_approximate)
+
+    def test_large_estimate_replaces_exact_count(self):
+        paginator = ApproximateCountPaginator(ScheduledClass.objects.all(), 2)
+        with patch.object(ApproximateCountPaginator, "estimated_count", return_value=250000):
+            self.assertEqual(paginator.count, 250000)
+        self.assertTrue(paginator.count_is_approximate)
+
+    def test_small_estimate_keeps_exact_count(self):
+        paginator = ApproximateCountPaginator(ScheduledClass.objects.filter(name="Class 1"), 2)
+        with patch.object(ApproximateCountPaginator, "estimated_count", return_value=4):
+            self.assertEqual(paginator.count, 1)
+        self.assertFalse(paginator.count_is_approximate)
+
+    def test_underestimate_keeps_real_pages(self):
+        paginator = ApproximateCountPaginator(ScheduledClass.objects.order_by("id"), 2)
+        with patch.object(ApproximateCountPaginator, "estimated_count", return_value=1):
+            with override_settings(PAGINATION_APPROX_COUNT_THRESHOLD=1):
+                self.assertEqual(paginator.count, 1)  # Below the real 3 rows
+        last = paginator.page(2)
+        self.assertEqual(len(last.object_list), 1)
+        self.assertFalse(last.has_next())
+        self.assertTrue(paginator.page(1).has_next())
+        with self.assertRaises(EmptyPage):
+            paginator.page(3)
@@ -1,4 +1,6 @@
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from school.models import ScheduledClassPattern, ScheduledClass, Student, Course, Instructor, Resource
 from datetime import date, timedelta
 from django.core.exceptions import ValidationError
@@ -244,9 +246,10 @@ class ScheduledClassPatternViewSetTestCase(APITestCase):
         self.assertIn('generated_count', response.data)
         self.assertIn('enrollment_results', response.data)
         
-        # Should have deleted and recreated the same number
-        self.assertEqual(response.data['deleted_count'], 4)
+        # Nothing changed: the existing classes are kept as they are
+        self.assertEqual(response.data['deleted_count'], 0)
         self.assertEqual(response.data['generated_count'], 4)
+        self.assertEqual(response.data['unchanged_count'], 4)
         # Auto-enrollment removed
         self.assertEqual(response.data['enrollment_results']['enrolled'], 0)
         
@@ -282,7 +285,36 @@ class ScheduledClassPatternViewSetTestCase(APITestCase):
         self.assertEqual(response.data['pattern_name'], self.pattern.name)
         self.assertEqual(response.data['total_classes'], 4)
         self.assertEqual(response.data['scheduled_classes'], 4)
-        self.assertEqual(response.data['total_enrolled_students'], 2)  # 2 students in pattern
+        # Real per-class enrollments: 2 pattern students auto-enrolled in each of 4 classes
+        self.assertEqual(response.data['total_enrolled_students'], 8)
+        self.assertEqual(response.data['average_students_per_class'], 2)
+
+    # No planner-estimate query on PostgreSQL
+    @override_settings(PAGINATION_APPROX_COUNT_THRESHOLD=0)
+    def test_bulk_statistics_action(self):
+        """List-level statistics cover every pattern in a single grouped query."""
+        self.client.force_authenticate(user=self.admin_user)
+        self.client.post(f'/api/scheduled-class-patterns/{self.pattern.id}/generate-classes/')
+        idle = ScheduledClassPattern.objects.create(
+            name='Idle Pattern',
+            course=self.course,
+            instructor=self.instructor,
+            resource=self.resource,
+            recurrence_days=['FRIDAY'],
+            times=['10:00'],
+            start_date=date.today(),
+            num_lessons=1,
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/scheduled-class-patterns/statistics/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = {row['pattern_id']: row for row in response.data['results']}
+        self.assertEqual(stats[self.pattern.id]['total_classes'], 4)
+        self.assertEqual(stats[self.pattern.id]['total_enrolled_students'], 8)
+        self.assertEqual(stats[idle.id]['total_classes'], 0)
+        # count + page of patterns + one statistics query
+        self.assertEqual(len(ctx.captured_queries), 3)
 
     def test_permissions_create_requires_admin(self):
         """Test that creating patterns requires admin permissions."""
@@ -554,7 +586,7 @@ class ScheduledClassPatternViewSetTestCase(APITestCase):
         regenerate_url = f'/api/scheduled-class-patterns/{pattern_id}/regenerate-classes/'
         response = self.client.post(regenerate_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['deleted_count'], 3)
+        self.assertEqual(response.data['deleted_count'], 0)
         self.assertEqual(response.data['generated_count'], 3)
 
         # Count should still be 3
@@ -0,0 +1,169 @@
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from school.enums import CourseType, DayOfWeek, LessonStatus, VehicleCategory
+from school.models import (
+    Course,
+    Instructor,
+    InstructorAvailability,
+    Resource,
+    ScheduledClass,
+    ScheduledClassPattern,
+)
+from school.preview import preview_pattern
+
+
+class PatternPreviewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+        self.course = Course.objects.create(
+            name="Theory B",
+            category=VehicleCategory.B.value,
+            type=CourseType.THEORY.value,
+            description="Theory",
+            price=1000,
+            required_lessons=10,
+        )
+        self.instructor, self.other_instructor = [
+            Instructor.objects.create(
+                first_name="John",
+                last_name=name,
+                email=f"{name}@example.com",
+                phone_number=phone,
+                hire_date=date.today(),
+                license_categories="B",
+            )
+            for name, phone in (("doe", "+37369123456"), ("roe", "+37369123457"))
+        ]
+        InstructorAvailability.objects.create(
+            instructor=self.instructor,
+            day=DayOfWeek.MONDAY.value,
+            hours=[f"{hour:02d}:00" for hour in range(8, 19)],
+        )
+        self.room = Resource.objects.create(
+            name="Room 1", max_capacity=20, category=VehicleCategory.B.value, is_available=True
+        )
+        self.data = {
+            "course_id": self.course.id,
+            "instructor_id": self.instructor.id,
+            "resource_id": self.room.id,
+            "recurrence_days": ["MONDAY", "WEDNESDAY"],
+            "times": ["10:00"],
+            "start_date": "2030-01-07",
+            "num_lessons": 4,
+            "default_duration_minutes": 60,
+            "default_max_students": 10,
+        }
+
+    def _class(self, instructor, hour, day=14, pattern=None):
+        return ScheduledClass.objects.create(
+            pattern=pattern,
+            course=self.course,
+            instructor=instructor,
+            resource=self.room,
+            name="Existing",
+            scheduled_time=datetime(2030, 1, day, hour, 30, tzinfo=dt_timezone.utc),
+            max_students=10,
+        )
+
+    def test_reports_every_slot_without_writing(self):
+        self._class(self.instructor, 9, day=14)
+        self._class(self.other_instructor, 10, day=7)
+
+        response = self.client.post(
+            "/api/scheduled-class-patterns/preview/", self.data, format="json"
+        )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["count"], 4)
+        self.assertEqual(
+            [slot["issues"] for slot in response.data["slots"]],
+            [
+                ["resource_conflict"],
+                ["outside_availability"],
+                ["instructor_conflict", "resource_conflict"],
+                ["outside_availability"],
+            ],
+        )
+        self.assertEqual(
+            [slot["status"] for slot in response.data["slots"]][:3],
+            [
+                "resource_conflict",
+                "outside_availability",
+                "instructor_conflict",
+            ],
+        )
+        self.assertEqual(response.data["conflicts"], 4)
+        self.assertEqual(ScheduledClass.objects.count(), 2)
+        self.assertFalse(ScheduledClassPattern.objects.exists())
+
+    def test_editing_ignores_own_classes_and_is_cached(self):
+        pattern = ScheduledClassPattern.objects.create(
+            name="Mondays",
+            course=self.course,
+            instructor=self.instructor,
+            resource=self.room,
+            recurrence_days=["MONDAY"],
+            times=["10:00"],
+            start_date=date(2030, 1, 7),
+            num_lessons=2,
+        )
+        self._class(self.instructor, 10, day=7, pattern=pattern)
+        data = {
+            **self.data,
+            "pattern_id": pattern.id,
+            "recurrence_days": ["MONDAY"],
+            "num_lessons": 2,
+        }
+
+        response = self.client.post("/api/scheduled-class-patterns/preview/", data, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual([slot["status"] for slot in response.data["slots"]], ["ok", "ok"])
+
+        pattern.refresh_from_db()
+        with self.assertNumQueries(0):
+            self.assertEqual(preview_pattern(pattern)["conflicts"], 0)
+
+    def test_own_classes_regeneration_keeps_still_conflict(self):
+        pattern = ScheduledClassPattern.objects.create(
+            name="Mondays",
+            course=self.course,
+            instructor=self.instructor,
+            resource=self.room,
+            recurrence_days=["MONDAY"],
+            times=["10:00"],
+            start_date=date(2030, 1, 7),
+            num_lessons=2,
+        )
+        completed = self._class(self.instructor, 10, day=7, pattern=pattern)
+        ScheduledClass.objects.filter(pk=completed.pk).update(status=LessonStatus.COMPLETED.value)
+        data = {
+            **self.data,
+            "pattern_id": pattern.id,
+            "recurrence_days": ["MONDAY"],
+            "num_lessons": 2,
+        }
+
+        response = self.client.post("/api/scheduled-class-patterns/preview/", data, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            [slot["issues"] for slot in response.data["slots"]],
+            [["instructor_conflict", "resource_conflict"], []],
+        )
+
+    def test_rejects_invalid_fields(self):
+        response = self.client.post(
+            "/api/scheduled-class-patterns/preview/",
+            {**self.data, "times": ["25:00"]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
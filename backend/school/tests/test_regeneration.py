@@ -0,0 +1,221 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from school import ical
+from school.enums import CourseType, DayOfWeek, LessonStatus, VehicleCategory
+from school.models import (
+    Course,
+    Instructor,
+    InstructorAvailability,
+    Resource,
+    ScheduledClass,
+    ScheduledClassPattern,
+    Student,
+)
+from school.series import SeriesChange, apply_series_change
+
+
+class DiffRegenerationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+        course = Course.objects.create(
+            name="Theory B",
+            category=VehicleCategory.B.value,
+            type=CourseType.THEORY.value,
+            description="Theory",
+            price=1000,
+            required_lessons=10,
+        )
+        self.instructor = instructor = Instructor.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            phone_number="+37369123456",
+            hire_date=date.today(),
+            license_categories="B",
+        )
+        self.room = Resource.objects.create(
+            name="Room 1", max_capacity=20, category=VehicleCategory.B.value, is_available=True
+        )
+        self.pattern = ScheduledClassPattern.objects.create(
+            name="Mondays",
+            course=course,
+            instructor=instructor,
+            resource=self.room,
+            recurrence_days=["MONDAY"],
+            times=["10:00"],
+            start_date=date(2030, 1, 7),
+            num_lessons=3,
+            default_max_students=2,
+        )
+        self.students = [
+            Student.objects.create(
+                first_name="Student",
+                last_name=str(i),
+                email=f"s{i}@example.com",
+                phone_number=f"+3736011122{i}",
+                date_of_birth="1990-01-01",
+            )
+            for i in range(3)
+        ]
+        self.classes = ScheduledClass.objects.bulk_create(self.pattern.generate_scheduled_classes())
+        self.classes[0].students.add(self.students[2])
+
+    def _regenerate(self):
+        with (
+            patch(
+                "school.views.scheduled_views.ScheduledClassPatternViewSet._send_generation_notifications"
+            ) as notify,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            response = self.client.post(
+                f"/api/scheduled-class-patterns/{self.pattern.id}/regenerate-classes/"
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data, notify
+
+    def test_unchanged_pattern_is_a_no_op(self):
+        data, notify = self._regenerate()
+
+        self.assertEqual(
+            (
+                data["created_count"],
+                data["updated_count"],
+                data["deleted_count"],
+                data["unchanged_count"],
+            ),
+            (0, 0, 0, 3),
+        )
+        self.assertEqual(
+            set(ScheduledClass.objects.values_list("pk", flat=True)),
+            {cls.pk for cls in self.classes},
+        )
+        notify.assert_not_called()
+
+    def test_only_changes_are_written_and_notified(self):
+        ScheduledClass.objects.filter(pk=self.classes[1].pk).update(
+            status=LessonStatus.CANCELED.value
+        )
+        self.pattern.num_lessons = 4
+        self.pattern.default_max_students = 3
+        self.pattern.save()
+        self.pattern.students.add(self.students[0])
+
+        data, notify = self._regenerate()
+
+        self.assertEqual(
+            (
+                data["created_count"],
+                data["updated_count"],
+                data["deleted_count"],
+                data["unchanged_count"],
+            ),
+            (1, 2, 0, 1),
+        )
+        first = ScheduledClass.objects.get(pk=self.classes[0].pk)
+        self.assertEqual(first.max_students, 3)
+        # Manually enrolled student kept, pattern student added
+        self.assertEqual(set(first.students.all()), {self.students[0], self.students[2]})
+        # Canceled classes are neither reinstated nor enrolled into
+        canceled = ScheduledClass.objects.get(pk=self.classes[1].pk)
+        self.assertEqual(canceled.status, LessonStatus.CANCELED.value)
+        self.assertFalse(canceled.students.exists())
+        self.assertEqual(ScheduledClass.objects.count(), 4)
+
+        enrolled = notify.call_args.kwargs["enrolled"]
+        self.assertEqual(len(enrolled), 3)
+        self.assertTrue(all(student == self.students[0] for _cls, student in enrolled))
+        # The updated class's existing roster hears about the change
+        updated = notify.call_args.kwargs["updated"]
+        self.assertEqual(
+            [(cls.pk, student) for cls, student in updated], [(first.pk, self.students[2])]
+        )
+
+    def test_moved_time_replaces_only_stale_classes(self):
+        ScheduledClass.objects.filter(pk=self.classes[2].pk).update(
+            status=LessonStatus.COMPLETED.value
+        )
+        self.pattern.times = ["12:00"]
+        self.pattern.save()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/api/scheduled-class-patterns/{self.pattern.id}/regenerate-classes/"
+            )
+        data = response.data
+
+        self.assertEqual((data["created_count"], data["deleted_count"]), (3, 2))
+        # Completed classes are history and stay
+        self.assertTrue(ScheduledClass.objects.filter(pk=self.classes[2].pk).exists())
+        self.assertEqual(ScheduledClass.objects.filter(pattern=self.pattern).count(), 4)
+        # The deleted class's roster is told, read before the delete
+        removed = [
+            message for message in mail.outbox if message.subject.startswith("Class Removed")
+        ]
+        self.assertEqual([message.to for message in removed], [[self.students[2].email]])
+
+    def test_feed_versions_are_bumped_once_at_commit(self):
+        self.pattern.times = ["12:00"]
+        self.pattern.save()
+
+        with (
+            patch("school.ical.invalidate_feeds") as invalidate,
+            patch("school.ical.booking_participants") as per_row,
+        ):
+            self._regenerate()
+
+        # The deleted classes skip the per-row receivers; regeneration reports them
+        per_row.assert_not_called()
+        invalidate.assert_called_once_with(
+            frozenset({("instructor", self.instructor.pk), ("resource", self.room.pk)})
+            | {("student", self.students[2].pk)}
+        )
+
+    def test_series_changes_survive_regeneration(self):
+        InstructorAvailability.objects.create(
+            instructor=self.instructor,
+            day=DayOfWeek.MONDAY.value,
+            hours=[f"{hour:02d}:00" for hour in range(8, 19)],
+        )
+        other_room = Resource.objects.create(
+            name="Room 2", max_capacity=20, category=VehicleCategory.B.value, is_available=True
+        )
+        shifted, moved = self.classes[1], self.classes[2]
+        apply_series_change(
+            self.pattern,
+            SeriesChange(
+                from_date=date(2030, 1, 14), until_date=date(2030, 1, 14), shift_minutes=30
+            ),
+        )
+        apply_series_change(
+            self.pattern, SeriesChange(from_date=date(2030, 1, 21), resource=other_room)
+        )
+        self.pattern.default_max_students = 3
+        self.pattern.save()
+
+        data, _notify = self._regenerate()
+
+        self.assertEqual(
+            (
+                data["created_count"],
+                data["updated_count"],
+                data["deleted_count"],
+                data["unchanged_count"],
+            ),
+            (0, 1, 0, 2),
+        )
+        kept = {cls.pk: cls for cls in ScheduledClass.objects.all()}
+        self.assertEqual(set(kept), {cls.pk for cls in self.classes})
+        self.assertEqual(
+            kept[shifted.pk].scheduled_time, shifted.scheduled_time + timedelta(minutes=30)
+        )
+        self.assertEqual(kept[moved.pk].resource, other_room)
+        self.assertEqual(kept[self.classes[0].pk].max_students, 3)
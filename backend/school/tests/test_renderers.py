@@ -0,0 +1,44 @@
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO
+from zoneinfo import ZoneInfo
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from school.renderers import ORJSONParser, ORJSONRenderer
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_output_matches_drf_renderer(self):
+        payload = {
+            "price": Decimal("1000.50"),
+            "utc": datetime(2030, 1, 7, 9, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            "local": datetime(2030, 1, 7, 9, 30, tzinfo=ZoneInfo("Europe/Chisinau")),
+            "day": date(2030, 1, 7),
+            "label": gettext_lazy("Driving School Management"),
+            "text": "Lecție nouă\u2028",
+            "counts": {1: 2, "total": None},
+            "rows": [{"ok": True, "ratio": 0.5}, ("a", "b")],
+        }
+        self.assertEqual(ORJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+    def test_indent_falls_back_to_stdlib(self):
+        rendered = ORJSONRenderer().render({"a": 1}, "application/json; indent=2")
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+    def test_none_renders_empty_body(self):
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+
+class ORJSONParserTests(SimpleTestCase):
+    def test_parses_utf8_body(self):
+        body = '{"name": "Școala", "ids": [1, 2]}'.encode()
+        self.assertEqual(ORJSONParser().parse(BytesIO(body)), {"name": "Școala", "ids": [1, 2]})
+
+    def test_invalid_json_raises_parse_error(self):
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(BytesIO(b'{"a": NaN}'))
@@ -0,0 +1,167 @@
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from school import rollups, services
+from school.enums import CourseType, LessonStatus, RollupKind, VehicleCategory
+from school.models import Course, DailyRollup, Enrollment, Instructor, Lesson, Payment, Student
+
+
+class DailyRollupTests(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(
+            name="Driving B",
+            category=VehicleCategory.B.value,
+            type=CourseType.PRACTICE.value,
+            description="Practice",
+            price=1000,
+            required_lessons=10,
+        )
+        self.instructor = Instructor.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            phone_number="+37369123456",
+            hire_date=date.today(),
+            license_categories="B",
+        )
+        student = Student.objects.create(
+            first_name="Jane",
+            last_name="Smith",
+            email="jane@example.com",
+            phone_number="+37360111223",
+            date_of_birth="1990-01-01",
+        )
+        self.enrollment = Enrollment.objects.create(student=student, course=self.course)
+        self.start = datetime(2030, 1, 7, 10, 0, tzinfo=dt_timezone.utc)
+
+    def _lesson(self, when, status=LessonStatus.SCHEDULED.value, minutes=60):
+        return Lesson.objects.create(
+            enrollment=self.enrollment,
+            instructor=self.instructor,
+            scheduled_time=when,
+            duration_minutes=minutes,
+            status=status,
+        )
+
+    def _lesson_rollup(self, day):
+        return {
+            row.status: (row.count, row.minutes)
+            for row in DailyRollup.objects.filter(kind=RollupKind.LESSON.value, day=day)
+        }
+
+    def test_signals_keep_days_in_sync(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            lesson = self._lesson(self.start, minutes=90)
+            self._lesson(self.start + timedelta(hours=2), LessonStatus.COMPLETED.value)
+        self.assertEqual(
+            self._lesson_rollup(date(2030, 1, 7)),
+            {"SCHEDULED": (1, 90), "COMPLETED": (1, 60)},
+        )
+
+        # Moving a lesson to another day rebuilds both the old and the new day
+        with self.captureOnCommitCallbacks(execute=True):
+            lesson.scheduled_time = self.start + timedelta(days=1)
+            lesson.save()
+        self.assertEqual(self._lesson_rollup(date(2030, 1, 7)), {"COMPLETED": (1, 60)})
+        self.assertEqual(self._lesson_rollup(date(2030, 1, 8)), {"SCHEDULED": (1, 90)})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            lesson.delete()
+        self.assertEqual(self._lesson_rollup(date(2030, 1, 8)), {})
+
+    def test_a_transaction_rebuilds_each_day_once(self):
+        with (
+            mock.patch.object(rollups, "rebuild_rollups", wraps=rollups.rebuild_rollups) as rebuild,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            lessons = [self._lesson(self.start + timedelta(hours=hour)) for hour in range(3)]
+            lessons[0].delete()
+            lessons[1].status = LessonStatus.CANCELED.value
+            lessons[1].save()
+        rebuild.assert_called_once_with(
+            date(2030, 1, 7), date(2030, 1, 8), kinds=[RollupKind.LESSON]
+        )
+        self.assertEqual(
+            self._lesson_rollup(date(2030, 1, 7)), {"SCHEDULED": (1, 60), "CANCELED": (1, 60)}
+        )
+
+    def test_rollup_command_is_idempotent(self):
+        self._lesson(self.start)
+        self._lesson(self.start - timedelta(days=3), LessonStatus.CANCELED.value)
+        Payment.objects.create(
+            enrollment=self.enrollment, amount=100, payment_method="CASH", description="Fee"
+        )
+        for _ in range(2):
+            call_command("rollup", "--since", "2000-01-01", stdout=StringIO())
+        self.assertEqual(DailyRollup.objects.filter(kind=RollupKind.LESSON.value).count(), 2)
+        payment = DailyRollup.objects.get(kind=RollupKind.PAYMENT.value)
+        self.assertEqual((payment.count, payment.amount, payment.category), (1, 100, "B"))
+
+        # --since leaves earlier days untouched
+        call_command("rollup", "--since", "2030-01-07", stdout=StringIO())
+        self.assertEqual(self._lesson_rollup(date(2030, 1, 4)), {"CANCELED": (1, 60)})
+
+    def test_missing_only_rebuilds_days_without_rollups(self):
+        for offset in (0, 1, 3):
+            self._lesson(self.start + timedelta(days=offset))
+        call_command("rollup", stdout=StringIO())
+        DailyRollup.objects.filter(day__in=[date(2030, 1, 7), date(2030, 1, 8)]).delete()
+        kept = DailyRollup.objects.get(day=date(2030, 1, 10))
+
+        with mock.patch.object(
+            rollups, "rebuild_rollups", wraps=rollups.rebuild_rollups
+        ) as rebuild:
+            call_command("rollup", "--missing", stdout=StringIO())
+        rebuild.assert_called_once_with(
+            date(2030, 1, 7), date(2030, 1, 9), kinds=[RollupKind.LESSON]
+        )
+        self.assertEqual(self._lesson_rollup(date(2030, 1, 8)), {"SCHEDULED": (1, 60)})
+        self.assertTrue(DailyRollup.objects.filter(pk=kept.pk).exists())
+        self.assertEqual(rollups.rebuild_missing_rollups(), 0)
+
+    def test_rebuilds_take_advisory_locks_per_kind_and_day(self):
+        cursor = mock.MagicMock()
+        postgres = SimpleNamespace(vendor="postgresql", cursor=mock.MagicMock(return_value=cursor))
+        with mock.patch.object(rollups, "connections", {"default": postgres}):
+            rollups.rebuild_rollups(date(2030, 1, 7), date(2030, 1, 9), kinds=[RollupKind.LESSON])
+            calls = cursor.__enter__.return_value.execute.call_args_list
+            key = rollups._lock_key(RollupKind.LESSON)
+            self.assertEqual(
+                [call.args for call in calls],
+                [
+                    ("SELECT pg_advisory_xact_lock_shared(%s, %s)", [key, 0]),
+                    ("SELECT pg_advisory_xact_lock(%s, %s)", [key, date(2030, 1, 7).toordinal()]),
+                    ("SELECT pg_advisory_xact_lock(%s, %s)", [key, date(2030, 1, 8).toordinal()]),
+                ],
+            )
+
+        # Open ranges hold every kind exclusively, in one order whatever the caller passes
+        locks = rollups._locks([RollupKind.PAYMENT, RollupKind.LESSON], date(2030, 1, 7), None)
+        keys = [rollups._lock_key(kind) for kind in (RollupKind.LESSON, RollupKind.PAYMENT)]
+        self.assertEqual(locks, [(keys[0], 0, False), (keys[1], 0, False)])
+
+    def test_daily_trends_fill_missing_days(self):
+        self._lesson(self.start, LessonStatus.COMPLETED.value, minutes=45)
+        call_command("rollup", stdout=StringIO())
+        series = services.daily_trends(days=3, today=date(2030, 1, 8))
+        self.assertEqual(
+            [point["day"] for point in series], ["2030-01-06", "2030-01-07", "2030-01-08"]
+        )
+        self.assertEqual(
+            series[1],
+            {
+                "day": "2030-01-07",
+                "lessons": 1,
+                "lessons_completed": 1,
+                "classes": 0,
+                "minutes": 45,
+                "revenue": 0.0,
+            },
+        )
+        self.assertEqual(series[0]["lessons"], 0)
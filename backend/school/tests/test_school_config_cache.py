@@ -0,0 +1,71 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from school import config_cache
+from school.models import Address, SchoolConfig
+from school.utils import shared_cache
+
+URL = "/api/school/config/"
+
+
+class SchoolConfigCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        config_cache._local.clear()
+        self.addCleanup(config_cache._local.clear)
+        self.config = SchoolConfig.objects.create(pk=1, school_name="Auto School")
+        self.client = APIClient()
+
+    def test_repeated_reads_skip_the_database(self):
+        first = self.client.get(URL)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()["school_name"], "Auto School")
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get(URL)
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get(URL)["ETag"]
+        response = self.client.get(URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(self.client.get(URL, HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def test_save_and_address_changes_invalidate(self):
+        etag = self.client.get(URL)["ETag"]
+        self.config.school_name = "New Name"
+        self.config.save()
+        response = self.client.get(URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["school_name"], "New Name")
+
+        address = Address.objects.create(street="Main 1", city="Chisinau")
+        self.config.addresses.add(address)
+        self.assertEqual(self.client.get(URL).json()["addresses"][0]["street"], "Main 1")
+        address.street = "Main 2"
+        address.save()
+        self.assertEqual(self.client.get(URL).json()["addresses"][0]["street"], "Main 2")
+
+    def test_other_workers_see_invalidations(self):
+        etag = self.client.get(URL)["ETag"]
+        SchoolConfig.objects.filter(pk=1).update(school_name="Renamed")
+        # Another worker bumps the shared version; this one notices after its recheck
+        shared_cache().incr(config_cache.VERSION_KEY)
+        config_cache._local.clear()
+        response = self.client.get(URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["school_name"], "Renamed")
+
+    def test_host_headers_do_not_grow_the_local_cache(self):
+        for i in range(config_cache.LOCAL_MAX_ORIGINS + 5):
+            self.assertEqual(
+                self.client.get(URL, HTTP_HOST=f"host{i}.example.com").status_code, 200
+            )
+        self.assertEqual(len(config_cache._local), config_cache.LOCAL_MAX_ORIGINS)
+        self.assertNotIn("http://host0.example.com/", config_cache._local)
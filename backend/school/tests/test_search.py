@@ -0,0 +1,46 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from school.models import Resource, Student
+
+
+class SearchFilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_superuser("admin", "admin@example.com", "pw")
+        )
+        for first, last, email, phone in [
+            ("Ana", "Popescu", "ana@example.com", "+37369111001"),
+            ("Ion", "Rusu", "ion.r@example.com", "+37369222002"),
+        ]:
+            Student.objects.create(
+                first_name=first,
+                last_name=last,
+                email=email,
+                phone_number=phone,
+                date_of_birth="2000-01-01",
+            )
+
+    def search(self, url, q):
+        response = self.client.get(url, {"q": q, "ordering": "-id"})
+        self.assertEqual(response.status_code, 200)
+        return response.json()["results"]
+
+    def test_students_by_name_email_and_phone(self):
+        self.assertEqual(
+            [s["first_name"] for s in self.search("/api/students/", "ana pop")], ["Ana"]
+        )
+        self.assertEqual(
+            [s["first_name"] for s in self.search("/api/students/", "ION.R@")], ["Ion"]
+        )
+        self.assertEqual(
+            [s["first_name"] for s in self.search("/api/students/", "222002")], ["Ion"]
+        )
+
+    def test_resources_by_plate(self):
+        Resource.objects.create(
+            name="Car 1", max_capacity=2, license_plate="ABC123", make="VW", model="Golf"
+        )
+        self.assertEqual([r["name"] for r in self.search("/api/resources/", "abc1")], ["Car 1"])
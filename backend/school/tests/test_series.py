@@ -0,0 +1,159 @@
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from school.enums import CourseType, DayOfWeek, LessonStatus, VehicleCategory
+from school.models import (
+    Course,
+    Instructor,
+    InstructorAvailability,
+    Resource,
+    ScheduledClass,
+    ScheduledClassPattern,
+    Student,
+)
+
+
+class SeriesChangeTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+        self.course = Course.objects.create(
+            name="Theory B",
+            category=VehicleCategory.B.value,
+            type=CourseType.THEORY.value,
+            description="Theory",
+            price=1000,
+            required_lessons=10,
+        )
+        self.instructor = Instructor.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            phone_number="+37369123456",
+            hire_date=date.today(),
+            license_categories="B",
+        )
+        InstructorAvailability.objects.create(
+            instructor=self.instructor,
+            day=DayOfWeek.MONDAY.value,
+            hours=[f"{hour:02d}:00" for hour in range(8, 19)],
+        )
+        self.room = Resource.objects.create(
+            name="Room 1", max_capacity=20, category=VehicleCategory.B.value, is_available=True
+        )
+        self.small_room = Resource.objects.create(
+            name="Room 2", max_capacity=3, category=VehicleCategory.B.value, is_available=True
+        )
+        self.pattern = ScheduledClassPattern.objects.create(
+            name="Mondays",
+            course=self.course,
+            instructor=self.instructor,
+            resource=self.room,
+            recurrence_days=["MONDAY"],
+            times=["10:00"],
+            start_date=date(2030, 1, 7),
+            num_lessons=4,
+            default_max_students=10,
+        )
+        self.student = Student.objects.create(
+            first_name="Jane",
+            last_name="Smith",
+            email="jane@example.com",
+            phone_number="+37360111223",
+            date_of_birth="1990-01-01",
+        )
+        # Mondays 10:00 in Europe/Chisinau (UTC+2 in winter)
+        self.classes = []
+        for week in range(4):
+            cls = ScheduledClass.objects.create(
+                pattern=self.pattern,
+                course=self.course,
+                instructor=self.instructor,
+                resource=self.room,
+                name=f"Week {week + 1}",
+                scheduled_time=datetime(2030, 1, 7, 8, 0, tzinfo=dt_timezone.utc)
+                + timedelta(weeks=week),
+                max_students=3,
+            )
+            cls.students.add(self.student)
+            self.classes.append(cls)
+
+    def _post(self, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                f"/api/scheduled-class-patterns/{self.pattern.id}/series/", data, format="json"
+            )
+
+    def test_shift_from_date_keeps_rosters(self):
+        response = self._post({"from_date": "2030-01-14", "shift_minutes": 120})
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["updated"], 3)
+        first, *rest = [ScheduledClass.objects.get(pk=cls.pk) for cls in self.classes]
+        self.assertEqual(first.scheduled_time, self.classes[0].scheduled_time)
+        for moved, original in zip(rest, self.classes[1:]):
+            self.assertEqual(moved.scheduled_time, original.scheduled_time + timedelta(hours=2))
+            self.assertEqual(moved.end_time, moved.scheduled_time + timedelta(minutes=60))
+            self.assertEqual(list(moved.students.all()), [self.student])
+
+    def test_move_and_cancel_a_range(self):
+        response = self._post(
+            {
+                "from_date": "2030-01-14",
+                "until_date": "2030-01-21",
+                "resource_id": self.small_room.id,
+            }
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            list(
+                ScheduledClass.objects.order_by("scheduled_time").values_list(
+                    "resource_id", flat=True
+                )
+            ),
+            [self.room.id, self.small_room.id, self.small_room.id, self.room.id],
+        )
+
+        response = self._post({"from_date": "2030-01-28", "cancel": True})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["ids"], [self.classes[3].id])
+        self.assertEqual(
+            ScheduledClass.objects.get(pk=self.classes[3].pk).status, LessonStatus.CANCELED.value
+        )
+
+    def test_conflicts_reject_the_whole_change(self):
+        ScheduledClass.objects.create(
+            course=self.course,
+            instructor=self.instructor,
+            resource=self.small_room,
+            name="Extra",
+            scheduled_time=datetime(2030, 1, 21, 9, 30, tzinfo=dt_timezone.utc),
+            max_students=3,
+        )
+
+        # Week 3 would overlap the extra class; week 4 would start after 18:00
+        response = self._post({"from_date": "2030-01-14", "shift_minutes": 60})
+        self.assertEqual(response.status_code, 400)
+        errors = {entry["id"]: entry["errors"] for entry in response.data["classes"]}
+        self.assertEqual(set(errors), {self.classes[2].id})
+        self.assertIn("instructor_id", errors[self.classes[2].id])
+
+        response = self._post({"from_date": "2030-01-28", "shift_minutes": 540})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("scheduled_time", response.data["classes"][0]["errors"])
+        self.assertEqual(
+            ScheduledClass.objects.get(pk=self.classes[1].pk).scheduled_time,
+            self.classes[1].scheduled_time,
+        )
+
+    def test_rejects_ambiguous_input(self):
+        response = self._post({"from_date": "2030-01-14", "shift_minutes": 30, "cancel": True})
+        self.assertEqual(response.status_code, 400)
+        response = self._post({"from_date": "2030-01-14"})
+        self.assertEqual(response.status_code, 400)
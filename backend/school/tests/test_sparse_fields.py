@@ -0,0 +1,103 @@
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from school.enums import CourseType, VehicleCategory
+from school.models import Course, Enrollment, Instructor, Lesson, Payment, Resource, Student
+from school.serializers import LessonSerializer
+from school.views import LessonViewSet
+from school.views.base import prune_fields
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        course = Course.objects.create(
+            name="Practice B",
+            category=VehicleCategory.B.value,
+            type=CourseType.PRACTICE.value,
+            description="Practice",
+            price=2500,
+            required_lessons=20,
+        )
+        self.instructor = Instructor.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            phone_number="+37369123456",
+            hire_date=date(2020, 5, 1),
+            license_categories="B",
+        )
+        student = Student.objects.create(
+            first_name="Jane",
+            last_name="Smith",
+            email="jane@example.com",
+            phone_number="+37360111223",
+            date_of_birth="2000-01-01",
+        )
+        enrollment = Enrollment.objects.create(student=student, course=course)
+        car = Resource.objects.create(name="Car 1", max_capacity=2, license_plate="ABC123")
+        start = datetime(2030, 1, 7, 9, 0, tzinfo=dt_timezone.utc)
+        for i in range(3):
+            Lesson.objects.create(
+                enrollment=enrollment,
+                instructor=self.instructor,
+                resource=car,
+                scheduled_time=start + timedelta(hours=i),
+            )
+        self.payment = Payment.objects.create(
+            enrollment=enrollment, amount=100, payment_method="CASH", description="Fee"
+        )
+
+    def _get(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        sql = " ".join(q["sql"] for q in ctx.captured_queries)
+        return response.data, sql
+
+    def test_fields_prunes_response_and_joins(self):
+        data, sql = self._get("/api/lessons/?fields=id,scheduled_time,instructor_id")
+        self.assertEqual(set(data["results"][0]), {"id", "scheduled_time", "instructor_id"})
+        self.assertNotIn('"school_instructor"', sql)
+        self.assertNotIn('"school_student"', sql)
+
+    def test_dotted_fields_select_inside_nested(self):
+        data, _sql = self._get(
+            "/api/lessons/?fields=id,enrollment.label,enrollment.student.first_name"
+        )
+        row = data["results"][0]
+        self.assertEqual(set(row), {"id", "enrollment"})
+        self.assertEqual(
+            row["enrollment"],
+            {"student": {"first_name": "Jane"}, "label": "Jane Smith - THEORY - B"},
+        )
+
+    def test_expand_keeps_only_requested_nested(self):
+        data, sql = self._get("/api/lessons/?expand=instructor")
+        row = data["results"][0]
+        self.assertEqual(row["instructor"]["last_name"], "Doe")
+        self.assertNotIn("enrollment", row)
+        self.assertNotIn("resource", row)
+        self.assertIn("enrollment_id", row)
+        self.assertNotIn('"school_student"', sql)
+
+    def test_retrieve_without_fast_path(self):
+        data, sql = self._get(f"/api/payments/{self.payment.id}/?fields=id,amount")
+        self.assertEqual(data, {"id": self.payment.id, "amount": "100.00"})
+        self.assertNotIn('"school_student"', sql)
+
+    def test_fast_rows_keep_cursor_columns(self):
+        fast = LessonViewSet.fast_list_serializer
+        serializer = prune_fields(LessonSerializer(), {"id"})
+        row = fast.values(Lesson.objects.all(), serializer, ["scheduled_time"]).first()
+        self.assertIn("scheduled_time", row)
+        self.assertEqual(fast.serialize([row], serializer), [{"id": row["id"]}])
+
+    def test_default_response_unchanged(self):
+        data, _sql = self._get("/api/lessons/")
+        self.assertIn("student", data["results"][0]["enrollment"])
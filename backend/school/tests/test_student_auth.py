@@ -0,0 +1,67 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from school.models import Student
+from school.student_auth import clear_principal_cache, get_student_principal
+
+
+class StudentPrincipalCacheTests(TestCase):
+    def setUp(self):
+        clear_principal_cache()
+        self.addCleanup(clear_principal_cache)
+        self.student = Student.objects.create(
+            first_name="Ana",
+            last_name="Popescu",
+            email="ana@example.com",
+            phone_number="+37369111222",
+            date_of_birth="2000-01-01",
+        )
+        token = AccessToken()
+        token["student_id"] = self.student.id
+        token["status"] = self.student.status
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_me_is_served_from_cache(self):
+        first = self.client.get("/api/auth/student/me/")
+        self.assertEqual(first.status_code, 200)
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get("/api/auth/student/me/")
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(
+            second.json(),
+            {
+                "id": self.student.id,
+                "first_name": "Ana",
+                "last_name": "Popescu",
+                "email": "ana@example.com",
+                "status": self.student.status,
+            },
+        )
+
+    def test_save_invalidates_principal(self):
+        self.assertEqual(get_student_principal(self.student.id).first_name, "Ana")
+        self.student.first_name = "Maria"
+        self.student.save()
+        self.assertEqual(self.client.get("/api/auth/student/me/").json()["first_name"], "Maria")
+
+    def test_deleted_student_is_rejected(self):
+        self.assertEqual(self.client.get("/api/auth/student/me/").status_code, 200)
+        self.student.delete()
+        self.assertEqual(self.client.get("/api/auth/student/me/").status_code, 401)
+
+    def test_missing_or_foreign_token_is_rejected(self):
+        self.assertEqual(APIClient().get("/api/auth/student/me/").status_code, 401)
+        staff_token = AccessToken()
+        staff_token["user_id"] = 1
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {staff_token}")
+        self.assertEqual(client.get("/api/student/dashboard/").status_code, 401)
+
+    def test_dashboard_uses_principal(self):
+        response = self.client.get("/api/student/dashboard/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["student"]["phone_number"], "+37369111222")
@@ -0,0 +1,127 @@
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from school.models import Instructor, Student
+from school.passwords import hash_passwords
+
+HEADER = "first_name,last_name,email,phone_number,date_of_birth,password\n"
+
+
+class StudentImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def upload(self, rows, header=HEADER, url="/api/students/import/"):
+        body = header + "".join(f"{row}\n" for row in rows)
+        return self.client.post(
+            url,
+            {"file": SimpleUploadedFile("students.csv", body.encode(), content_type="text/csv")},
+            format="multipart",
+        )
+
+    def test_hash_passwords_matches_sequential(self):
+        existing = make_password("kept-as-is")
+        hashed = hash_passwords(["secret1", existing, "secret2", "secret3"], max_workers=3)
+        self.assertEqual(hashed[1], existing)
+        for plain, value in zip(
+            ["secret1", "secret2", "secret3"], [hashed[0], hashed[2], hashed[3]]
+        ):
+            self.assertTrue(check_password(plain, value))
+
+    def test_import_hashes_and_bulk_inserts(self):
+        existing = make_password("exported")
+        response = self.upload(
+            [
+                "Ana,Popescu,ana@example.com,+37369111001,2000-01-01,secret1",
+                f"Ion,Rusu,ion@example.com,+37369111002,2000-01-01,{existing}",
+            ]
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["errors"], [])
+        ana = Student.objects.get(email="ana@example.com")
+        self.assertTrue(ana.check_password("secret1"))
+        self.assertEqual(Student.objects.get(email="ion@example.com").password, existing)
+        self.assertCountEqual(
+            response.data["created_ids"], Student.objects.values_list("id", flat=True)
+        )
+
+    def test_duplicates_within_file_are_reported(self):
+        response = self.upload(
+            [
+                "Ana,Popescu,ana@example.com,+37369111001,2000-01-01,secret1",
+                "Ana,Again,ANA@example.com,+37369111003,2000-01-01,secret1",
+                "Ion,Rusu,ion@example.com,+37369111001,2000-01-01,secret1",
+            ]
+        )
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(
+            response.data["errors"],
+            [
+                {"row": 3, "errors": {"email": ["Email already registered"]}},
+                {"row": 4, "errors": {"phone_number": ["Phone number already registered"]}},
+            ],
+        )
+
+    def test_existing_contacts_checked_in_one_query(self):
+        Student.objects.create(
+            first_name="Old",
+            last_name="Student",
+            email="old@example.com",
+            phone_number="+37369111099",
+            date_of_birth="2000-01-01",
+        )
+        hashed = make_password("pw")
+        rows = [
+            f"New,Student,new{i}@example.com,+3736922{i:04d},2000-01-01,{hashed}" for i in range(30)
+        ]
+        rows += [
+            f"Dup,Email,OLD@Example.com,+37369111098,2000-01-01,{hashed}",
+            f"Dup,Phone,other@example.com,+37369111099,2000-01-01,{hashed}",
+        ]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.upload(rows)
+        self.assertEqual(response.data["created"], 30)
+        self.assertEqual(
+            response.data["errors"],
+            [
+                {"row": 32, "errors": {"email": ["Email already registered"]}},
+                {"row": 33, "errors": {"phone_number": ["Phone number already registered"]}},
+            ],
+        )
+        # contacts lookup + bulk insert (+ transaction savepoints), independent of row count
+        self.assertLessEqual(len(ctx.captured_queries), 5)
+
+    def test_instructor_import_upserts_by_email(self):
+        Instructor.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            phone_number="+37369123456",
+            hire_date="2020-05-01",
+            license_categories="B",
+        )
+        header = "first_name,last_name,email,phone_number,hire_date,license_categories\n"
+        response = self.upload(
+            [
+                "Johnny,Doe,JOHN@example.com,+37369123456,2020-05-01,B",
+                "Mary,Roe,mary@example.com,+37369123456,2021-01-01,B",
+                "Mary,Roe,mary@example.com,+37369123457,2021-01-01,B",
+                'Mary,Roe,mary@example.com,+37369123457,2021-01-01,"B,C"',
+            ],
+            header=header,
+            url="/api/instructors/import/",
+        )
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["updated"], 2)
+        # Row 3 reuses John's phone, which row 2 of the same file just saved
+        self.assertEqual(
+            [(e["row"], list(e["errors"])) for e in response.data["errors"]],
+            [(3, ["phone_number"])],
+        )
+        self.assertEqual(Instructor.objects.get(email="john@example.com").first_name, "Johnny")
+        self.assertEqual(Instructor.objects.get(email="mary@example.com").license_categories, "B,C")
@@ -0,0 +1,78 @@
+"""Bulk status transitions for lessons and scheduled classes.
+
+``apply_transition`` moves many bookings to COMPLETED or CANCELED with one UPDATE,
+skipping the serializer's booking validation: conflict checks only look at
+SCHEDULED / COMPLETED bookings and resource availability only at SCHEDULED ones, so
+neither transition can break a booking rule. Reinstating a booking (back to
+SCHEDULED) still goes through a regular update and its checks.
+
+- Rows are locked while the batch is checked and updated
+- ``statuses_changed`` is sent once per batch instead of a ``post_save`` per row
+  (rollups rebuild the touched days from it)
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .enums import LessonStatus
+
+# Sent with ``sender=<model>``, ``ids``, ``status`` and ``moments`` (scheduled times)
+statuses_changed = Signal()
+
+# target status -> statuses it may be reached from in bulk
+BULK_TRANSITIONS = {
+    LessonStatus.COMPLETED.value: {LessonStatus.SCHEDULED.value},
+    LessonStatus.CANCELED.value: {LessonStatus.SCHEDULED.value},
+}
+
+MAX_BULK_TRANSITION = 5000
+
+
+def apply_transition(queryset, status: str, ids: Iterable[int] | None = None) -> list[dict]:
+    """Move the bookings of ``queryset`` (narrowed to ``ids``) to ``status``.
+
+    Returns one ``{"id", "result"}`` entry per booking (per requested id when ``ids``
+    is given): ``updated``, ``unchanged`` (already in ``status``), ``invalid_transition``
+    (with ``from``) or ``not_found``.
+    """
+    allowed_from = BULK_TRANSITIONS[status]
+    model = queryset.model
+    if ids is not None:
+        ids = list(dict.fromkeys(ids))
+        queryset = queryset.filter(pk__in=ids)
+
+    with transaction.atomic():
+        rows = {
+            pk: (current, moment)
+            for pk, current, moment in queryset.order_by("pk")
+            .select_for_update(of=("self",))
+            .values_list("pk", "status", "scheduled_time")
+        }
+        changing = [pk for pk, (current, _moment) in rows.items() if current in allowed_from]
+        if changing:
+            model._default_manager.filter(pk__in=changing).update(
+                status=status, updated_at=timezone.now()
+            )
+            statuses_changed.send(
+                sender=model,
+                ids=changing,
+                status=status,
+                moments=[rows[pk][1] for pk in changing],
+            )
+
+    results = []
+    for pk in ids if ids is not None else rows:
+        if pk not in rows:
+            results.append({"id": pk, "result": "not_found"})
+        elif rows[pk][0] in allowed_from:
+            results.append({"id": pk, "result": "updated"})
+        elif rows[pk][0] == status:
+            results.append({"id": pk, "result": "unchanged"})
+        else:
+            results.append({"id": pk, "result": "invalid_transition", "from": rows[pk][0]})
+    return results
@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.urls import include, path
 from rest_framework import routers
 
+from . import async_views
 from .views import (
     AddressViewSet,
     CourseViewSet,
@@ -16,9 +18,11 @@ from .views import (
     StudentViewSet,
     UtilityViewSet,
     VehicleViewSet,
+    calendar_feed,
     check_username,
     enums_meta,
     me,
+    student_calendar_feed,
     student_dashboard,
     student_login,
     student_me,
@@ -40,6 +44,11 @@ router.register(r"utils", UtilityViewSet, basename="utils")
 router.register(r"addresses", AddressViewSet)
 router.register(r"school/config", SchoolConfigViewSet, basename="school-config")
 
+if getattr(settings, "ASYNC_PORTAL", False):
+    student_login = async_views.student_login
+    student_me = async_views.student_me
+    student_dashboard = async_views.student_dashboard
+
 urlpatterns = [
     path("", include(router.urls)),
     path("meta/enums/", enums_meta, name="meta-enums"),
@@ -48,4 +57,6 @@ urlpatterns = [
     path("auth/student/login/", student_login, name="student-login"),
     path("auth/student/me/", student_me, name="student-me"),
     path("student/dashboard/", student_dashboard, name="student-dashboard"),
+    path("student/calendar-feed/", student_calendar_feed, name="student-calendar-feed"),
+    path("calendar/<str:token>.ics", calendar_feed, name="calendar-feed"),
 ]
@@ -5,7 +5,126 @@ Avoid adding large grab-bags; prefer cohesive, documented helpers.
 
 from __future__ import annotations
 
+import threading
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import connections, transaction
+from django.db.models import Value
+
+_MISSING = object()
+_inflight_guard = threading.Lock()
+# key -> [lock, callers using it]; entries are dropped once no caller holds or awaits them
+_inflight_locks: dict[str, list] = {}
+
 
 def dict_without_none(data: dict) -> dict:
     """Return a shallow copy without keys whose value is ``None``."""
     return {k: v for k, v in data.items() if v is not None}
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    """Yield successive lists of at most ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def shared_cache():
+    """Cache seen by every worker process (``SHARED_CACHE_ALIAS``), for invalidation versions."""
+    return caches[getattr(settings, "SHARED_CACHE_ALIAS", "default")]
+
+
+def on_commit_batch(
+    name: str, items: Iterable, flush: Callable[[set], None], using: str | None = None
+) -> None:
+    """Add ``items`` to the set passed to ``flush`` once the current transaction commits.
+
+    Calls with the same ``name`` in one transaction share a single set and a single
+    ``on_commit`` callback (one per savepoint, so a rolled back savepoint drops its
+    items); outside a transaction ``flush`` runs right away.
+    """
+    items = set(items)
+    if not items:
+        return
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        flush(items)
+        return
+    key = (name, tuple(sid for sid in connection.savepoint_ids if sid))
+    batches = connection.__dict__.setdefault("_school_commit_batches", {})
+    live = [hook[1] for hook in connection.run_on_commit]
+    # Drop batches whose callback is gone: it ran, or its transaction / savepoint rolled back
+    for stale in [other for other, (callback, _items) in batches.items() if callback not in live]:
+        del batches[stale]
+    batch = batches.get(key)
+    if batch is None:
+        pending: set = set()
+
+        def run():
+            if batches.get(key, (None,))[0] is run:
+                del batches[key]
+            flush(pending)
+
+        batch = batches[key] = (run, pending)
+        transaction.on_commit(run, using=using)
+    batch[1].update(items)
+
+
+def cache_get_or_compute(key: str, compute: Callable[[], Any], timeout: int) -> Any:
+    """Return ``cache[key]``, computing and storing it on a miss.
+
+    Concurrent misses for the same key in one process are coalesced: the first caller
+    computes while the others wait and then read its result instead of recomputing.
+    """
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+    with _inflight_guard:
+        entry = _inflight_locks.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = compute()
+                cache.set(key, value, timeout)
+    finally:
+        with _inflight_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _inflight_locks[key]
+    return value
+
+
+def scalar_aggregates(using: str | None = None, **metrics) -> dict[str, Any]:
+    """Evaluate several aggregates, possibly over different tables, in one query.
+
+    ``metrics`` maps output names to ``(queryset, aggregate)`` pairs, e.g.
+    ``students=(Student.objects.all(), Count("id"))``. Each pair becomes a scalar
+    subquery of a single ``SELECT``; empty sets behave like ``aggregate()`` (0 / None).
+    Runs on ``using``, else where the router sends the first queryset's reads.
+    """
+    if not metrics:
+        return {}
+    using = using or next(iter(metrics.values()))[0].db
+    connection = connections[using]
+    columns, params = [], []
+    for name, (queryset, aggregate) in metrics.items():
+        # Grouping on a constant collapses to a plain aggregate: always exactly one row
+        inner = (
+            queryset.order_by()
+            .annotate(_one=Value(1))
+            .values("_one")
+            .annotate(_value=aggregate)
+            .values("_value")
+        )
+        sql, inner_params = inner.query.get_compiler(using).as_sql()
+        columns.append(f"({sql}) AS {connection.ops.quote_name(name)}")
+        params.extend(inner_params)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT " + ", ".join(columns), params)
+        row = cursor.fetchone()
+    return dict(zip(metrics.keys(), row))
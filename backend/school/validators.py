@@ -12,6 +12,9 @@ from typing import List, NamedTuple, Optional
 
 # --- Lesson validation helpers (Phase 2 refactor) ---
 from django.conf import settings
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.db.models.lookups import Exact
 from django.utils.translation import gettext as _
 from rest_framework import serializers
 
@@ -78,7 +81,7 @@ def validate_unique_email(model_class, email: str, instance=None) -> str:
         return email
     
     email = email.strip().lower()
-    qs = model_class.objects.filter(email__iexact=email)
+    qs = model_class.objects.filter(email_equals(email))
     
     if instance:
         qs = qs.exclude(pk=instance.pk)
@@ -117,6 +120,39 @@ def validate_unique_phone(model_class, phone: str, instance=None) -> str:
     
     return phone
 
+
+def email_equals(email: str) -> Exact:
+    """Case-insensitive email match (``filter(email_equals(value))``).
+
+    Compares ``LOWER(email)`` so the functional ``Lower("email")`` index is used,
+    unlike ``email__iexact`` (``UPPER(...)`` on PostgreSQL).
+    """
+    return Exact(Lower("email"), email.strip().lower())
+
+
+def existing_contacts(model_class, emails, phones) -> tuple[dict, dict]:
+    """Rows already using any of ``emails`` (case-insensitive) or ``phones``, in one query.
+
+    Batched counterpart of ``validate_unique_email`` / ``validate_unique_phone`` for
+    imports. Returns ``(by_email, by_phone)`` mapping the lowercased email / normalized
+    phone number to the instance holding it.
+    """
+    emails = {email.strip().lower() for email in emails if email}
+    phones = {phone for phone in phones if phone}
+    by_email: dict = {}
+    by_phone: dict = {}
+    if not emails and not phones:
+        return by_email, by_phone
+    matches = model_class.objects.annotate(_email_lower=Lower("email")).filter(
+        Q(_email_lower__in=emails) | Q(phone_number__in=phones)
+    )
+    for obj in matches:
+        if obj._email_lower in emails:
+            by_email[obj._email_lower] = obj
+        if str(obj.phone_number) in phones:
+            by_phone[str(obj.phone_number)] = obj
+    return by_email, by_phone
+
 class LessonContext(NamedTuple):
     enrollment: object
     instructor: object
@@ -352,6 +388,30 @@ def check_scheduled_class_resource_conflicts(resource, start: datetime, end: dat
             raise serializers.ValidationError({"resource_id": [_("validation.resourceConflict")]})
 
 
+# PostgreSQL exclusion constraints (migration 0022) enforce the same no-overlap rules
+# as the checks above, closing the check-then-insert race between concurrent writers.
+BOOKING_EXCLUSION_CONSTRAINTS = {
+    "lesson_instructor_no_overlap": ("instructor_id", "validation.instructorConflict"),
+    "lesson_resource_no_overlap": ("resource_id", "validation.resourceConflict"),
+    "scheduledclass_instructor_no_overlap": ("instructor_id", "validation.instructorConflict"),
+    "scheduledclass_resource_no_overlap": ("resource_id", "validation.resourceConflict"),
+}
+
+
+def booking_conflict_from_integrity_error(exc) -> Optional[serializers.ValidationError]:
+    """Translate a booking exclusion-constraint violation into the usual field error.
+
+    Returns None when ``exc`` was raised by some other constraint so callers can re-raise.
+    """
+    cause = getattr(exc, "__cause__", None)
+    constraint = getattr(getattr(cause, "diag", None), "constraint_name", None)
+    message = str(cause or exc)
+    for name, (field, key) in BOOKING_EXCLUSION_CONSTRAINTS.items():
+        if constraint == name or (constraint is None and name in message):
+            return serializers.ValidationError({field: [_(key)]})
+    return None
+
+
 def validate_theory_only_course_for_class(course) -> None:
     """ScheduledClass may only be created for THEORY courses."""
     if not course:
@@ -416,6 +476,21 @@ def validate_scheduled_class_capacity(resource, max_students, instance=None) ->
             raise serializers.ValidationError({"max_students": [_("validation.capacityBelowEnrolled")]})
 
 
+def instructor_holds_license(instructor, category) -> bool:
+    """Bitwise check of ``category`` against ``instructor.license_mask``.
+
+    Instances whose mask was never computed (unsaved / built in memory) fall back to
+    ``license_categories``.
+    """
+    from .enums import LICENSE_CATEGORY_BITS, license_category_mask
+
+    bit = LICENSE_CATEGORY_BITS.get(str(category).upper(), 0)
+    mask = getattr(instructor, "license_mask", 0) or license_category_mask(
+        getattr(instructor, "license_categories", "") or ""
+    )
+    return bool(bit and mask & bit)
+
+
 def validate_category_and_license(course, instructor, resource) -> None:
     """Generic category and instructor license checks reused by Lessons/ScheduledClass.
 
@@ -460,9 +535,7 @@ def validate_category_and_license(course, instructor, resource) -> None:
                 pass
 
     if course_category:
-        lic_raw = getattr(instructor, "license_categories", "") or ""
-        cats = [c.strip().upper() for c in str(lic_raw).split(",") if c.strip()]
-        if str(course_category).upper() not in cats:
+        if not instructor_holds_license(instructor, course_category):
             raise serializers.ValidationError({"instructor_id": [_("validation.instructorLicenseMismatch")]})
 
 
@@ -552,27 +625,53 @@ def validate_lesson_resource_availability(resource, status) -> None:
 def validate_instructor_availability(instructor_id, start) -> None:
     # Lazy import to avoid circular import with models -> validators
     from .models import InstructorAvailability
+    local_start = _business_local(start)
+    day_enum = WEEKDAYS[(local_start.weekday())]  # Monday=0
+    avail = InstructorAvailability.objects.filter(instructor_id=instructor_id, day=day_enum)
+    _check_within_availability(_availability_slots(avail), local_start)
+
+
+def instructor_availability_checker(instructor_id):
+    """``validate_instructor_availability`` for many starts of one instructor.
+
+    Loads the instructor's availability once; the returned callable takes a start.
+    """
+    from .models import InstructorAvailability
+    by_day: dict = {}
+    for a in InstructorAvailability.objects.filter(instructor_id=instructor_id):
+        by_day.setdefault(a.day, []).append(a)
+
+    def check(start) -> None:
+        local_start = _business_local(start)
+        day_enum = WEEKDAYS[local_start.weekday()]
+        _check_within_availability(_availability_slots(by_day.get(day_enum, [])), local_start)
+
+    return check
+
+
+WEEKDAYS = [
+    "MONDAY",
+    "TUESDAY",
+    "WEDNESDAY",
+    "THURSDAY",
+    "FRIDAY",
+    "SATURDAY",
+    "SUNDAY",
+]
+
+
+def _business_local(start):
     # Convert start to business-local timezone before computing day/hour
     biz_tz_name = getattr(settings, "BUSINESS_TZ", "Europe/Chisinau")
     try:
         biz_tz = ZoneInfo(biz_tz_name) if ZoneInfo else None
     except Exception:
         biz_tz = None
-    local_start = start.astimezone(biz_tz) if (biz_tz and getattr(start, "tzinfo", None)) else start
-
-    WEEKDAYS = [
-        "MONDAY",
-        "TUESDAY",
-        "WEDNESDAY",
-        "THURSDAY",
-        "FRIDAY",
-        "SATURDAY",
-        "SUNDAY",
-    ]
-    day_enum = WEEKDAYS[(local_start.weekday())]  # Monday=0
+    return start.astimezone(biz_tz) if (biz_tz and getattr(start, "tzinfo", None)) else start
 
-    # Fetch availability slots and build intervals [t[i], t[i+1]) in minutes since midnight
-    avail = InstructorAvailability.objects.filter(instructor_id=instructor_id, day=day_enum)
+
+def _availability_slots(avail) -> set[str]:
+    """"HH:MM" slot starts listed by ``InstructorAvailability`` rows."""
     slots: set[str] = set()
     for a in avail:
         try:
@@ -585,6 +684,10 @@ def validate_instructor_availability(instructor_id, start) -> None:
         except Exception:
             # Skip malformed/corrupted availability records
             pass
+    return slots
+
+
+def _check_within_availability(slots: set[str], local_start) -> None:
     if not slots:
         # Strict validation: if no availability is defined, the instructor is not working.
         raise serializers.ValidationError({"instructor_id": [_("validation.instructorNotWorking")]})
@@ -699,9 +802,7 @@ def validate_lesson_category_and_license(enrollment, instructor, resource) -> No
         if getattr(resource, "category", None) != course_category:
             raise serializers.ValidationError({"resource_id": [_("validation.categoryMismatch")]})
     if course_category:
-        lic_raw = getattr(instructor, "license_categories", "") or ""
-        cats = [c.strip().upper() for c in str(lic_raw).split(",") if c.strip()]
-        if str(course_category).upper() not in cats:
+        if not instructor_holds_license(instructor, course_category):
             raise serializers.ValidationError({"instructor_id": [_("validation.instructorLicenseMismatch")]})
 
 try:
@@ -869,9 +970,18 @@ def validate_file_size(file, max_mb=5):
         raise ValueError(f"File size must not exceed {max_mb}MB (current: {file.size / (1024 * 1024):.2f}MB)")
 
 
+# Formats accepted by validate_image_file, as reported by Pillow from the file header
+ALLOWED_IMAGE_FORMATS = {"JPEG", "PNG", "GIF", "WEBP"}
+# Largest accepted image (width * height), about 8000 x 6000
+MAX_IMAGE_PIXELS = 50_000_000
+
+
 def validate_image_file(file):
     """Validate uploaded file is a valid image.
 
+    Only the image header is parsed (format and dimensions); pixel data is not
+    decoded, so oversized "decompression bomb" images are rejected cheaply.
+
     Args:
         file: Django UploadedFile instance
 
@@ -879,6 +989,7 @@ def validate_image_file(file):
         ValueError: If file is not a valid image format
     """
     import os
+    import warnings
     from PIL import Image
 
     allowed_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp']
@@ -890,12 +1001,22 @@ def validate_image_file(file):
         raise ValueError(f"Invalid content type '{file.content_type}'. Must be an image.")
 
     try:
-        image = Image.open(file)
-        image.verify()
+        with warnings.catch_warnings():
+            # Size limits are checked below against MAX_IMAGE_PIXELS
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            with Image.open(file) as image:
+                image_format, (width, height) = image.format, image.size
     except Exception as e:
         raise ValueError(f"Invalid or corrupted image file: {str(e)}")
+    finally:
+        file.seek(0)
 
-    file.seek(0)
+    if image_format not in ALLOWED_IMAGE_FORMATS:
+        raise ValueError(f"Unsupported image format '{image_format}'.")
+    if width * height > MAX_IMAGE_PIXELS:
+        raise ValueError(
+            f"Image is too large ({width}x{height}); at most {MAX_IMAGE_PIXELS // 1_000_000} megapixels allowed."
+        )
 
 
 def validate_upload_file(file, max_mb=5, file_type='image'):
@@ -8,6 +8,7 @@ This package contains ViewSets organized by domain:
 - course_views: CourseViewSet, EnrollmentViewSet
 - resource_views: ResourceViewSet, VehicleViewSet
 - scheduled_views: ScheduledClassPatternViewSet, ScheduledClassViewSet
+- calendar_views: iCalendar feeds (calendar_feed, student_calendar_feed)
 
 Import from here for backwards compatibility with existing code.
 """
@@ -40,6 +41,7 @@ from .scheduled_views import (
 )
 
 from .address_views import AddressViewSet
+from .calendar_views import calendar_feed, student_calendar_feed
 from .school_config_views import SchoolConfigViewSet
 
 from ..legacy_views import (
@@ -80,6 +82,9 @@ __all__ = [
     # Remaining in views.py
     "AddressViewSet",
     "SchoolConfigViewSet",
+    # Calendar feeds
+    "calendar_feed",
+    "student_calendar_feed",
     "UtilityViewSet",
     "check_username",
     "enums_meta",
@@ -1,12 +1,24 @@
 """Base classes and utilities for ViewSets."""
 
-from rest_framework import mixins, viewsets
+from django.db import connections
+from django.db.models import Q
+from django.db.models.functions import Greatest, Upper
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import decorators, mixins, response, serializers, status, viewsets
 from rest_framework.filters import SearchFilter
 from rest_framework.permissions import BasePermission
+from rest_framework.relations import PrimaryKeyRelatedField
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken
 
-from ..models import Student
+from ..ical import feed_url
+from ..pagination import ChangesPagination
+from ..serializers import BulkTransitionSerializer
+from ..student_auth import aget_student_principal, get_student_principal
+from ..transitions import MAX_BULK_TRANSITION, apply_transition
+
+# Rows per batch for CSV imports that validate uniqueness chunk-wise
+IMPORT_CHUNK_SIZE = 1000
 
 
 class IsAuthenticatedStudent(BasePermission):
@@ -31,17 +43,109 @@ class IsAdminUser(BasePermission):
 
 
 class StudentJWTAuthentication(JWTAuthentication):
-    """Custom JWT authentication that validates student tokens."""
+    """JWT authentication for student tokens; ``request.user`` is a ``StudentPrincipal``."""
     
     def get_user(self, validated_token):
         student_id = validated_token.get("student_id")
         if not student_id:
             raise InvalidToken("Token contained no recognizable user identification")
-        try:
-            student = Student.objects.get(id=student_id)
-        except Student.DoesNotExist:
+        principal = get_student_principal(student_id)
+        if principal is None:
+            raise InvalidToken("Student not found")
+        return principal
+
+    async def aauthenticate(self, request):
+        """``authenticate`` for async views (plain ``HttpRequest``), or ``None`` without a token."""
+        header = self.get_header(request)
+        raw_token = self.get_raw_token(header) if header is not None else None
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        student_id = validated_token.get("student_id")
+        if not student_id:
+            raise InvalidToken("Token contained no recognizable user identification")
+        principal = await aget_student_principal(student_id)
+        if principal is None:
             raise InvalidToken("Student not found")
-        return student
+        return principal, validated_token
+
+
+def _split_paths(paths):
+    """``{"a", "a.b", "c"}`` -> ``{"a": {"b"}, "c": set()}``."""
+    tree = {}
+    for path in paths:
+        head, _, rest = path.partition(".")
+        tree.setdefault(head, set())
+        if rest:
+            tree[head].add(rest)
+    return tree
+
+
+def _nested(field):
+    """The nested ModelSerializer behind ``field`` (single or many), else None."""
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    return field if isinstance(field, serializers.ModelSerializer) else None
+
+
+def prune_fields(serializer, fields=None, expand=frozenset()):
+    """Drop serializer fields in place for sparse fieldsets.
+
+    - ``fields``: keep only these (dotted names select inside nested serializers);
+      ``None`` keeps every plain field
+    - ``expand``: nested serializers to keep; without ``fields`` the others are dropped,
+      and expanded serializers are pruned the same way one level down
+    """
+    wanted = _split_paths(fields) if fields is not None else None
+    expanded = _split_paths(expand)
+    for name, field in list(serializer.fields.items()):
+        nested = _nested(field)
+        if wanted is not None:
+            keep = name in wanted or name in expanded
+        else:
+            keep = nested is None or name in expanded
+        if not keep:
+            del serializer.fields[name]
+        elif nested is not None:
+            sub_fields = wanted.get(name) if wanted is not None else None
+            if sub_fields:
+                prune_fields(nested, sub_fields, expanded.get(name, ()))
+            elif name in expanded:
+                prune_fields(nested, None, expanded[name])
+    return serializer
+
+
+def trim_related(queryset, serializer):
+    """Drop ``select_related`` / ``prefetch_related`` lookups for relations the serializer no longer reads."""
+    used = set()
+    for field in serializer.fields.values():
+        # Plain *_id fields read the local FK column and need no join
+        if isinstance(field, PrimaryKeyRelatedField) or field.write_only:
+            continue
+        used.add(field.source.partition(".")[0])
+
+    select = queryset.query.select_related
+    if isinstance(select, dict):
+        paths = []
+
+        def walk(tree, prefix):
+            for key, sub in tree.items():
+                if sub:
+                    walk(sub, f"{prefix}{key}__")
+                else:
+                    paths.append(f"{prefix}{key}")
+
+        walk({k: v for k, v in select.items() if k in used}, "")
+        queryset = queryset.select_related(None)
+        if paths:  # select_related() without arguments would follow every FK
+            queryset = queryset.select_related(*paths)
+
+    prefetch = [
+        lookup
+        for lookup in queryset._prefetch_related_lookups
+        if getattr(lookup, "prefetch_through", lookup).split("__")[0] in used
+    ]
+    return queryset.prefetch_related(None).prefetch_related(*prefetch)
 
 
 class FullCrudViewSet(
@@ -52,12 +156,163 @@ class FullCrudViewSet(
     mixins.DestroyModelMixin,
     viewsets.GenericViewSet,
 ):
-    """Full CRUD for internal use (no auth layer yet - secure before prod)."""
+    """Full CRUD for internal use (no auth layer yet - secure before prod).
+
+    - ``?fields=id,scheduled_time,instructor.first_name`` and ``?expand=enrollment`` prune
+      list/retrieve responses (see ``prune_fields``) and skip the joins/prefetches of
+      dropped relations
+    - Set ``fast_list_serializer`` (a ``ValuesSerializer``) to serve ``list`` from
+      ``.values()`` rows instead of instantiating models and nested serializers
+    """
+
+    fast_list_serializer = None
+    sparse_fields_param = "fields"
+    expand_param = "expand"
+
+    def get_sparse_fieldsets(self):
+        """``(fields, expand)`` requested for a list/retrieve call, or None."""
+        request = getattr(self, "request", None)
+        if request is None or self.action not in ("list", "retrieve"):
+            return None
+        params = request.query_params
+        if self.sparse_fields_param not in params and self.expand_param not in params:
+            return None
+
+        def names(param):
+            return {name.strip() for name in params.get(param, "").split(",") if name.strip()}
+
+        fields = names(self.sparse_fields_param) if self.sparse_fields_param in params else None
+        return fields, names(self.expand_param)
 
-    pass
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        sparse = self.get_sparse_fieldsets()
+        if sparse is not None:
+            prune_fields(getattr(serializer, "child", serializer), *sparse)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_sparse_fieldsets() is not None:
+            queryset = trim_related(queryset, self.get_serializer())
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        fast = self.fast_list_serializer
+        if fast is None:
+            return super().list(request, *args, **kwargs)
+        serializer = self.get_serializer()
+        cursor_fields = [name.lstrip("-") for name in getattr(self, "cursor_ordering", ())]
+        if ChangesPagination.cursor_query_param in request.query_params:
+            cursor_fields += ChangesPagination.ordering
+        rows = fast.values(self.filter_queryset(self.get_queryset()), serializer, cursor_fields)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast.serialize(page, serializer))
+        return response.Response(fast.serialize(rows, serializer))
+
+
+class BulkTransitionMixin:
+    """``POST <list>/transition/``: move bookings to COMPLETED / CANCELED in one UPDATE.
+
+    The body is ``{"status": ..., "ids": [...]}``; without ``ids`` the list filters in
+    the query string select the rows (at least one filterset field or
+    ``transition_filter_params`` entry is required; ``?page=`` and the like don't count).
+    Responds with a result per booking, see ``transitions.apply_transition``.
+    """
+
+    # Query parameters ``get_queryset`` filters on outside the filterset
+    transition_filter_params: tuple[str, ...] = ()
+
+    def _filters_rows(self, request) -> bool:
+        names = set(self.transition_filter_params)
+        for backend in self.filter_backends:
+            if issubclass(backend, DjangoFilterBackend):
+                filterset_class = backend().get_filterset_class(self, self.get_queryset())
+                if filterset_class is not None:
+                    names.update(filterset_class.base_filters)
+        return any(request.query_params.get(name) for name in names)
+
+    @decorators.action(detail=False, methods=["post"], url_path="transition")
+    def transition(self, request):
+        serializer = BulkTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        target, ids = serializer.validated_data["status"], serializer.validated_data.get("ids")
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if ids is None:
+            if not self._filters_rows(request):
+                return response.Response(
+                    {"detail": "Provide ids or filter the rows to transition"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if queryset.count() > MAX_BULK_TRANSITION:
+                return response.Response(
+                    {"detail": f"At most {MAX_BULK_TRANSITION} rows can be transitioned at once"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        results = apply_transition(queryset, target, ids)
+        return response.Response(
+            {
+                "status": target,
+                "updated": sum(1 for result in results if result["result"] == "updated"),
+                "results": results,
+            }
+        )
+
+
+class CalendarFeedMixin:
+    """``GET <detail>/calendar-feed/``: the tokenized ``.ics`` feed URL of the object (admins).
+
+    Set ``calendar_feed_kind`` to a key of ``ical.FEED_MODELS``.
+    """
+
+    calendar_feed_kind: str
+
+    @decorators.action(detail=True, methods=["get"], url_path="calendar-feed", permission_classes=[IsAdminUser])
+    def calendar_feed(self, request, pk=None):
+        obj = self.get_object()
+        return response.Response({"url": feed_url(request, self.calendar_feed_kind, obj.pk)})
 
 
 class QSearchFilter(SearchFilter):
     """Use 'q' as the search query parameter to align with frontend SearchInput."""
 
     search_param = "q"
+
+
+class TrigramSearchFilter(QSearchFilter):
+    """``?q=`` search ranked by ``pg_trgm`` word similarity on PostgreSQL.
+
+    Every search term must match one of ``search_fields`` as a substring or, to
+    tolerate typos, by trigram word similarity; both predicates on ``UPPER(field)``
+    are served by the GIN ``gin_trgm_ops`` indexes from migration 0027. Results are
+    ordered by summed similarity; list it after ``OrderingFilter`` so ``?ordering=``
+    only breaks ties. Other databases (SQLite in tests) use ``SearchFilter``.
+    """
+
+    rank_annotation = "_search_rank"
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        terms = self.get_search_terms(request)
+        if not search_fields or not terms or connections[queryset.db].vendor != "postgresql":
+            return super().filter_queryset(request, queryset, view)
+
+        from django.contrib.postgres.lookups import TrigramWordSimilar
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        rank = None
+        for term in terms:
+            matches = Q()
+            similarities = []
+            for field in search_fields:
+                column = Upper(field)
+                matches |= Q(**{f"{field}__icontains": term}) | Q(TrigramWordSimilar(column, term))
+                similarities.append(TrigramWordSimilarity(term, column))
+            queryset = queryset.filter(matches)
+            best = similarities[0] if len(similarities) == 1 else Greatest(*similarities)
+            rank = best if rank is None else rank + best
+        queryset = queryset.annotate(**{self.rank_annotation: rank})
+        return queryset.order_by(f"-{self.rank_annotation}", *queryset.query.order_by)
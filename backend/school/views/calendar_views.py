@@ -0,0 +1,68 @@
+"""iCalendar feed endpoints (see ``school.ical``).
+
+- ``calendar/<token>.ics``: the feed itself, authenticated by its token only so that
+  calendar apps can subscribe; answers 304 to ``If-None-Match`` / ``If-Modified-Since``
+- ``student/calendar-feed/``: the signed-in student's own feed URL
+"""
+
+from datetime import datetime
+from datetime import timezone as dt_timezone
+
+from django.http import Http404, StreamingHttpResponse
+from django.views.decorators.http import condition, require_GET
+from rest_framework import decorators, response
+
+from .. import ical
+from .base import IsAuthenticatedStudent, StudentJWTAuthentication
+
+
+def _feed_version(request, kind, pk) -> int:
+    # Read once per request so the validators and the body agree
+    if not hasattr(request, "_calendar_feed_version"):
+        request._calendar_feed_version = ical.feed_version(kind, pk)
+    return request._calendar_feed_version
+
+
+def _etag(request, token):
+    feed = ical.resolve_feed_token(token)
+    if feed is None:
+        return None
+    kind, pk = feed
+    return f'"{kind}-{pk}-{_feed_version(request, kind, pk)}"'
+
+
+def _last_modified(request, token):
+    feed = ical.resolve_feed_token(token)
+    if feed is None:
+        return None
+    return datetime.fromtimestamp(_feed_version(request, *feed) / 1e9, tz=dt_timezone.utc)
+
+
+@require_GET
+@condition(etag_func=_etag, last_modified_func=_last_modified)
+def calendar_feed(request, token):
+    feed = ical.resolve_feed_token(token)
+    if feed is None:
+        raise Http404("Unknown calendar feed")
+    kind, pk = feed
+    participant = ical.FEED_MODELS[kind].objects.filter(pk=pk).first()
+    if participant is None:
+        raise Http404("Unknown calendar feed")
+
+    resp = StreamingHttpResponse(
+        ical.render_feed(
+            kind, pk, str(participant), request.get_host(), _feed_version(request, kind, pk)
+        ),
+        content_type="text/calendar; charset=utf-8",
+    )
+    # Always revalidate: the validators make that a cheap 304
+    resp["Cache-Control"] = "private, no-cache"
+    return resp
+
+
+@decorators.api_view(["GET"])  # type: ignore[misc]
+@decorators.authentication_classes([StudentJWTAuthentication])
+@decorators.permission_classes([IsAuthenticatedStudent])
+def student_calendar_feed(request):
+    """URL of the authenticated student's ``.ics`` feed."""
+    return response.Response({"url": ical.feed_url(request, "student", request.user.id)})
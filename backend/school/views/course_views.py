@@ -11,6 +11,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import decorators, response, status
 from rest_framework.filters import OrderingFilter
 
+from ..fast_serializers import ValuesSerializer
 from ..models import Course, Enrollment
 from ..serializers import CourseSerializer, EnrollmentSerializer
 from .base import FullCrudViewSet
@@ -119,6 +120,7 @@ class EnrollmentViewSet(FullCrudViewSet):
         Enrollment.objects.select_related("student", "course").all().order_by("-enrollment_date")
     )
     serializer_class = EnrollmentSerializer
+    fast_list_serializer = ValuesSerializer(EnrollmentSerializer)
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = {
         "status": ["exact"],
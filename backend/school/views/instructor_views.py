@@ -10,17 +10,21 @@ from rest_framework.filters import OrderingFilter
 
 from ..models import Instructor, InstructorAvailability
 from ..serializers import InstructorSerializer, InstructorAvailabilitySerializer
-from .base import FullCrudViewSet, QSearchFilter
+from ..utils import chunked
+from ..validators import email_equals, existing_contacts, normalize_phone
+from .base import IMPORT_CHUNK_SIZE, CalendarFeedMixin, FullCrudViewSet, TrigramSearchFilter
 
 
-class InstructorViewSet(FullCrudViewSet):
+class InstructorViewSet(CalendarFeedMixin, FullCrudViewSet):
     """ViewSet for managing Instructor resources with CSV import/export."""
+
+    calendar_feed_kind = "instructor"
     
     queryset = Instructor.objects.all().order_by("-hire_date")
     serializer_class = InstructorSerializer
     # Enable filtering/sorting/searching; RA uses 'q' for free-text search
-    filter_backends = [DjangoFilterBackend, QSearchFilter, OrderingFilter]
-    search_fields = ["first_name", "last_name"]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, TrigramSearchFilter]
+    search_fields = ["first_name", "last_name", "email", "phone_number"]
 
     def get_queryset(self):
         """Filter instructors by license category if provided."""
@@ -28,7 +32,7 @@ class InstructorViewSet(FullCrudViewSet):
         if getattr(self, "request", None):
             category = (self.request.query_params.get("category") or "").strip()
             if category:
-                qs = qs.filter(license_categories__icontains=category)
+                qs = qs.licensed_for(category)
         return qs
 
     @decorators.action(detail=False, methods=["get"], url_path="export")
@@ -91,29 +95,47 @@ class InstructorViewSet(FullCrudViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         created_ids, updated_ids, errors = [], [], []
-        for idx, row in enumerate(reader, start=2):
-            data = {k: (row.get(k) or "").strip() for k in required}
-            email = data.get("email")
+        seen_emails, seen_phones = set(), set()
+        for chunk in chunked(enumerate(reader, start=2), IMPORT_CHUNK_SIZE):
+            rows = []
+            for idx, row in chunk:
+                data = {k: (row.get(k) or "").strip() for k in required}
+                try:
+                    data["phone_number"] = normalize_phone(data["phone_number"])
+                except Exception:
+                    pass  # left for the serializer to report
+                rows.append((idx, data))
+            # Existing instructors (upsert targets) and taken phones: one query per chunk
+            by_email, by_phone = existing_contacts(
+                Instructor, [data["email"] for _, data in rows], [data["phone_number"] for _, data in rows]
+            )
+            prechecked = {**self.get_serializer_context(), "contacts_prechecked": True}
 
-            # Use update_or_create to prevent duplicates based on email
-            try:
-                existing = Instructor.objects.filter(email=email).first()
-                if existing:
-                    serializer = self.get_serializer(existing, data=data)
-                    if serializer.is_valid():
-                        obj = serializer.save()
-                        updated_ids.append(obj.id)
-                    else:
-                        errors.append({"row": idx, "errors": serializer.errors})
-                else:
-                    serializer = self.get_serializer(data=data)
-                    if serializer.is_valid():
-                        obj = serializer.save()
-                        created_ids.append(obj.id)
+            for idx, data in rows:
+                email, phone = data["email"].lower(), data["phone_number"]
+                try:
+                    if email in seen_emails or phone in seen_phones:
+                        # An earlier row of this file already wrote it: check against the database
+                        existing = Instructor.objects.filter(email_equals(email)).first()
+                        context, conflict = self.get_serializer_context(), None
                     else:
-                        errors.append({"row": idx, "errors": serializer.errors})
-            except Exception as e:
-                errors.append({"row": idx, "errors": {"general": [str(e)]}})
+                        existing = by_email.get(email)
+                        owner = by_phone.get(phone)
+                        context = prechecked
+                        conflict = owner is not None and (existing is None or owner.pk != existing.pk)
+                    serializer = self.get_serializer(existing, data=data, context=context)
+                    if not serializer.is_valid() or conflict:
+                        row_errors = dict(serializer.errors)
+                        if conflict:
+                            row_errors.setdefault("phone_number", ["Phone number already registered"])
+                        errors.append({"row": idx, "errors": row_errors})
+                        continue
+                    obj = serializer.save()
+                    (updated_ids if existing else created_ids).append(obj.id)
+                    seen_emails.add(email)
+                    seen_phones.add(phone)
+                except Exception as e:
+                    errors.append({"row": idx, "errors": {"general": [str(e)]}})
 
         return response.Response(
             {
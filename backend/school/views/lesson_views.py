@@ -1,7 +1,8 @@
 """
 Lesson and Payment ViewSets.
 
-Handles CRUD operations for Lessons (driving practice) and Payments with CSV import/export.
+Handles CRUD operations for Lessons (driving practice) and Payments with CSV import/export,
+plus bulk lesson status transitions.
 """
 import csv
 from io import StringIO, TextIOWrapper
@@ -11,15 +12,19 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import decorators, response, status
 from rest_framework.filters import OrderingFilter
 
+from ..fast_serializers import ValuesSerializer
 from ..models import Lesson, Payment
 from ..serializers import LessonSerializer, PaymentSerializer
-from .base import FullCrudViewSet
+from .base import BulkTransitionMixin, FullCrudViewSet
 
 
-class LessonViewSet(FullCrudViewSet):
+class LessonViewSet(BulkTransitionMixin, FullCrudViewSet):
     queryset = Lesson.objects.select_related("enrollment__student", "instructor", "resource").all()
     serializer_class = LessonSerializer
+    fast_list_serializer = ValuesSerializer(LessonSerializer)
     filter_backends = [DjangoFilterBackend, OrderingFilter]
+    # Keyset order for ?cursor= pagination (see StandardResultsSetPagination)
+    cursor_ordering = ("-scheduled_time", "-id")
     filterset_fields = {
         "status": ["exact"],
         "scheduled_time": ["gte", "lte", "gt", "lt"],
@@ -30,6 +35,7 @@ class LessonViewSet(FullCrudViewSet):
         "enrollment__student": ["exact"],
         "enrollment__course": ["exact"],
     }
+    transition_filter_params = ("instructor_id", "resource")
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -167,6 +173,7 @@ class PaymentViewSet(FullCrudViewSet):
     queryset = Payment.objects.select_related("enrollment__student").all()
     serializer_class = PaymentSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
+    cursor_ordering = ("-payment_date", "-id")
     filterset_fields = {
         "payment_date": ["gte", "lte", "gt", "lt"],
         "payment_method": ["exact"],
@@ -13,7 +13,7 @@ from rest_framework.filters import OrderingFilter
 
 from ..models import Resource, Vehicle
 from ..serializers import ResourceSerializer, VehicleSerializer
-from .base import FullCrudViewSet
+from .base import CalendarFeedMixin, FullCrudViewSet, TrigramSearchFilter
 
 
 class VehicleViewSet(FullCrudViewSet):
@@ -119,10 +119,12 @@ class VehicleViewSet(FullCrudViewSet):
         )
 
 
-class ResourceViewSet(FullCrudViewSet):
+class ResourceViewSet(CalendarFeedMixin, FullCrudViewSet):
+    calendar_feed_kind = "resource"
     queryset = Resource.objects.all().order_by("name")
     serializer_class = ResourceSerializer
-    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, TrigramSearchFilter]
+    search_fields = ["name", "license_plate", "make", "model"]
     filterset_fields = {
         "is_available": ["exact"],
         "category": ["exact"],
@@ -2,9 +2,13 @@
 ScheduledClassPattern and ScheduledClass ViewSets.
 
 Handles CRUD operations for theory class patterns and scheduled classes with:
-- Pattern generation (generate-classes, regenerate-classes)
+- Pattern generation (generate-classes, diff-based regenerate-classes)
+- Series changes (shift / move / cancel generated classes from a date on)
+- Dry-run preview of a pattern with per-slot conflict / availability status
 - Student enrollment/unenrollment
 - Statistics and CSV export/import
+- Bulk status transitions of scheduled classes
+- Calendar range view including not yet materialized occurrences of open-ended patterns
 """
 import csv
 import logging
@@ -15,20 +19,37 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.http import HttpResponse
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import decorators, response, status
 from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 
-from ..enums import LessonStatus
+from ..enums import LessonStatus, RollupKind
+from ..fast_serializers import ValuesSerializer
 from ..models import ScheduledClass, ScheduledClassPattern, Student
 from ..notifications import (
     ClassGenerationNotificationTemplate,
+    ClassRemovedNotificationTemplate,
+    ClassUpdatedNotificationTemplate,
     StudentEnrollmentNotificationTemplate,
     notification_service,
 )
-from ..serializers import ScheduledClassPatternSerializer, ScheduledClassSerializer
-from .base import FullCrudViewSet, IsAdminUser
+from .. import regeneration
+from ..rollups import schedule_rebuild
+from ..horizon import CALENDAR_FIELDS, virtual_classes
+from ..ical import booking_participants, bookings_changed
+from ..preview import preview_pattern
+from ..serializers import (
+    CalendarRangeSerializer,
+    PatternPreviewSerializer,
+    ScheduledClassPatternSerializer,
+    ScheduledClassSerializer,
+    SeriesChangeSerializer,
+)
+from ..series import SeriesChange, SeriesConflict, apply_series_change
+from ..services import pattern_statistics
+from .base import BulkTransitionMixin, FullCrudViewSet, IsAdminUser
 
 
 logger = logging.getLogger(__name__)
@@ -37,6 +58,7 @@ logger = logging.getLogger(__name__)
 class ScheduledClassPatternViewSet(FullCrudViewSet):
     queryset = ScheduledClassPattern.objects.all().order_by("-created_at")
     serializer_class = ScheduledClassPatternSerializer
+    fast_list_serializer = ValuesSerializer(ScheduledClassPatternSerializer)
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = {
         "course": ["exact"],
@@ -46,7 +68,7 @@ class ScheduledClassPatternViewSet(FullCrudViewSet):
     }
 
     def get_permissions(self):
-        if self.action in ["create", "update", "partial_update", "destroy"]:
+        if self.action in ["create", "update", "partial_update", "destroy", "series"]:
             return [IsAdminUser()]
         return [IsAuthenticated()]
 
@@ -68,9 +90,11 @@ class ScheduledClassPatternViewSet(FullCrudViewSet):
         if settings.DEBUG:
             logger.info(f"Starting generate-classes action for pattern '{pattern.name}' (ID: {pattern.id}) by user {request.user}")
         
+        # Open-ended patterns only get classes up to their rolling horizon
+        until = pattern.materialization_end()
         try:
             pattern.validate_generation()  # Validate for overlaps
-            classes = pattern.generate_scheduled_classes()
+            classes = pattern.generate_scheduled_classes(until=until)
         except (ValueError, ValidationError) as e:
             logger.error(f"Class generation validation failed for pattern '{pattern.name}': {str(e)}")
             return response.Response({
@@ -78,6 +102,12 @@ class ScheduledClassPatternViewSet(FullCrudViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         created_classes = ScheduledClass.objects.bulk_create(classes)
+        schedule_rebuild(RollupKind.CLASS, [c.scheduled_time for c in created_classes])
+        bookings_changed(booking_participants(ScheduledClass, [c.pk for c in created_classes]))
+        if until is not None:
+            ScheduledClassPattern.objects.filter(pk=pattern.pk).update(
+                materialized_until=until, updated_at=timezone.now()
+            )
         
         # Auto-enroll pattern students in generated classes
         enrollment_results = self._auto_enroll_students(pattern, created_classes)
@@ -98,9 +128,42 @@ class ScheduledClassPatternViewSet(FullCrudViewSet):
             "enrollment_results": enrollment_results
         }, status=status.HTTP_200_OK)
 
+    @decorators.action(detail=False, methods=["post"], url_path="preview")
+    def preview(self, request):
+        """Expand the posted pattern fields and check every would-be class; nothing is written.
+
+        Pass ``pattern_id`` when editing so the pattern's current classes are not reported
+        as conflicts.
+        """
+        serializer = PatternPreviewSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            result = preview_pattern(serializer.to_pattern())
+        except ValueError as e:
+            return response.Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return response.Response(result)
+
+    @decorators.action(detail=True, methods=["post"], url_path="series")
+    def series(self, request, pk=None):
+        """Shift, move or cancel this pattern's SCHEDULED classes from ``from_date`` on.
+
+        All affected classes are validated together; any conflict rejects the whole
+        change with a per-class error list. Rosters are kept. Open-ended patterns only
+        take changes up to ``materialized_until`` or an open cancel (``series.check_horizon``).
+        """
+        pattern = self.get_object()
+        serializer = SeriesChangeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            ids = apply_series_change(pattern, SeriesChange(**serializer.validated_data))
+        except SeriesConflict as e:
+            return response.Response({"classes": e.conflicts}, status=status.HTTP_400_BAD_REQUEST)
+        logger.info(f"Series change {request.data} on pattern '{pattern.name}' updated {len(ids)} classes")
+        return response.Response({"id": pattern.id, "updated": len(ids), "ids": ids})
+
     @decorators.action(detail=True, methods=["post"], url_path="regenerate-classes")
     def regenerate_classes(self, request, pk=None):
-        """Delete existing generated classes and create new ones."""
+        """Bring existing generated classes in line with the pattern (see ``regeneration``)."""
         start_time = time.time()
         
         pattern = self.get_object()
@@ -108,41 +171,50 @@ class ScheduledClassPatternViewSet(FullCrudViewSet):
         if settings.DEBUG:
             logger.info(f"Starting regenerate-classes action for pattern '{pattern.name}' (ID: {pattern.id}) by user {request.user}")
         
-        # Delete existing classes for this pattern
-        delete_result = ScheduledClass.objects.filter(pattern=pattern).delete()
-        deleted_count = delete_result[1].get('school.ScheduledClass', 0)
-        
-        if settings.DEBUG:
-            logger.info(f"Deleted {deleted_count} existing classes for pattern '{pattern.name}'")
-        
-        # Generate new classes
         try:
-            pattern.validate_generation()  # Validate for overlaps
-            classes = pattern.generate_scheduled_classes()
+            result = regeneration.regenerate_classes(pattern)
         except (ValueError, ValidationError) as e:
             logger.error(f"Class generation validation failed for pattern '{pattern.name}': {str(e)}")
             return response.Response({
                 "error": str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        created_classes = ScheduledClass.objects.bulk_create(classes)
-        
-        # Auto-enroll pattern students in generated classes
-        enrollment_results = self._auto_enroll_students(pattern, created_classes)
+        enrollment_results = {
+            'total_students': pattern.students.count(),
+            'enrolled': len(result.enrolled),
+            'failed': result.not_enrolled,
+            'errors': []
+        }
+        generated_count = len(result.created) + len(result.updated) + result.unchanged
         
         action_time = time.time() - start_time
         
         if settings.DEBUG:
-            logger.info(f"Completed regenerate-classes action for pattern '{pattern.name}' in {action_time:.3f}s - deleted {deleted_count}, created {len(classes)} classes")
+            logger.info(
+                f"Completed regenerate-classes action for pattern '{pattern.name}' in {action_time:.3f}s - "
+                f"created {len(result.created)}, updated {len(result.updated)}, deleted {len(result.deleted)}, "
+                f"unchanged {result.unchanged} classes"
+            )
             logger.info(f"Auto-enrollment results: {enrollment_results}")
         
-        # Send notifications
-        self._send_generation_notifications(pattern, created_classes, enrollment_results)
+        # Only changed classes, their rosters and new roster entries are notified
+        if result.created or result.updated or result.deleted or result.enrolled:
+            self._send_generation_notifications(
+                pattern,
+                result.created + result.updated,
+                enrollment_results,
+                enrolled=result.enrolled,
+                updated=result.updated_rosters,
+                deleted=result.deleted_rosters,
+            )
         
         return response.Response({
             "id": pattern.id,
-            "deleted_count": deleted_count,
-            "generated_count": len(classes),
+            "deleted_count": len(result.deleted),
+            "generated_count": generated_count,
+            "created_count": len(result.created),
+            "updated_count": len(result.updated),
+            "unchanged_count": result.unchanged,
             "enrollment_results": enrollment_results
         }, status=status.HTTP_200_OK)
 
@@ -189,7 +261,9 @@ class ScheduledClassPatternViewSet(FullCrudViewSet):
             
         return results
 
-    def _send_generation_notifications(self, pattern, created_classes, enrollment_results):
+    def _send_generation_notifications(
+        self, pattern, created_classes, enrollment_results, enrolled=None, updated=(), deleted=()
+    ):
         """
         Send notifications about class generation.
         
@@ -197,6 +271,9 @@ class ScheduledClassPatternViewSet(FullCrudViewSet):
             pattern: ScheduledClassPattern instance
             created_classes: List of created ScheduledClass instances
             enrollment_results: Results from auto-enrollment
+            enrolled: (class, student) pairs to notify; defaults to the rosters of created_classes
+            updated: (class, student) pairs of classes whose details changed
+            deleted: (class, student) pairs of classes removed from the schedule
         """
         # Send notification to pattern instructor
         instructor_template = ClassGenerationNotificationTemplate()
@@ -213,64 +290,68 @@ class ScheduledClassPatternViewSet(FullCrudViewSet):
         if enrollment_results['enrolled'] > 0:
             student_template = StudentEnrollmentNotificationTemplate()
             
-            ScheduledClassStudent = ScheduledClass.students.through
-            relations = ScheduledClassStudent.objects.filter(
-                scheduledclass__in=created_classes
-            ).select_related('student')
-            
-            class_students = {}
-            for rel in relations:
-                if rel.scheduledclass_id not in class_students:
-                    class_students[rel.scheduledclass_id] = []
-                class_students[rel.scheduledclass_id].append(rel.student)
-            
-            for scheduled_class in created_classes:
-                students = class_students.get(scheduled_class.id, [])
+            if enrolled is None:
+                ScheduledClassStudent = ScheduledClass.students.through
+                relations = ScheduledClassStudent.objects.filter(
+                    scheduledclass__in=created_classes
+                ).select_related('student')
                 
-                for student in students:
-                    notification_service.send_notification(
-                        template=student_template,
-                        recipients=[student],
-                        class_name=scheduled_class.name,
-                        instructor_name=f"{pattern.instructor.first_name} {pattern.instructor.last_name}",
-                        scheduled_time=scheduled_class.scheduled_time.strftime('%Y-%m-%d %H:%M'),
-                        location=pattern.resource.name if pattern.resource else "TBD"
-                    )
+                class_students = {}
+                for rel in relations:
+                    if rel.scheduledclass_id not in class_students:
+                        class_students[rel.scheduledclass_id] = []
+                    class_students[rel.scheduledclass_id].append(rel.student)
+                enrolled = [
+                    (scheduled_class, student)
+                    for scheduled_class in created_classes
+                    for student in class_students.get(scheduled_class.id, [])
+                ]
+            
+            for scheduled_class, student in enrolled:
+                notification_service.send_notification(
+                    template=student_template,
+                    recipients=[student],
+                    class_name=scheduled_class.name,
+                    instructor_name=f"{pattern.instructor.first_name} {pattern.instructor.last_name}",
+                    scheduled_time=scheduled_class.scheduled_time.strftime('%Y-%m-%d %H:%M'),
+                    location=pattern.resource.name if pattern.resource else "TBD"
+                )
+
+        # Updated classes follow the pattern again, so its instructor and resource apply
+        updated_template = ClassUpdatedNotificationTemplate()
+        for scheduled_class, student in updated:
+            notification_service.send_notification(
+                template=updated_template,
+                recipients=[student],
+                class_name=scheduled_class.name,
+                instructor_name=f"{pattern.instructor.first_name} {pattern.instructor.last_name}",
+                scheduled_time=scheduled_class.scheduled_time.strftime('%Y-%m-%d %H:%M'),
+                location=pattern.resource.name if pattern.resource else "TBD"
+            )
+
+        removed_template = ClassRemovedNotificationTemplate()
+        for scheduled_class, student in deleted:
+            notification_service.send_notification(
+                template=removed_template,
+                recipients=[student],
+                class_name=scheduled_class.name,
+                scheduled_time=scheduled_class.scheduled_time.strftime('%Y-%m-%d %H:%M'),
+            )
 
     @decorators.action(detail=True, methods=["get"], url_path="statistics")
     def get_statistics(self, request, pk=None):
         """Get statistics for this pattern."""
         pattern = self.get_object()
-        
-        classes = ScheduledClass.objects.filter(pattern=pattern)
-        
-        total_classes = classes.count()
-        scheduled_classes = classes.filter(status=LessonStatus.SCHEDULED.value).count()
-        completed_classes = classes.filter(status=LessonStatus.COMPLETED.value).count()
-        cancelled_classes = classes.filter(status=LessonStatus.CANCELED.value).count()
-        
-        total_enrollments = pattern.students.count()
-        
-        avg_students_per_class = 0
-        if total_classes > 0:
-            avg_students_per_class = total_enrollments
-        
-        total_capacity = sum(cls.max_students or 0 for cls in classes)
-        capacity_utilization = 0
-        if total_capacity > 0:
-            capacity_utilization = (total_enrollments / total_capacity) * 100
-        
-        return response.Response({
-            "pattern_id": pattern.id,
-            "pattern_name": pattern.name,
-            "total_classes": total_classes,
-            "scheduled_classes": scheduled_classes,
-            "completed_classes": completed_classes,
-            "cancelled_classes": cancelled_classes,
-            "total_enrolled_students": total_enrollments,
-            "average_students_per_class": round(avg_students_per_class, 2),
-            "capacity_utilization_percent": round(capacity_utilization, 2),
-        })
+        return response.Response(pattern_statistics([pattern])[0])
+
+    @decorators.action(detail=False, methods=["get"], url_path="statistics")
+    def list_statistics(self, request):
+        """Statistics for every (filtered, paginated) pattern in one grouped query."""
+        queryset = self.filter_queryset(self.get_queryset()).only("id", "name")
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(pattern_statistics(page))
+        return response.Response(pattern_statistics(queryset))
 
     @decorators.action(detail=False, methods=["get"], url_path="export")
     def export_csv(self, request):
@@ -313,10 +394,12 @@ class ScheduledClassPatternViewSet(FullCrudViewSet):
         return resp
 
 
-class ScheduledClassViewSet(FullCrudViewSet):
+class ScheduledClassViewSet(BulkTransitionMixin, FullCrudViewSet):
     queryset = ScheduledClass.objects.all().order_by("scheduled_time")
     serializer_class = ScheduledClassSerializer
+    fast_list_serializer = ValuesSerializer(ScheduledClassSerializer)
     filter_backends = [DjangoFilterBackend, OrderingFilter]
+    cursor_ordering = ("scheduled_time", "id")
     filterset_fields = {
         "pattern__course": ["exact"],
         "pattern__instructor": ["exact"],
@@ -325,6 +408,32 @@ class ScheduledClassViewSet(FullCrudViewSet):
         "scheduled_time": ["gte", "lte", "date"],
     }
 
+    @decorators.action(detail=False, methods=["get"], url_path="calendar")
+    def calendar(self, request):
+        """Classes in ``[start, end)`` plus virtual (``id`` null) occurrences of open-ended patterns.
+
+        Takes the list filters; the result is one unpaginated list ordered by time.
+        """
+        params = CalendarRangeSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        start, end = params.validated_data["start"], params.validated_data["end"]
+
+        rows = list(
+            self.filter_queryset(self.get_queryset())
+            .filter(scheduled_time__gte=start, scheduled_time__lt=end)
+            .values(*CALENDAR_FIELDS)
+        )
+        for row in rows:
+            row["virtual"] = False
+        if request.query_params.get("status") in (None, "", LessonStatus.SCHEDULED.value):
+            patterns = ScheduledClassPattern.objects.all()
+            for param in ("pattern__course", "pattern__instructor", "pattern__resource"):
+                if request.query_params.get(param):
+                    patterns = patterns.filter(**{param.removeprefix("pattern__"): request.query_params[param]})
+            rows += virtual_classes(patterns, start, end)
+        rows.sort(key=lambda row: row["scheduled_time"])
+        return response.Response(rows)
+
     @decorators.action(detail=True, methods=["post"], url_path="enroll")
     def enroll_student(self, request, pk=None):
         """Enroll a student in a scheduled class."""
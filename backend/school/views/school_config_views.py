@@ -1,8 +1,13 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.http import HttpResponse
+from django.utils.cache import parse_etags
 from rest_framework import decorators, mixins, response, status, viewsets
 from rest_framework.permissions import AllowAny
 
 from .base import FullCrudViewSet
+from ..config_cache import cached_config
+from ..images import schedule_variants
+from ..model_validators import validate_landing_image, validate_school_logo
 from ..models import SchoolConfig
 from ..serializers import SchoolConfigSerializer
 
@@ -16,6 +21,8 @@ class SchoolConfigViewSet(
     ViewSet for SchoolConfig singleton model.
     Supports GET and PUT operations only.
     Always returns/updates the singleton instance (pk=1).
+    GET is served from ``config_cache`` with an ETag; a matching ``If-None-Match``
+    gets a 304.
     """
 
     queryset = SchoolConfig.objects.all()
@@ -29,9 +36,20 @@ class SchoolConfigViewSet(
 
     def list(self, request, *args, **kwargs):
         """Override list to return singleton object instead of list."""
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return response.Response(serializer.data)
+        etag, data = cached_config(
+            request.build_absolute_uri("/"),
+            lambda: self.get_serializer(self.get_object()).data,
+        )
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            etags = [tag.removeprefix("W/") for tag in parse_etags(if_none_match)]
+            if etag in etags or "*" in etags:
+                return response.Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return response.Response(data, headers=headers)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.list(request, *args, **kwargs)
 
     @decorators.action(detail=False, methods=["post"], url_path="upload_logo")
     def upload_logo(self, request):
@@ -45,9 +63,19 @@ class SchoolConfigViewSet(
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        try:
+            validate_school_logo(request.FILES["logo"])
+        except DjangoValidationError as exc:
+            return response.Response(
+                {"error": " ".join(exc.messages)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         config = self.get_object()
         config.school_logo = request.FILES["logo"]
         config.save()
+        # Resized copies are built off the request thread once this commits
+        schedule_variants(config, "school_logo")
 
         serializer = self.get_serializer(config)
         return response.Response(
@@ -70,9 +98,19 @@ class SchoolConfigViewSet(
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        try:
+            validate_landing_image(request.FILES["image"])
+        except DjangoValidationError as exc:
+            return response.Response(
+                {"error": " ".join(exc.messages)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         config = self.get_object()
         config.landing_image = request.FILES["image"]
         config.save()
+        # Resized copies are built off the request thread once this commits
+        schedule_variants(config, "landing_image")
 
         serializer = self.get_serializer(config)
         return response.Response(
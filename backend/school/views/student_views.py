@@ -3,6 +3,7 @@
 import csv
 from io import StringIO, TextIOWrapper
 
+from django.db import IntegrityError, transaction
 from django.http import HttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import decorators, response, status
@@ -10,24 +11,28 @@ from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import AllowAny
 
 from ..models import Student
-from ..serializers import StudentSerializer
-from ..validators import normalize_phone
-from .base import FullCrudViewSet, QSearchFilter
+from ..passwords import hash_passwords
+from ..serializers import StudentSerializer, student_integrity_errors
+from ..utils import chunked
+from ..validators import existing_contacts, normalize_phone
+from .base import IMPORT_CHUNK_SIZE, CalendarFeedMixin, FullCrudViewSet, TrigramSearchFilter
 
 
-class StudentViewSet(FullCrudViewSet):
+class StudentViewSet(CalendarFeedMixin, FullCrudViewSet):
     """ViewSet for managing Student resources with CSV import/export."""
+
+    calendar_feed_kind = "student"
     
     queryset = Student.objects.all().order_by("-enrollment_date")
     serializer_class = StudentSerializer
     permission_classes = [AllowAny]
-    filter_backends = [DjangoFilterBackend, QSearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, TrigramSearchFilter]
 
     filterset_fields = {
         "status": ["exact"],
         "enrollment_date": ["gte", "lte", "gt", "lt"],
     }
-    search_fields = ["first_name", "last_name"]
+    search_fields = ["first_name", "last_name", "email", "phone_number"]
 
     @decorators.action(detail=False, methods=["get"], url_path="export")
     def export_csv(self, request):
@@ -99,37 +104,80 @@ class StudentViewSet(FullCrudViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        created_ids = []
+        pending = []  # (row number, validated data)
         errors = []
-        for idx, row in enumerate(reader, start=2):
-            phone = (row.get("phone_number") or "").strip()
-            try:
-                phone = normalize_phone(phone)
-            except Exception as e:
-                errors.append({"row": idx, "errors": {"phone_number": [str(e)]}})
-                continue
-
-            # Build data dict with required fields
-            data = {
-                "first_name": row.get("first_name", "").strip(),
-                "last_name": row.get("last_name", "").strip(),
-                "email": row.get("email", "").strip(),
-                "phone_number": phone,
-                "date_of_birth": (row.get("date_of_birth") or "").strip(),
-                "password": (row.get("password") or "").strip(),
-            }
-
-            # Add optional fields only if they have non-blank values
-            status_val = (row.get("status") or "").strip()
-            if status_val:
-                data["status"] = status_val
-
-            serializer = self.get_serializer(data=data)
-            if serializer.is_valid():
-                obj = serializer.save()
-                created_ids.append(obj.id)
-            else:
-                errors.append({"row": idx, "errors": serializer.errors})
+        seen_emails, seen_phones = set(), set()
+        for chunk in chunked(enumerate(reader, start=2), IMPORT_CHUNK_SIZE):
+            rows = []
+            for idx, row in chunk:
+                phone = (row.get("phone_number") or "").strip()
+                try:
+                    phone = normalize_phone(phone)
+                except Exception as e:
+                    errors.append({"row": idx, "errors": {"phone_number": [str(e)]}})
+                    continue
+
+                # Build data dict with required fields
+                data = {
+                    "first_name": row.get("first_name", "").strip(),
+                    "last_name": row.get("last_name", "").strip(),
+                    "email": row.get("email", "").strip(),
+                    "phone_number": phone,
+                    "date_of_birth": (row.get("date_of_birth") or "").strip(),
+                    "password": (row.get("password") or "").strip(),
+                }
+
+                # Add optional fields only if they have non-blank values
+                status_val = (row.get("status") or "").strip()
+                if status_val:
+                    data["status"] = status_val
+                rows.append((idx, data))
+
+            # One query for the whole chunk instead of two exists() per row; rows are
+            # inserted together at the end, so duplicates within the file count too
+            taken_emails, taken_phones = existing_contacts(
+                Student, [data["email"] for _, data in rows], [data["phone_number"] for _, data in rows]
+            )
+            context = {**self.get_serializer_context(), "contacts_prechecked": True}
+            for idx, data in rows:
+                email = data["email"].lower()
+                duplicates = {}
+                if email in taken_emails or email in seen_emails:
+                    duplicates["email"] = ["Email already registered"]
+                if data["phone_number"] in taken_phones or data["phone_number"] in seen_phones:
+                    duplicates["phone_number"] = ["Phone number already registered"]
+                serializer = self.get_serializer(data=data, context=context)
+                if not serializer.is_valid() or duplicates:
+                    row_errors = dict(serializer.errors)
+                    for field, messages in duplicates.items():
+                        row_errors.setdefault(field, messages)
+                    errors.append({"row": idx, "errors": row_errors})
+                    continue
+                seen_emails.add(email)
+                seen_phones.add(data["phone_number"])
+                pending.append((idx, serializer.validated_data))
+
+        # Hashing dominates import time: hash the whole batch in parallel, then insert once
+        passwords = hash_passwords([validated["password"] for _, validated in pending])
+        students = [
+            (idx, Student(**{**validated, "password": password}))
+            for (idx, validated), password in zip(pending, passwords)
+        ]
+        try:
+            with transaction.atomic():
+                Student.objects.bulk_create([student for _, student in students], batch_size=500)
+        except IntegrityError:
+            # A concurrent write took an email/phone: insert row by row to report which
+            for idx, student in students:
+                student.pk = None
+                try:
+                    with transaction.atomic():
+                        student.save()
+                except IntegrityError as e:
+                    student.pk = None
+                    errors.append({"row": idx, "errors": student_integrity_errors(e)})
+        errors.sort(key=lambda error: error["row"])
+        created_ids = [student.pk for _, student in students if student.pk is not None]
 
         return response.Response(
             {
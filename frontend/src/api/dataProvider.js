@@ -63,13 +63,59 @@ const extractFieldErrors = (body) => {
   return map;
 };
 
+// Keyset lists (filter pagination: 'cursor') are paged by cursor, react-admin pages by
+// number: remember the cursor that starts each page, per resource and query.
+const cursorPages = {};
+
+// Leading sort of each keyset list (the view's cursor_ordering). The cursor follows that
+// order only, so any other sort is served with page numbers instead.
+const KEYSET_ORDERING = { lessons: '-scheduled_time', payments: '-payment_date', scheduledclasses: 'scheduled_time' };
+
+const keysetSortMatches = (resource, sort) => {
+  if (!sort || !sort.field) return true;
+  return KEYSET_ORDERING[resource] === (sort.order === 'DESC' ? `-${sort.field}` : sort.field);
+};
+
+const withoutCursorMode = (params) => {
+  const { pagination, ...filter } = params.filter;
+  return { ...params, filter };
+};
+
+const withPageCursor = (resource, params) => {
+  const page = (params.pagination && params.pagination.page) || 1;
+  const key = JSON.stringify({ filter: params.filter, sort: params.sort, perPage: params.pagination && params.pagination.perPage });
+  if (!cursorPages[resource] || cursorPages[resource].key !== key) {
+    cursorPages[resource] = { key, cursors: {} };
+  }
+  const cursor = page > 1 ? cursorPages[resource].cursors[page] : undefined;
+  // A page reached without its cursor (reload, deep link) cannot be fetched
+  if (page > 1 && !cursor) return { page, missing: true };
+  const filter = cursor ? { ...params.filter, cursor } : params.filter;
+  return { page, params: { ...params, filter } };
+};
+
 const dataProvider = {
   getList: async (resource, params) => {
     const resName = mapResource(resource);
-    const qs = buildQuery(params);
+    let cursorMode = Boolean(params.filter && params.filter.pagination === 'cursor');
+    if (cursorMode && !keysetSortMatches(resource, params.sort)) {
+      cursorMode = false;
+      params = withoutCursorMode(params);
+    }
+    const paged = cursorMode ? withPageCursor(resource, params) : { page: 1, params };
+    if (paged.missing) {
+      // An empty page past the first makes react-admin go back to page 1
+      return { data: [], pageInfo: { hasNextPage: false, hasPreviousPage: false } };
+    }
+    const qs = buildQuery(paged.params);
     const url = `${baseApi}/${resName}?${qs}`;
   const { json } = await httpJson(url);
     const data = Array.isArray(json) ? json : json.results || [];
+    // Keyset (?cursor=) responses carry no count: use react-admin partial pagination
+    if (json && !Array.isArray(json) && 'next_cursor' in json) {
+      if (cursorMode && json.next_cursor) cursorPages[resource].cursors[paged.page + 1] = json.next_cursor;
+      return { data, pageInfo: { hasNextPage: Boolean(json.next_cursor), hasPreviousPage: paged.page > 1 } };
+    }
     const total = Array.isArray(json) ? json.length : json.count ?? data.length;
     return { data, total };
   },
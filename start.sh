@@ -4,6 +4,26 @@ set -e
 echo "[startup] Running migrations..."
 python manage.py migrate --noinput
 
+echo "[startup] Creating the shared cache table..."
+python manage.py createcachetable
+
+# Fills only the days without rollups (fresh installs); ROLLUP_ON_START=full rebuilds all
+if [ "${ROLLUP_ON_START:-1}" = "full" ]; then
+  echo "[startup] Rebuilding all dashboard rollups..."
+  python manage.py rollup || echo "[startup] Rollup rebuild failed; run 'manage.py rollup' manually."
+elif [ "${ROLLUP_ON_START:-1}" = "1" ]; then
+  echo "[startup] Filling missing dashboard rollups..."
+  python manage.py rollup --missing || echo "[startup] Rollup backfill failed; run 'manage.py rollup' manually."
+fi
+
+# Also run daily (cron / scheduler) to keep open-ended patterns' rolling horizon ahead
+echo "[startup] Extending open-ended class patterns..."
+python manage.py extend_patterns || echo "[startup] Pattern extension failed; run 'manage.py extend_patterns' manually."
+
+# Also run daily: drops sync tombstones past SYNC_TOMBSTONE_DAYS
+echo "[startup] Pruning sync tombstones..."
+python manage.py prune_tombstones || echo "[startup] Tombstone pruning failed; run 'manage.py prune_tombstones' manually."
+
 if [ "$DJANGO_SUPERUSER_USERNAME" ] && [ "$DJANGO_SUPERUSER_PASSWORD" ]; then
   echo "[startup] Ensuring superuser exists..."
   python manage.py createsuperuser --username "$DJANGO_SUPERUSER_USERNAME" --email "${DJANGO_SUPERUSER_EMAIL:-admin@example.com}" --noinput 2>/dev/null || echo "[startup] Superuser already exists or creation failed"
@@ -27,5 +47,10 @@ except User.DoesNotExist:
 "
 fi
 
+if [ "${ASGI:-0}" = "1" ]; then
+  echo "[startup] Starting gunicorn (uvicorn workers, ASGI) on port ${PORT:-8000}..."
+  exec gunicorn project.asgi:application -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:${PORT:-8000}
+fi
+
 echo "[startup] Starting gunicorn on port ${PORT:-8000}..."
 exec gunicorn project.wsgi:application --bind 0.0.0.0:${PORT:-8000}